@@ -1,9 +1,13 @@
 from django.contrib import admin
+from django.db.models import Q
 from django.http import HttpResponseRedirect
 from django.urls import reverse
+from django.utils import timezone
 from django.utils.html import format_html
 from django.utils.safestring import mark_safe
 
+from apps.catalog.image_info import image_info
+from apps.catalog.search import search_queryset
 from apps.catalog.models import (
     AboutImage,
     AboutPage,
@@ -31,11 +35,55 @@ from apps.catalog.models import (
     Room,
     SalesPoint,
     Style,
+    TelegramNotification,
 )
 
 
+def image_preview_html(obj, field, max_width, max_height):
+    """
+    Превью изображения. Если для текущего файла сохранены размеры и LQIP (image_meta),
+    у превью задаются width/height и размытая заглушка на время загрузки.
+    """
+    field_file = getattr(obj, field) if obj else None
+    if not field_file:
+        return "-"
+    style = f"max-width: {max_width}px; max-height: {max_height}px; object-fit: cover; border-radius: 4px;"
+    info = image_info(obj, field)
+    if info is None:
+        return format_html('<img src="{}" style="{}"/>', field_file.url, style)
+    return format_html(
+        '<img src="{}" width="{}" height="{}" loading="lazy" title="{} × {}" '
+        'style="{} height: auto; background: {} url({}) center / cover;"/>',
+        field_file.url,
+        info["width"],
+        info["height"],
+        info["width"],
+        info["height"],
+        style,
+        info["color"],
+        info["lqip"],
+    )
+
+
+class FullTextSearchAdminMixin:
+    """
+    Поиск в списке объектов по search_vector/search_text (GIN-индексы, все языки,
+    опечатки) вместо icontains по search_fields.
+    search_related: [(lookup, модель)] — также находить объекты по связанным моделям.
+    """
+    search_related = ()
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term.strip():
+            return queryset, False
+        condition = Q(pk__in=search_queryset(self.model.objects.all(), search_term).values("pk"))
+        for lookup, model in self.search_related:
+            condition |= Q(**{f"{lookup}__in": search_queryset(model.objects.all(), search_term).values("pk")})
+        return queryset.filter(condition), False
+
+
 @admin.register(Collection)
-class CollectionAdmin(admin.ModelAdmin):
+class CollectionAdmin(FullTextSearchAdminMixin, admin.ModelAdmin):
     """Админка для коллекций"""
     list_display = ["image_preview", "name", "slug", "is_published", "is_new", "carpets_count", "created_at"]
     list_display_links = ["image_preview", "name"]
@@ -78,19 +126,9 @@ class CollectionAdmin(admin.ModelAdmin):
 
     def image_preview(self, obj):
         """Превью изображения"""
-        if obj.image:
-            return format_html(
-                '<img src="{}" style="max-width: 100px; max-height: 100px; object-fit: cover; border-radius: 4px;"/>',
-                obj.image.url
-            )
-        return "-"
+        return image_preview_html(obj, "image", 100, 100)
     image_preview.short_description = "Превью"
 
-    def carpets_count(self, obj):
-        """Количество ковров в коллекции"""
-        return obj.carpets.count()
-    carpets_count.short_description = "Количество ковров"
-
 
 @admin.register(Style)
 class StyleAdmin(admin.ModelAdmin):
@@ -243,12 +281,7 @@ class CarpetImageInline(admin.StackedInline):
     
     def image_preview(self, obj):
         """Превью изображения"""
-        if obj and obj.image:
-            return format_html(
-                '<img src="{}" style="max-width: 150px; max-height: 150px; object-fit: cover; border-radius: 4px;"/>',
-                obj.image.url
-            )
-        return "-"
+        return image_preview_html(obj, "image", 150, 150)
     image_preview.short_description = "Превью"
 
 
@@ -262,8 +295,9 @@ class CarpetCharacteristicInline(admin.StackedInline):
 
 
 @admin.register(Carpet)
-class CarpetAdmin(admin.ModelAdmin):
+class CarpetAdmin(FullTextSearchAdminMixin, admin.ModelAdmin):
     """Админка для ковров"""
+    search_related = [("collection", Collection)]
     inlines = [CarpetCharacteristicInline, CarpetImageInline]
     list_display = [
         "photo_preview",
@@ -291,9 +325,12 @@ class CarpetAdmin(admin.ModelAdmin):
     readonly_fields = [
         "photo_preview",
         "watched",
+        "views_today",
+        "views_week",
         "created_at",
         "update_at"
     ]
+    list_select_related = ["collection", "stats"]
     filter_horizontal = ["styles", "rooms", "colors"]
     date_hierarchy = "created_at"
     fieldsets = (
@@ -313,7 +350,7 @@ class CarpetAdmin(admin.ModelAdmin):
             "fields": ("styles", "rooms", "colors", "is_new", "is_popular")
         }),
         ("Статистика", {
-            "fields": ("watched",)
+            "fields": ("watched", "views_today", "views_week")
         }),
         ("SEO", {
             "fields": (
@@ -335,14 +372,25 @@ class CarpetAdmin(admin.ModelAdmin):
 
     def photo_preview(self, obj):
         """Превью изображения ковра"""
-        if obj.photo:
-            return format_html(
-                '<img src="{}" style="max-width: 150px; max-height: 150px; object-fit: cover; border-radius: 4px;"/>',
-                obj.photo.url
-            )
-        return "-"
+        return image_preview_html(obj, "photo", 150, 150)
     photo_preview.short_description = "Превью"
 
+    def watched(self, obj):
+        """Всего просмотров (CarpetStats)"""
+        return obj.stats.watched
+    watched.short_description = "Просмотры"
+    watched.admin_order_field = "stats__watched"
+
+    def views_today(self, obj):
+        """Просмотры за сегодня"""
+        return obj.stats.current_views_today()
+    views_today.short_description = "Просмотры за день"
+
+    def views_week(self, obj):
+        """Просмотры за текущую неделю"""
+        return obj.stats.current_views_week()
+    views_week.short_description = "Просмотры за неделю"
+
 
 class NewsImageInline(admin.StackedInline):
     """Inline для изображений новости"""
@@ -364,7 +412,7 @@ class NewsImageInline(admin.StackedInline):
 
 
 @admin.register(News)
-class NewsAdmin(admin.ModelAdmin):
+class NewsAdmin(FullTextSearchAdminMixin, admin.ModelAdmin):
     """Админка для новостей с CKEditor"""
     inlines = [NewsImageInline]
     list_display = ["cover_image_preview", "title", "slug", "is_published", "created_at"]
@@ -459,12 +507,7 @@ class NewsAdmin(admin.ModelAdmin):
 
     def cover_image_preview(self, obj):
         """Превью обложки"""
-        if obj and obj.cover_image:
-            return format_html(
-                '<img src="{}" style="max-width: 150px; max-height: 150px; object-fit: cover; border-radius: 4px;"/>',
-                obj.cover_image.url
-            )
-        return "-"
+        return image_preview_html(obj, "cover_image", 150, 150)
     cover_image_preview.short_description = "Превью обложки"
 
 
@@ -499,12 +542,7 @@ class GalleryAdmin(admin.ModelAdmin):
 
     def image_preview(self, obj):
         """Превью изображения"""
-        if obj.image:
-            return format_html(
-                '<img src="{}" style="max-width: 200px; max-height: 200px; object-fit: cover; border-radius: 4px;"/>',
-                obj.image.url
-            )
-        return "-"
+        return image_preview_html(obj, "image", 200, 200)
     image_preview.short_description = "Превью"
 
     class Meta:
@@ -585,122 +623,62 @@ class MainGalleryAdmin(admin.ModelAdmin):
     
     def image_1_preview(self, obj):
         """Превью первого изображения"""
-        if obj and obj.image_1:
-            return format_html(
-                '<img src="{}" style="max-width: 300px; max-height: 200px; object-fit: cover; border-radius: 4px;"/>',
-                obj.image_1.url
-            )
-        return "-"
+        return image_preview_html(obj, "image_1", 300, 200)
     image_1_preview.short_description = "Превью изображения 1"
     
     def image_2_preview(self, obj):
         """Превью второго изображения"""
-        if obj and obj.image_2:
-            return format_html(
-                '<img src="{}" style="max-width: 300px; max-height: 200px; object-fit: cover; border-radius: 4px;"/>',
-                obj.image_2.url
-            )
-        return "-"
+        return image_preview_html(obj, "image_2", 300, 200)
     image_2_preview.short_description = "Превью изображения 2"
     
     def image_3_preview(self, obj):
         """Превью третьего изображения"""
-        if obj and obj.image_3:
-            return format_html(
-                '<img src="{}" style="max-width: 300px; max-height: 200px; object-fit: cover; border-radius: 4px;"/>',
-                obj.image_3.url
-            )
-        return "-"
+        return image_preview_html(obj, "image_3", 300, 200)
     image_3_preview.short_description = "Превью изображения 3"
     
     def image_4_preview(self, obj):
         """Превью четвертого изображения"""
-        if obj and obj.image_4:
-            return format_html(
-                '<img src="{}" style="max-width: 300px; max-height: 200px; object-fit: cover; border-radius: 4px;"/>',
-                obj.image_4.url
-            )
-        return "-"
+        return image_preview_html(obj, "image_4", 300, 200)
     image_4_preview.short_description = "Превью изображения 4"
     
     def image_5_preview(self, obj):
         """Превью пятого изображения"""
-        if obj and obj.image_5:
-            return format_html(
-                '<img src="{}" style="max-width: 300px; max-height: 200px; object-fit: cover; border-radius: 4px;"/>',
-                obj.image_5.url
-            )
-        return "-"
+        return image_preview_html(obj, "image_5", 300, 200)
     image_5_preview.short_description = "Превью изображения 5"
     
     def image_6_preview(self, obj):
         """Превью шестого изображения"""
-        if obj and obj.image_6:
-            return format_html(
-                '<img src="{}" style="max-width: 300px; max-height: 200px; object-fit: cover; border-radius: 4px;"/>',
-                obj.image_6.url
-            )
-        return "-"
+        return image_preview_html(obj, "image_6", 300, 200)
     image_6_preview.short_description = "Превью изображения 6"
     
     def image_7_preview(self, obj):
         """Превью седьмого изображения"""
-        if obj and obj.image_7:
-            return format_html(
-                '<img src="{}" style="max-width: 300px; max-height: 200px; object-fit: cover; border-radius: 4px;"/>',
-                obj.image_7.url
-            )
-        return "-"
+        return image_preview_html(obj, "image_7", 300, 200)
     image_7_preview.short_description = "Превью изображения 7"
     
     def image_8_preview(self, obj):
         """Превью восьмого изображения"""
-        if obj and obj.image_8:
-            return format_html(
-                '<img src="{}" style="max-width: 300px; max-height: 200px; object-fit: cover; border-radius: 4px;"/>',
-                obj.image_8.url
-            )
-        return "-"
+        return image_preview_html(obj, "image_8", 300, 200)
     image_8_preview.short_description = "Превью изображения 8"
     
     def image_9_preview(self, obj):
         """Превью девятого изображения"""
-        if obj and obj.image_9:
-            return format_html(
-                '<img src="{}" style="max-width: 300px; max-height: 200px; object-fit: cover; border-radius: 4px;"/>',
-                obj.image_9.url
-            )
-        return "-"
+        return image_preview_html(obj, "image_9", 300, 200)
     image_9_preview.short_description = "Превью изображения 9"
     
     def image_10_preview(self, obj):
         """Превью десятого изображения"""
-        if obj and obj.image_10:
-            return format_html(
-                '<img src="{}" style="max-width: 300px; max-height: 200px; object-fit: cover; border-radius: 4px;"/>',
-                obj.image_10.url
-            )
-        return "-"
+        return image_preview_html(obj, "image_10", 300, 200)
     image_10_preview.short_description = "Превью изображения 10"
     
     def image_11_preview(self, obj):
         """Превью одиннадцатого изображения"""
-        if obj and obj.image_11:
-            return format_html(
-                '<img src="{}" style="max-width: 300px; max-height: 200px; object-fit: cover; border-radius: 4px;"/>',
-                obj.image_11.url
-            )
-        return "-"
+        return image_preview_html(obj, "image_11", 300, 200)
     image_11_preview.short_description = "Превью изображения 11"
     
     def image_12_preview(self, obj):
         """Превью двенадцатого изображения"""
-        if obj and obj.image_12:
-            return format_html(
-                '<img src="{}" style="max-width: 300px; max-height: 200px; object-fit: cover; border-radius: 4px;"/>',
-                obj.image_12.url
-            )
-        return "-"
+        return image_preview_html(obj, "image_12", 300, 200)
     image_12_preview.short_description = "Превью изображения 12"
 
 
@@ -1429,6 +1407,7 @@ class SalesPointInline(admin.StackedInline):
         "location_en",
         "phone",
         "map_link",
+        ("latitude", "longitude"),
         "order",
         "is_published"
     ]
@@ -1845,4 +1824,23 @@ class DealerRequestAdmin(admin.ModelAdmin):
     message_preview.short_description = "Текст обращения"
 
 
+@admin.register(TelegramNotification)
+class TelegramNotificationAdmin(admin.ModelAdmin):
+    """Очередь уведомлений о заявках в Telegram (только просмотр и повторная отправка)"""
+    list_display = ["id", "form_type", "status", "attempts", "next_attempt_at", "created_at", "sent_at"]
+    list_filter = ["status", "form_type", "created_at"]
+    readonly_fields = [
+        "form_type", "payload", "status", "attempts", "next_attempt_at", "last_error", "created_at", "sent_at",
+    ]
+    date_hierarchy = "created_at"
+    actions = ["retry"]
+
+    def has_add_permission(self, request):
+        return False
+
+    @admin.action(description="Отправить повторно")
+    def retry(self, request, queryset):
+        queryset.exclude(status="sent").update(status="pending", attempts=0, next_attempt_at=timezone.now())
+
+
 # AdvantageCard управляется через inline на главной странице - не нужна отдельная админка
\ No newline at end of file
@@ -0,0 +1,200 @@
+"""
+Битовые карты опубликованных ковров для фильтрации и фасетов в памяти процесса.
+
+Каталог целиком помещается в память: каждый ковер получает позицию в порядке
+сортировки по умолчанию (-created_at, id), а каждое значение фильтра (стиль,
+комната, цвет, коллекция, флаг) — битовую карту (int) ковров с этим значением.
+Фильтры CarpetFilter, фасеты и количество считаются битовыми операциями,
+Postgres нужен только для загрузки ковров итоговой страницы.
+
+Индекс строится заново в каждом процессе, когда меняется версия — поколения
+моделей каталога из общего кэша (Redis, см. apps.catalog.cache), поэтому
+все воркеры видят изменения одновременно с кэшем ответов.
+Включается настройкой CATALOG_BITMAP_FILTERS.
+"""
+
+import threading
+from functools import reduce
+from operator import and_
+from operator import or_
+
+from apps.catalog.cache import get_generations
+from apps.catalog.models import Carpet
+from apps.catalog.models import Collection
+from apps.catalog.models import Color
+from apps.catalog.models import Room
+from apps.catalog.models import Style
+
+from .facets import FLAG_FACETS
+from .facets import TAXONOMY_FACETS
+
+# Модели, от которых зависит индекс
+INDEX_MODELS = (Carpet, Collection, Style, Room, Color)
+# Связь ковра -> модель справочника
+M2M_TAXONOMIES = {"styles": Style, "rooms": Room, "colors": Color}
+
+_index = None
+_lock = threading.Lock()
+
+
+def _bitmap(positions, size):
+    """Битовая карта из позиций (бит i — ковер в позиции i)"""
+    buffer = bytearray((size + 7) // 8)
+    for position in positions:
+        buffer[position >> 3] |= 1 << (position & 7)
+    return int.from_bytes(buffer, "little")
+
+
+def _set_positions(bits, start, stop):
+    """Позиции установленных битов с порядковыми номерами [start, stop)"""
+    digits = bin(bits)[:1:-1]  # Двоичная запись от младшего бита к старшему
+    positions = []
+    index = -1
+    number = 0
+    while number < stop:
+        index = digits.find("1", index + 1)
+        if index < 0:
+            break
+        if number >= start:
+            positions.append(index)
+        number += 1
+    return positions
+
+
+class CarpetRows:
+    """
+    Ковры, отобранные битовой картой, как последовательность для Paginator:
+    количество считается без запросов, срез загружает только свои ковры.
+    """
+
+    def __init__(self, index, bits, queryset):
+        self.index = index
+        self.bits = bits
+        self.queryset = queryset
+
+    def count(self):
+        return self.bits.bit_count()
+
+    def __len__(self):
+        return self.count()
+
+    def __iter__(self):
+        return iter(self[0:self.count()])
+
+    def __getitem__(self, key):
+        if not isinstance(key, slice) or key.step is not None:
+            raise TypeError("CarpetRows supports only slices without step")
+        start, stop, _ = key.indices(self.count())
+        pks = [self.index.ids[position] for position in _set_positions(self.bits, start, stop)]
+        carpets = {carpet.pk: carpet for carpet in self.queryset.filter(pk__in=pks)}
+        return [carpets[pk] for pk in pks if pk in carpets]
+
+
+class CarpetBitmapIndex:
+    """
+    Индекс опубликованных ковров.
+
+    Выбор фильтров (selection) передается в нормализованном виде:
+        {"styles": (["modern", "classic"], match_all), "collection": "slug", "is_new": True}
+    """
+
+    def __init__(self, version, ids, bitmaps, facet_values):
+        self.version = version
+        self.ids = ids
+        self.all = (1 << len(ids)) - 1
+        # Фильтр -> {значение: битовая карта}; для флагов значение True
+        self.bitmaps = bitmaps
+        # Фасет -> значения в порядке ответа carpet_facets (включая значения без ковров)
+        self.facet_values = facet_values
+
+    def constraint(self, name, value):
+        """Битовая карта ковров, подходящих под одно условие фильтра"""
+        if name in FLAG_FACETS:
+            flag = self.bitmaps[name][True]
+            return flag if value else self.all & ~flag
+        if name == "collection":
+            return self.bitmaps[name].get(value, 0)
+        slugs, match_all = value
+        maps = [self.bitmaps[name].get(slug, 0) for slug in slugs]
+        return reduce(and_ if match_all else or_, maps)
+
+    def match(self, selection, exclude=(), base=None):
+        """Ковры, подходящие под все условия selection, кроме exclude (в пределах base)"""
+        bits = self.all if base is None else base
+        for name, value in selection.items():
+            if name not in exclude:
+                bits &= self.constraint(name, value)
+        return bits
+
+    def facets(self, selection, base=None):
+        """То же, что api.facets.carpet_facets, без обращения к БД"""
+        facets = {}
+        for name in TAXONOMY_FACETS:
+            bits = self.match(selection, exclude=(name,), base=base)
+            facets[name] = {
+                slug: (bits & self.bitmaps[name].get(slug, 0)).bit_count()
+                for slug in self.facet_values[name]
+            }
+
+        bits = self.match(selection, exclude=FLAG_FACETS, base=base)
+        selected = {
+            flag: self.constraint(flag, selection[flag]) if flag in selection else self.all
+            for flag in FLAG_FACETS
+        }
+        facets["is_new"] = (bits & self.bitmaps["is_new"][True] & selected["is_popular"]).bit_count()
+        facets["is_popular"] = (bits & self.bitmaps["is_popular"][True] & selected["is_new"]).bit_count()
+        facets["total"] = (bits & selected["is_new"] & selected["is_popular"]).bit_count()
+        return facets
+
+    def rows(self, bits, queryset):
+        return CarpetRows(self, bits, queryset)
+
+
+def build_carpet_bitmap_index(version):
+    """Строит индекс по БД: один запрос для ковров и по одному на каждую связь и справочник"""
+    rows = list(
+        Carpet.objects.filter(is_published=True)
+        .order_by("-created_at", "id")
+        .values_list("pk", "collection_id", "is_new", "is_popular")
+    )
+    size = len(rows)
+    ids = [row[0] for row in rows]
+    positions = {pk: position for position, pk in enumerate(ids)}
+
+    def by_value(pairs, slugs):
+        grouped = {}
+        for pk, value in pairs:
+            if pk in positions:
+                grouped.setdefault(slugs[value], []).append(positions[pk])
+        return {slug: _bitmap(items, size) for slug, items in grouped.items()}
+
+    bitmaps = {
+        "collection": by_value(
+            ((pk, collection_id) for pk, collection_id, _, _ in rows),
+            dict(Collection.objects.values_list("id", "slug")),
+        ),
+        "is_new": {True: _bitmap((positions[row[0]] for row in rows if row[2]), size)},
+        "is_popular": {True: _bitmap((positions[row[0]] for row in rows if row[3]), size)},
+    }
+    for name, model in M2M_TAXONOMIES.items():
+        field = Carpet._meta.get_field(name)
+        pairs = field.remote_field.through.objects.values_list(field.m2m_column_name(), field.m2m_reverse_name())
+        bitmaps[name] = by_value(pairs, dict(model.objects.values_list("id", "slug")))
+
+    facet_values = {
+        name: list(values().values_list("slug", flat=True)) for name, values in TAXONOMY_FACETS.items()
+    }
+    return CarpetBitmapIndex(version, ids, bitmaps, facet_values)
+
+
+def carpet_bitmap_index():
+    """Индекс текущей версии (перестраивается в процессе при изменении каталога)"""
+    global _index
+    version = tuple(get_generations(INDEX_MODELS))
+    index = _index
+    if index is None or index.version != version:
+        with _lock:
+            if _index is None or _index.version != version:
+                _index = build_carpet_bitmap_index(version)
+            index = _index
+    return index
@@ -0,0 +1,185 @@
+"""
+Глобальные данные сайта для первой отрисовки одним запросом (/api/bootstrap/?lang=).
+
+Секции собираются из уже закэшированных представлений отдельных эндпоинтов:
+страницы — из снапшотов (apps.catalog.api.snapshots), списки — из кэша
+cache_response под теми же ключами, что и у самих эндпоинтов. Недостающие
+в кэше списки строятся параллельно в общем пуле потоков и кэшируются
+для всех; одну секцию одновременно строит только один запрос.
+
+Каждая секция несет свою версию (хэш снапшота или ключа кэша списка), ETag
+ответа строится из версий секций, поэтому повторный запрос с актуальной
+копией получает 304 без сборки ответа:
+
+    {"versions": {"global_settings": "...", "faq": "...", ...},
+     "global_settings": {...}, "contact": {...}, "faq": [...], ...}
+"""
+
+import copy
+import hashlib
+import json
+import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections
+from django.http import HttpResponse
+from django.http import QueryDict
+from django.utils.cache import get_conditional_response
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+
+from apps.catalog.cache import get_last_modified
+
+from .cache import build_cache_key
+from .cache import response_digest
+from .cache import set_validator_headers
+from .snapshots import get_snapshot
+from .utils import get_language_from_request
+
+# Сколько запрос ждет секцию, которую строит другой запрос (в секундах), и как часто проверяет кэш
+BUILD_WAIT_TIMEOUT = 10
+BUILD_POLL_INTERVAL = 0.05
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def section_request(request):
+    """Запрос для секций-списков: тот же, что у bootstrap, но только с параметром lang"""
+    http_request = copy.copy(request._request)
+    http_request.GET = QueryDict(mutable=True)
+    http_request.GET["lang"] = get_language_from_request(request)
+    return Request(http_request)
+
+
+def section_view(view_class, basename, request):
+    """Экземпляр ViewSet для действия list, как его создал бы роутер"""
+    view = view_class(basename=basename, action="list", args=(), kwargs={}, format_kwarg=None)
+    view.request = request
+    return view
+
+
+def build_section(view):
+    """Данные списка: действие list без декоратора cache_response"""
+    return view.list.__wrapped__(view, view.request).data
+
+
+def _build_section_in_thread(view):
+    # Потоки пула переиспользуются вместе со своими подключениями к БД; как и после
+    # запроса, закрываются только подключения старше CONN_MAX_AGE или сломанные
+    close_old_connections()
+    try:
+        return build_section(view)
+    finally:
+        close_old_connections()
+
+
+def section_executor():
+    """Общий для процесса пул потоков размера CATALOG_BOOTSTRAP_WORKERS"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.CATALOG_BOOTSTRAP_WORKERS, thread_name_prefix="bootstrap",
+                )
+    return _executor
+
+
+def build_sections(views):
+    """{секция: данные} для ViewSet, которых нет в кэше; несколько секций строятся параллельно"""
+    if settings.CATALOG_BOOTSTRAP_WORKERS <= 1 or len(views) <= 1:
+        return {name: build_section(view) for name, view in views.items()}
+    executor = section_executor()
+    futures = {name: executor.submit(_build_section_in_thread, view) for name, view in views.items()}
+    return {name: future.result() for name, future in futures.items()}
+
+
+def building_key(key):
+    return f"{key}:building"
+
+
+def wait_for_sections(keys):
+    """Секции, которые строит другой запрос: {секция: данные} из кэша по мере готовности"""
+    data = {}
+    deadline = time.monotonic() + BUILD_WAIT_TIMEOUT
+    while keys and time.monotonic() < deadline:
+        time.sleep(BUILD_POLL_INTERVAL)
+        cached = cache.get_many(list(keys.values()))
+        for name, key in list(keys.items()):
+            if key in cached:
+                data[name] = cached[key]
+                del keys[name]
+    return data
+
+
+def load_sections(views, keys):
+    """
+    {секция: данные} списков из кэша. Отсутствующие секции строит только один
+    запрос (флаг в кэше на ключ секции), конкурентные запросы ждут его результат,
+    а если не дождались — строят сами.
+    """
+    cached = cache.get_many(list(keys.values()))
+    data = {name: cached[key] for name, key in keys.items() if key in cached}
+    missing = [name for name in keys if name not in data]
+    own = [name for name in missing if cache.add(building_key(keys[name]), True, timeout=BUILD_WAIT_TIMEOUT)]
+    try:
+        built = build_sections({name: views[name] for name in own})
+        cache.set_many({keys[name]: value for name, value in built.items()}, settings.CATALOG_CACHE_TIMEOUT)
+        data.update(built)
+    finally:
+        cache.delete_many([building_key(keys[name]) for name in own])
+
+    waiting = {name: keys[name] for name in missing if name not in own}
+    data.update(wait_for_sections(dict(waiting)))
+    data.update(build_sections({name: views[name] for name in waiting if name not in data}))
+    return data
+
+
+def bootstrap_response(request, sections):
+    """
+    Ответ bootstrap для sections: {секция: имя снапшота или (класс ViewSet, basename)}.
+    Секции отдаются в порядке sections.
+    """
+    language = get_language_from_request(request)
+    list_request = section_request(request)
+
+    snapshots = {}
+    views = {}
+    keys = {}
+    versions = {}
+    for name, source in sections.items():
+        if isinstance(source, str):
+            snapshots[name] = get_snapshot(source, language)
+            versions[name] = snapshots[name][1]
+        else:
+            view = views[name] = section_view(*source, list_request)
+            versions[name] = response_digest(view, list_request, view.kwargs)
+            keys[name] = build_cache_key(view, versions[name])
+
+    payload = json.dumps([language, versions], sort_keys=True)
+    etag = f'W/"bootstrap.{hashlib.md5(payload.encode(), usedforsecurity=False).hexdigest()}"'
+    models = {model for view in views.values() for model in view.cache_models}
+    timestamps = [updated_at for _, _, updated_at in snapshots.values()]
+    if models:
+        timestamps.append(get_last_modified(list(models)))
+    last_modified = math.ceil(max(timestamps))
+
+    not_modified = get_conditional_response(request._request, etag=etag, last_modified=last_modified)
+    if not_modified is not None:
+        return set_validator_headers(not_modified, etag, last_modified)
+
+    data = load_sections(views, keys)
+
+    # Снапшоты уже готовый JSON: ответ склеивается из байтов без повторного разбора
+    renderer = JSONRenderer()
+    parts = [b'"versions":' + renderer.render(versions)]
+    for name in sections:
+        content = snapshots[name][0] if name in snapshots else renderer.render(data[name])
+        parts.append(renderer.render(name) + b":" + content)
+    response = HttpResponse(b"{" + b",".join(parts) + b"}", content_type="application/json")
+    return set_validator_headers(response, etag, last_modified)
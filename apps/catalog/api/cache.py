@@ -0,0 +1,141 @@
+"""
+Кэширование ответов read-only эндпоинтов каталога и условные GET-запросы.
+
+Валидаторы ответа (ETag и Last-Modified) берутся из счетчиков поколений и
+времени изменения моделей (apps.catalog.cache), поэтому совпадение проверяется
+до обращения к БД и сериализации: клиент с актуальной копией получает 304.
+"""
+
+import hashlib
+import json
+import math
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.cache import get_conditional_response
+from django.utils.cache import patch_cache_control
+from django.utils.cache import patch_vary_headers
+from django.utils.http import http_date
+from rest_framework import status
+from rest_framework.response import Response
+
+from apps.catalog.cache import get_generations
+from apps.catalog.cache import get_last_modified
+
+from .utils import get_language_from_request
+
+RESPONSE_KEY_PREFIX = "catalog:response"
+OBJECT_KEY_PREFIX = "catalog:object"
+
+
+def normalize_query(request, view):
+    """
+    Нормализованный query string запроса для ключа кэша.
+
+    Параметры сортируются по имени, язык приводится к поддерживаемому коду
+    (отсутствующий lang и lang=uz дают один ключ), а значения параметров из
+    view.cache_unordered_params (например, styles=b,a) сортируются.
+    """
+    unordered = getattr(view, "cache_unordered_params", ())
+    params = {"lang": [get_language_from_request(request)]}
+    for key in request.query_params:
+        if key == "lang":
+            continue
+        values = request.query_params.getlist(key)
+        if key in unordered:
+            values = sorted({v.strip() for value in values for v in value.split(",") if v.strip()})
+        params[key] = values
+    return sorted(params.items())
+
+
+def response_digest(view, request, kwargs):
+    """Хэш аргументов URL, поколений моделей и нормализованного запроса"""
+    payload = json.dumps(
+        [
+            sorted(kwargs.items()),
+            get_generations(view.cache_models),
+            normalize_query(request, view),
+        ],
+        default=str,
+    )
+    return hashlib.md5(payload.encode(), usedforsecurity=False).hexdigest()
+
+
+def build_cache_key(view, digest):
+    """Ключ кэша: эндпоинт + хэш аргументов URL, поколений моделей и нормализованного запроса"""
+    return f"{RESPONSE_KEY_PREFIX}:{view.basename}:{view.action}:{digest}"
+
+
+def build_etag(view, request, digest):
+    """
+    Слабый ETag ответа: тот же хэш, что и в ключе кэша, плюс эндпоинт и формат
+    рендера (JSON и browsable API — разные представления).
+    """
+    return f'W/"{view.basename}.{view.action}.{digest}.{request.accepted_renderer.format}"'
+
+
+def set_validator_headers(response, etag, last_modified):
+    """ETag, Last-Modified, Cache-Control и Vary для ответа (в том числе 304)"""
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(last_modified)
+    patch_cache_control(response, public=True, max_age=settings.CATALOG_HTTP_MAX_AGE)
+    patch_vary_headers(response, ("Accept", "Accept-Language"))
+    return response
+
+
+def cache_response(method):
+    """
+    Декоратор для action-методов ViewSet: кэширует response.data успешных ответов.
+
+    ViewSet должен объявить cache_models — модели, от которых зависит ответ.
+    Изменение любой из них (см. apps.catalog.signals) меняет ключ кэша и ETag.
+
+    Если If-None-Match (или If-Modified-Since) клиента совпадает с текущими
+    валидаторами, возвращается 304 без обращения к кэшу ответов и БД.
+    """
+
+    @wraps(method)
+    def wrapper(self, request, *args, **kwargs):
+        digest = response_digest(self, request, kwargs)
+        etag = build_etag(self, request, digest)
+        # Время в HTTP-датах с точностью до секунды, округление вверх не занижает его
+        last_modified = math.ceil(get_last_modified(self.cache_models))
+
+        not_modified = get_conditional_response(request._request, etag=etag, last_modified=last_modified)
+        if not_modified is not None:
+            return set_validator_headers(not_modified, etag, last_modified)
+
+        key = build_cache_key(self, digest)
+        data = cache.get(key)
+        if data is not None:
+            return set_validator_headers(Response(data), etag, last_modified)
+        response = method(self, request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            cache.set(key, response.data, settings.CATALOG_CACHE_TIMEOUT)
+            set_validator_headers(response, etag, last_modified)
+        return response
+
+    return wrapper
+
+
+def cached_representations(view, request, pks, load):
+    """
+    Представления объектов по списку pk через кэш отдельных объектов.
+
+    Ключ объекта: эндпоинт + поколения view.cache_models + язык + pk, поэтому
+    представление одного объекта переиспользуется любыми наборами pk.
+    load(pks) вызывается один раз для всех отсутствующих в кэше pk и возвращает
+    {pk: данные}; не найденные объекты пропускаются. Порядок результата — порядок pks.
+    """
+    payload = json.dumps([get_generations(view.cache_models), get_language_from_request(request)])
+    digest = hashlib.md5(payload.encode(), usedforsecurity=False).hexdigest()
+    keys = {pk: f"{OBJECT_KEY_PREFIX}:{view.basename}:{digest}:{pk}" for pk in pks}
+
+    found = cache.get_many(list(keys.values()))
+    missing = [pk for pk in pks if keys[pk] not in found]
+    if missing:
+        loaded = {keys[pk]: data for pk, data in load(missing).items()}
+        cache.set_many(loaded, settings.CATALOG_CACHE_TIMEOUT)
+        found.update(loaded)
+    return [found[keys[pk]] for pk in pks if keys[pk] in found]
@@ -0,0 +1,80 @@
+"""
+Компактное представление списков ковров (?compact=1).
+
+Ковры содержат только ID стилей, комнат, цветов и характеристик, а справочные
+объекты, встречающиеся на странице, отдаются один раз в блоке taxonomy:
+
+    {"count": ..., "next": ..., "previous": ..., "results": [...],
+     "taxonomy": {"styles": [...], "rooms": [...], "colors": [...], "characteristics": [...]}}
+"""
+
+from rest_framework.response import Response
+
+from apps.catalog.models import Characteristic
+from apps.catalog.models import Color
+from apps.catalog.models import Room
+from apps.catalog.models import Style
+
+from .fieldsets import trim_serializer
+from .prefetch import CARPET_TAXONOMY_IDS
+from .serializers import CarpetCompactSerializer
+from .serializers import CharacteristicSerializer
+from .serializers import ColorSerializer
+from .serializers import RoomSerializer
+from .serializers import StyleSerializer
+
+COMPACT_PARAM = "compact"
+TRUE_VALUES = {"1", "true", "yes"}
+
+# Поле ковра -> (модель справочника, сериализатор)
+TAXONOMY = {
+    "styles": (Style, StyleSerializer),
+    "rooms": (Room, RoomSerializer),
+    "colors": (Color, ColorSerializer),
+    "characteristics": (Characteristic, CharacteristicSerializer),
+}
+
+
+def is_compact(request):
+    return request.query_params.get(COMPACT_PARAM, "").lower() in TRUE_VALUES
+
+
+def _taxonomy_ids(carpets, field):
+    if field in CARPET_TAXONOMY_IDS:
+        annotation = CARPET_TAXONOMY_IDS[field][0]
+        return {pk for carpet in carpets for pk in getattr(carpet, annotation)}
+    return {item.characteristic_id for carpet in carpets for item in carpet.characteristics.all()}
+
+
+def carpet_taxonomy(carpets, context, fields=None):
+    """Справочные объекты, на которые ссылаются ковры страницы (по одному запросу на непустой справочник)"""
+    taxonomy = {}
+    for field, (model, serializer_class) in TAXONOMY.items():
+        if fields is not None and field not in fields:
+            continue
+        ids = _taxonomy_ids(carpets, field)
+        if not ids:
+            taxonomy[field] = []
+            continue
+        queryset = model.objects.filter(pk__in=ids)
+        if not model._meta.ordering:
+            queryset = queryset.order_by("pk")
+        taxonomy[field] = serializer_class(queryset, many=True, context=context).data
+    return taxonomy
+
+
+def compact_carpet_response(request, queryset, paginator, fields=None):
+    """
+    Ответ со списком ковров в компактном представлении.
+    queryset должен быть подготовлен with_carpet_relations(..., compact=True).
+    """
+    page = paginator.paginate_queryset(queryset, request)
+    carpets = list(queryset) if page is None else page
+    context = {"request": request}
+    data = trim_serializer(CarpetCompactSerializer(carpets, many=True, context=context), fields).data
+    taxonomy = carpet_taxonomy(carpets, context, fields)
+    if page is None:
+        return Response({"results": data, "taxonomy": taxonomy})
+    response = paginator.get_paginated_response(data)
+    response.data["taxonomy"] = taxonomy
+    return response
@@ -0,0 +1,64 @@
+"""Фасетные счетчики для фильтров каталога ковров"""
+
+from django.db.models import Count
+from django.db.models import Q
+
+from apps.catalog.models import Collection
+from apps.catalog.models import Color
+from apps.catalog.models import Room
+from apps.catalog.models import Style
+
+# Фасет -> queryset значений фильтра (все значения, включая нулевые)
+TAXONOMY_FACETS = {
+    "styles": lambda: Style.objects.all(),
+    "rooms": lambda: Room.objects.all(),
+    "colors": lambda: Color.objects.all(),
+    "collection": lambda: Collection.objects.filter(is_published=True),
+}
+FLAG_FACETS = ("is_new", "is_popular")
+
+
+def _filtered_ids(queryset, filterset, exclude=()):
+    """ID ковров, прошедших все фильтры filterset, кроме перечисленных в exclude"""
+    for name, value in filterset.form.cleaned_data.items():
+        if name not in exclude:
+            queryset = filterset.filters[name].filter(queryset, value)
+    return queryset.order_by().values("pk")
+
+
+def carpet_facets(queryset, filterset):
+    """
+    Количество ковров для каждого значения фасетов с учетом выбранных фильтров.
+
+    Для каждого фасета его собственный выбор не учитывается (drill-down):
+    при выбранном styles=modern счетчики стилей показывают, сколько ковров
+    даст выбор другого стиля вместо него. Каждый фасет-справочник считается
+    одним сгруппированным запросом, флаги и общее количество — еще одним.
+
+    filterset должен быть уже провалидирован.
+    """
+    facets = {}
+    for name, values in TAXONOMY_FACETS.items():
+        ids = _filtered_ids(queryset, filterset, exclude=(name,))
+        rows = values().annotate(
+            facet_count=Count("carpets", filter=Q(carpets__in=ids)),
+        ).values_list("slug", "facet_count")
+        facets[name] = dict(rows)
+
+    # Флаги считаются одним агрегатом по выборке без обоих флагов:
+    # выбор второго флага применяется как условие внутри Count
+    cleaned = filterset.form.cleaned_data
+    selected = {
+        flag: Q(**{flag: cleaned[flag]}) if cleaned.get(flag) is not None else Q()
+        for flag in FLAG_FACETS
+    }
+    ids = _filtered_ids(queryset, filterset, exclude=FLAG_FACETS)
+    # Псевдонимы агрегатов с префиксом facet_: имена полей is_new/is_popular
+    # используются в условиях filter, и совпадающий псевдоним дает FieldError
+    counts = queryset.model.objects.filter(pk__in=ids).aggregate(
+        facet_is_new=Count("pk", filter=Q(is_new=True) & selected["is_popular"]),
+        facet_is_popular=Count("pk", filter=Q(is_popular=True) & selected["is_new"]),
+        facet_total=Count("pk", filter=selected["is_new"] & selected["is_popular"]),
+    )
+    facets.update({name: counts[f"facet_{name}"] for name in (*FLAG_FACETS, "total")})
+    return facets
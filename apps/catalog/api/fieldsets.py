@@ -0,0 +1,143 @@
+"""
+Выборочные поля ответа (?fields=) и раскрытие вложенных связей (?expand=).
+
+    /api/carpets/?fields=id,code,photo,collection_slug
+    /api/carpets/?fields=id,code&expand=styles
+
+fields ограничивает набор полей ответа, expand — набор вложенных связей
+из Meta.expandable_fields сериализатора: если параметр передан, отдаются
+только перечисленные в нем связи (пустой expand= отключает все), даже если
+они не указаны в fields. Без обоих параметров ответ не меняется.
+
+Неиспользуемые поля не просто убираются из ответа: для них не загружаются
+связи (prefetch_related/select_related) и колонки, включая все языковые
+колонки переводимых полей.
+"""
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from modeltranslation.utils import build_localized_fieldname
+from rest_framework.exceptions import ValidationError
+from rest_framework.serializers import ListSerializer
+
+from .mixins import translated_field_names
+
+FIELDS_PARAM = "fields"
+EXPAND_PARAM = "expand"
+
+
+def parse_list_param(request, name):
+    """Значения параметра через запятую или None, если параметр не передан"""
+    if name not in request.query_params:
+        return None
+    return [v.strip() for value in request.query_params.getlist(name) for v in value.split(",") if v.strip()]
+
+
+def select_fields(serializer_class, fields, expand):
+    """
+    Имена полей сериализатора (в порядке Meta.fields) для значений параметров
+    fields и expand (None — параметр не передан). Неизвестные имена — ошибка 400.
+    """
+    meta = serializer_class.Meta
+    names = list(meta.fields)
+    expandable = set(getattr(meta, "expandable_fields", ()))
+
+    errors = {}
+    if fields is not None and (unknown := set(fields) - set(names)):
+        errors[FIELDS_PARAM] = [f"Неизвестные поля: {', '.join(sorted(unknown))}"]
+    if expand is not None and (unknown := set(expand) - expandable):
+        errors[EXPAND_PARAM] = [f"Нельзя раскрыть: {', '.join(sorted(unknown))}"]
+    if errors:
+        raise ValidationError(errors)
+
+    selected = set(names if fields is None else fields)
+    if expand is not None:
+        selected = (selected - expandable) | set(expand)
+    return tuple(name for name in names if name in selected)
+
+
+def field_columns(serializer_class, field):
+    """
+    Колонки модели, которые читает поле сериализатора.
+
+    Для полей, которые нельзя вывести из модели (SerializerMethodField),
+    колонки задаются в Meta.field_columns сериализатора.
+    """
+    meta = serializer_class.Meta
+    hints = getattr(meta, "field_columns", {})
+    if field in hints:
+        return tuple(hints[field])
+
+    declared = serializer_class._declared_fields.get(field)
+    if declared is not None and hasattr(declared, "meta_column"):
+        # Производные поля изображений (srcset, meta): файл и JSON-поле с данными
+        return (declared.image_field, declared.meta_column)
+    source = declared.source if declared is not None and declared.source else field
+    name = source.split(".")[0]
+    try:
+        model_field = meta.model._meta.get_field(name)
+    except FieldDoesNotExist:
+        return ()
+    if not model_field.concrete or model_field.many_to_many:
+        return ()
+    if name in translated_field_names(meta.model):
+        return tuple(build_localized_fieldname(name, language) for language in settings.MODELTRANSLATION_LANGUAGES)
+    return (name,)
+
+
+def only_columns(queryset, serializer_class, fields, always=()):
+    """queryset.only() с колонками, нужными выбранным полям сериализатора"""
+    columns = set(always)
+    for field in fields:
+        columns.update(field_columns(serializer_class, field))
+    return queryset.only(*sorted(columns))
+
+
+def trim_serializer(serializer, fields):
+    """Удаляет из сериализатора (или из child списка) поля, не вошедшие в fields"""
+    if fields is None:
+        return serializer
+    target = serializer.child if isinstance(serializer, ListSerializer) else serializer
+    for name in list(target.fields):
+        if name not in fields:
+            del target.fields[name]
+    return serializer
+
+
+class SparseFieldsetsMixin:
+    """
+    Миксин ViewSet: поддержка ?fields= и ?expand= для действий из sparse_actions.
+
+    Колонки queryset ограничиваются автоматически, связи — в get_queryset
+    конкретного ViewSet по результату get_sparse_fields().
+    """
+
+    sparse_actions = ("list", "retrieve")
+    # Колонки, нужные независимо от выбранных полей (сортировка, курсор пагинации)
+    sparse_always_columns = ()
+
+    def get_sparse_fields(self, serializer_class=None):
+        """
+        Выбранные поля сериализатора или None, если параметры не переданы
+        (или действие их не поддерживает) и нужны все поля.
+        """
+        if serializer_class is None:
+            if self.action not in self.sparse_actions:
+                return None
+            serializer_class = self.get_serializer_class()
+        fields = parse_list_param(self.request, FIELDS_PARAM)
+        expand = parse_list_param(self.request, EXPAND_PARAM)
+        if fields is None and expand is None:
+            return None
+        return select_fields(serializer_class, fields, expand)
+
+    def sparse_queryset(self, queryset, fields):
+        if fields is None:
+            return queryset
+        return only_columns(queryset, self.get_serializer_class(), fields, self.sparse_always_columns)
+
+    def get_queryset(self):
+        return self.sparse_queryset(super().get_queryset(), self.get_sparse_fields())
+
+    def get_serializer(self, *args, **kwargs):
+        return trim_serializer(super().get_serializer(*args, **kwargs), self.get_sparse_fields())
@@ -0,0 +1,100 @@
+"""Миксины для сериализаторов API каталога"""
+
+from functools import cache
+
+from django.conf import settings
+from modeltranslation.translator import NotRegistered
+from modeltranslation.translator import translator
+from modeltranslation.utils import build_localized_fieldname
+from rest_framework import serializers
+
+from .utils import get_language_from_request
+
+
+@cache
+def translated_field_names(model):
+    """Имена полей модели, зарегистрированных в modeltranslation"""
+    try:
+        return frozenset(translator.get_options_for_model(model).all_fields)
+    except NotRegistered:
+        return frozenset()
+
+
+@cache
+def localized_columns(field, language):
+    """
+    Цепочка колонок modeltranslation для чтения поля на языке language:
+    сначала запрошенный язык, затем языки из MODELTRANSLATION_FALLBACK_LANGUAGES.
+
+        localized_columns("name", "ru") -> ("name_ru", "name_uz", "name_en")
+    """
+    fallbacks = [lang for lang in settings.MODELTRANSLATION_FALLBACK_LANGUAGES if lang != language]
+    return tuple(build_localized_fieldname(field, lang) for lang in (language, *fallbacks))
+
+
+@cache
+def compile_translation_plan(serializer_class, language):
+    """
+    План перевода для пары (класс сериализатора, язык).
+
+    Вычисляется один раз: для каждого переводимого поля из Meta.fields
+    заранее строится цепочка колонок, которые нужно прочитать.
+    """
+    meta = serializer_class.Meta
+    translated = translated_field_names(meta.model)
+    return tuple(
+        (field, localized_columns(field, language))
+        for field in meta.fields
+        if field in translated
+    )
+
+
+def resolve_translation(instance, columns):
+    """Возвращает первое непустое значение из цепочки колонок"""
+    for column in columns:
+        value = getattr(instance, column)
+        if value:
+            return value
+    return getattr(instance, columns[0])
+
+
+class TranslatedFieldsMixin:
+    """
+    Подставляет в ответ значения переводимых полей на языке из query параметра lang.
+
+    Язык определяется один раз на запрос и сохраняется в контексте сериализатора
+    (контекст общий для вложенных сериализаторов), а набор колонок для чтения
+    берется из скомпилированного плана compile_translation_plan.
+    """
+
+    def get_language(self):
+        """Язык ответа или None, если сериализатор используется без запроса"""
+        context = self.context
+        language = context.get("language")
+        if language is None:
+            request = context.get("request")
+            if request is None:
+                return None
+            language = context["language"] = get_language_from_request(request)
+        return language
+
+    def translate(self, instance, field):
+        """Значение переводимого поля произвольного объекта (например, связанного)"""
+        language = self.get_language()
+        if language is None:
+            return getattr(instance, field)
+        return resolve_translation(instance, localized_columns(field, language))
+
+    def to_representation(self, instance):
+        representation = super().to_representation(instance)
+        language = self.get_language()
+        if language is not None:
+            for field, columns in compile_translation_plan(type(self), language):
+                # Поле могло быть исключено из ответа (?fields=), его колонки тогда не загружены
+                if field in representation:
+                    representation[field] = resolve_translation(instance, columns)
+        return representation
+
+
+class TranslatedModelSerializer(TranslatedFieldsMixin, serializers.ModelSerializer):
+    """ModelSerializer с поддержкой мультиязычных полей"""
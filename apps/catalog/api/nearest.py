@@ -0,0 +1,122 @@
+"""
+Поиск ближайших торговых точек в памяти процесса (/api/regions/nearest/).
+
+Опубликованные точки опубликованных регионов с координатами раскладываются
+по ячейкам сетки CELL_DEGREES x CELL_DEGREES градусов. Поиск обходит кольца
+ячеек вокруг ячейки запроса и останавливается, как только найденные точки
+заведомо ближе любой точки за пределами обойденных колец, поэтому расстояние
+считается только для точек из соседних ячеек. БД на пути запроса не нужна:
+точки (с регионом) хранятся в индексе загруженными.
+
+Индекс перестраивается в каждом процессе при изменении поколений Region
+и SalesPoint (см. apps.catalog.cache), как и битовые карты ковров.
+"""
+
+import heapq
+import math
+import threading
+
+from apps.catalog.cache import get_generations
+from apps.catalog.geo import EARTH_RADIUS_KM
+from apps.catalog.geo import haversine_km
+from apps.catalog.models import Region
+from apps.catalog.models import SalesPoint
+
+# Модели, от которых зависит индекс
+INDEX_MODELS = (Region, SalesPoint)
+# Размер ячейки сетки в градусах (~55 км по широте)
+CELL_DEGREES = 0.5
+
+_index = None
+_lock = threading.Lock()
+
+
+def _cell(lat, lon):
+    return math.floor(lat / CELL_DEGREES), math.floor(lon / CELL_DEGREES)
+
+
+def _ring(center, radius):
+    """Ячейки на границе квадрата со стороной 2 * radius + 1 вокруг center"""
+    row, column = center
+    if radius == 0:
+        yield center
+        return
+    for offset in range(-radius, radius + 1):
+        yield row - radius, column + offset
+        yield row + radius, column + offset
+    for offset in range(-radius + 1, radius):
+        yield row + offset, column - radius
+        yield row + offset, column + radius
+
+
+class SalesPointGridIndex:
+    """Сетка торговых точек: ячейка -> [(широта, долгота, точка)]"""
+
+    def __init__(self, version, points):
+        self.version = version
+        self.cells = {}
+        for point in points:
+            self.cells.setdefault(_cell(point.latitude, point.longitude), []).append(
+                (point.latitude, point.longitude, point)
+            )
+        self.max_latitude = max((abs(point.latitude) for point in points), default=0.0)
+
+    def __len__(self):
+        return sum(len(items) for items in self.cells.values())
+
+    def _rings(self, center):
+        """Номера колец, пересекающих занятые ячейки (от ближнего к дальнему)"""
+        distances = [max(abs(row - center[0]), abs(column - center[1])) for row, column in self.cells]
+        return range(min(distances), max(distances) + 1) if distances else range(0)
+
+    def _outside_bound(self, latitude, radius):
+        """
+        Нижняя граница расстояния (км) до любой точки вне колец 0..radius:
+        у такой точки разница широт или долгот больше radius * CELL_DEGREES.
+        Граница по долготе меньше, она считается на самой высокой широте индекса.
+        """
+        cos_max = math.cos(math.radians(min(90.0, max(self.max_latitude, abs(latitude)))))
+        half_angle = min(math.pi / 2, math.radians(radius * CELL_DEGREES) / 2)
+        return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, cos_max * math.sin(half_angle)))
+
+    def nearest(self, latitude, longitude, limit):
+        """До limit ближайших точек: [(расстояние в км, точка)] по возрастанию расстояния"""
+        center = _cell(latitude, longitude)
+        distances = []
+        for radius in self._rings(center):
+            for cell in _ring(center, radius):
+                for lat, lon, point in self.cells.get(cell, ()):
+                    distances.append((haversine_km(latitude, longitude, lat, lon), point.pk, point))
+            if len(distances) >= limit:
+                best = heapq.nsmallest(limit, distances)
+                if best[-1][0] <= self._outside_bound(latitude, radius):
+                    break
+        return [(distance, point) for distance, _, point in heapq.nsmallest(limit, distances)]
+
+
+def build_sales_point_index(version):
+    """Строит индекс по БД одним запросом (точки вместе с регионами)"""
+    points = list(
+        SalesPoint.objects.filter(
+            is_published=True,
+            region__is_published=True,
+            latitude__isnull=False,
+            longitude__isnull=False,
+        )
+        .select_related("region")
+        .order_by("id")
+    )
+    return SalesPointGridIndex(version, points)
+
+
+def sales_point_index():
+    """Индекс текущей версии (перестраивается в процессе при изменении регионов и точек)"""
+    global _index
+    version = tuple(get_generations(INDEX_MODELS))
+    index = _index
+    if index is None or index.version != version:
+        with _lock:
+            if _index is None or _index.version != version:
+                _index = build_sales_point_index(version)
+            index = _index
+    return index
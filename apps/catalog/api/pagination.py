@@ -0,0 +1,145 @@
+"""Пагинация для API каталога"""
+
+import base64
+import binascii
+import json
+from functools import reduce
+from operator import or_
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param
+from rest_framework.utils.urls import replace_query_param
+
+
+class StandardResultsSetPagination(PageNumberPagination):
+    """Пагинация для списков"""
+    page_size = 12
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+
+def keyset_ordering(queryset):
+    """
+    Порядок сортировки queryset для keyset-пагинации.
+    В конец всегда добавляется id, чтобы ключ был уникальным.
+    """
+    ordering = list(queryset.query.order_by or queryset.model._meta.ordering)
+    if not {"id", "-id", "pk", "-pk"} & set(ordering):
+        ordering.append("id")
+    return ordering
+
+
+def keyset_filter(ordering, values):
+    """
+    Условие "строка идет после (values)" для составного ключа сортировки.
+
+    Для ordering (-watched, -created_at, id) и values (w, c, i):
+        watched < w
+        OR (watched = w AND created_at < c)
+        OR (watched = w AND created_at = c AND id > i)
+    """
+    conditions = []
+    equal = {}
+    for field, value in zip(ordering, values, strict=True):
+        name = field.lstrip("-")
+        lookup = "lt" if field.startswith("-") else "gt"
+        conditions.append(Q(**equal, **{f"{name}__{lookup}": value}))
+        equal[name] = value
+    return reduce(or_, conditions)
+
+
+def cursor_field(queryset, name):
+    """Поле модели или аннотации queryset, по которому идет сортировка"""
+    if name in queryset.query.annotations:
+        return queryset.query.annotations[name].output_field
+    if name == "pk":
+        return queryset.model._meta.pk
+    return queryset.model._meta.get_field(name)
+
+
+class CursorOptionalPagination(StandardResultsSetPagination):
+    """
+    Постраничная пагинация с опциональным keyset-режимом для бесконечной прокрутки.
+
+    Без параметра cursor работает как StandardResultsSetPagination.
+    С параметром cursor (первая страница: ?cursor=) выборка продолжается
+    после последней строки предыдущей страницы по составному ключу сортировки
+    queryset, без COUNT(*) и OFFSET: время ответа не зависит от глубины.
+    Ответ: {"next": url | null, "results": [...]}.
+    """
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.use_cursor = self.cursor_query_param in request.query_params
+        if not self.use_cursor:
+            return super().paginate_queryset(queryset, request, view)
+
+        self.request = request
+        page_size = self.get_page_size(request)
+        ordering = keyset_ordering(queryset)
+
+        values = self.decode_cursor(request, queryset, ordering)
+        if values is not None:
+            queryset = queryset.filter(keyset_filter(ordering, values))
+
+        rows = list(queryset.order_by(*ordering)[: page_size + 1])
+        self.has_next = len(rows) > page_size
+        page = rows[:page_size]
+        self.next_cursor = None
+        if self.has_next:
+            last = page[-1]
+            values = [getattr(last, field.lstrip("-")) for field in ordering]
+            self.next_cursor = self.encode_cursor(ordering, values)
+        return page
+
+    def get_paginated_response(self, data):
+        if not self.use_cursor:
+            return super().get_paginated_response(data)
+        return Response({"next": self.get_next_link(), "results": data})
+
+    def get_next_link(self):
+        if not self.use_cursor:
+            return super().get_next_link()
+        if self.next_cursor is None:
+            return None
+        url = remove_query_param(self.request.build_absolute_uri(), self.page_query_param)
+        return replace_query_param(url, self.cursor_query_param, self.next_cursor)
+
+    def encode_cursor(self, ordering, values):
+        payload = json.dumps({"o": ordering, "v": values}, default=str, separators=(",", ":"))
+        return base64.urlsafe_b64encode(payload.encode()).decode()
+
+    def decode_cursor(self, request, queryset, ordering):
+        """
+        Значения ключа сортировки из курсора запроса или None для первой страницы.
+        Значения приводятся к типам полей: подделанный курсор дает 404, а не ошибку БД.
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            cursor = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+        except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+            raise NotFound(self.invalid_cursor_message) from exc
+        if (
+            not isinstance(cursor, dict)
+            or cursor.get("o") != ordering
+            or not isinstance(cursor.get("v"), list)
+            or len(cursor["v"]) != len(ordering)
+        ):
+            raise NotFound(self.invalid_cursor_message)
+        try:
+            values = [
+                cursor_field(queryset, field.lstrip("-")).to_python(value)
+                for field, value in zip(ordering, cursor["v"])
+            ]
+        except (ValidationError, ValueError, TypeError) as exc:
+            raise NotFound(self.invalid_cursor_message) from exc
+        if None in values:
+            raise NotFound(self.invalid_cursor_message)
+        return values
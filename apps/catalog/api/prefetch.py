@@ -0,0 +1,118 @@
+"""Планы предзагрузки связанных объектов для API каталога"""
+
+from django.contrib.postgres.expressions import ArraySubquery
+from django.db.models import F
+from django.db.models import OuterRef
+from django.db.models import Prefetch
+
+from apps.catalog.models import Carpet
+from apps.catalog.models import CarpetCharacteristic
+from apps.catalog.models import CarpetImage
+from apps.catalog.models import CompanyHistory
+from apps.catalog.models import ProductionStep
+from apps.catalog.models import SalesPoint
+
+
+# Поля сериализаторов ковров, которым нужна коллекция (select_related)
+CARPET_COLLECTION_FIELDS = {"collection", "collection_name", "collection_slug"}
+# Поле ковра -> (аннотация со списком ID, колонка справочника в промежуточной таблице)
+CARPET_TAXONOMY_IDS = {
+    "styles": ("style_ids", "style_id"),
+    "rooms": ("room_ids", "room_id"),
+    "colors": ("color_ids", "color_id"),
+}
+
+
+def carpet_prefetches(fields=None, compact=False):
+    """
+    Prefetch-объекты для ковров с уже примененной сортировкой.
+
+    Сериализаторы ковров читают связи только через .all(), то есть из кэша
+    предзагрузки, поэтому страница любого размера обходится фиксированным
+    числом запросов. fields — выбранные поля сериализатора (None — все):
+    связи невыбранных полей не загружаются.
+
+    В компактном представлении стили, комнаты и цвета не загружаются
+    (их ID дает with_taxonomy_ids), а характеристики — без справочника.
+    """
+    prefetches = {
+        "styles": "styles",
+        "rooms": "rooms",
+        "colors": "colors",
+        "gallery_images": Prefetch(
+            "gallery_images",
+            queryset=CarpetImage.objects.order_by("order"),
+        ),
+        "characteristics": Prefetch(
+            "characteristics",
+            queryset=CarpetCharacteristic.objects.select_related("characteristic").order_by(
+                "order", "characteristic__order"
+            ),
+        ),
+    }
+    if compact:
+        for field in CARPET_TAXONOMY_IDS:
+            del prefetches[field]
+        prefetches["characteristics"] = Prefetch(
+            "characteristics",
+            queryset=CarpetCharacteristic.objects.order_by("order", "characteristic__order"),
+        )
+    return [prefetch for field, prefetch in prefetches.items() if fields is None or field in fields]
+
+
+def with_carpet_stats(queryset):
+    """
+    Аннотирует ковры счетчиком просмотров из CarpetStats.
+    Аннотация watched используется в сериализаторах и для сортировки (?ordering=watched, sort=popular).
+    """
+    return queryset.annotate(watched=F("stats__watched"))
+
+
+def with_taxonomy_ids(queryset, fields=None):
+    """
+    Аннотирует ковры списками ID стилей, комнат и цветов (style_ids, room_ids, color_ids).
+
+    Списки собираются подзапросами ARRAY(...) по промежуточным таблицам M2M
+    в том же запросе, что и ковры, без чтения самих справочников.
+    """
+    annotations = {}
+    for field, (annotation, column) in CARPET_TAXONOMY_IDS.items():
+        if fields is None or field in fields:
+            through = getattr(Carpet, field).through
+            annotations[annotation] = ArraySubquery(
+                through.objects.filter(carpet_id=OuterRef("pk")).order_by(column).values(column),
+            )
+    return queryset.annotate(**annotations)
+
+
+def with_carpet_relations(queryset, fields=None, compact=False):
+    """
+    Добавляет к queryset ковров коллекцию, счетчики и упорядоченные связи (для выбранных полей).
+    compact — для компактного представления (CarpetCompactSerializer).
+    """
+    if fields is None or CARPET_COLLECTION_FIELDS.intersection(fields):
+        queryset = queryset.select_related("collection")
+    if compact:
+        queryset = with_taxonomy_ids(queryset, fields)
+    return with_carpet_stats(queryset).prefetch_related(*carpet_prefetches(fields, compact))
+
+
+def with_about_page_relations(queryset):
+    """
+    Добавляет к queryset страницы о компании этапы производства и историю
+    в порядке вывода: страница со всеми секциями загружается тремя запросами.
+    """
+    return queryset.prefetch_related(
+        Prefetch("production_steps", queryset=ProductionStep.objects.order_by("order", "id")),
+        Prefetch("company_history", queryset=CompanyHistory.objects.order_by("year", "id")),
+    )
+
+
+def with_published_sales_points(queryset):
+    """
+    Добавляет к queryset регионов опубликованные торговые точки в порядке вывода:
+    регионы с точками загружаются двумя запросами.
+    """
+    return queryset.prefetch_related(
+        Prefetch("sales_points", queryset=SalesPoint.objects.filter(is_published=True).order_by("order", "id")),
+    )
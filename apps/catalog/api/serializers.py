@@ -1,5 +1,7 @@
 from rest_framework import serializers
-from django.utils import translation
+from django.core.files.storage import default_storage
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema_field
 
 from apps.catalog.models import (
     AboutImage,
@@ -29,8 +31,12 @@ from apps.catalog.models import (
     SalesPoint,
     Style,
 )
+from apps.catalog.image_info import image_info
+from apps.catalog.renditions import RENDITION_FORMATS
+from apps.catalog.renditions import rendition_path
+
+from .mixins import TranslatedModelSerializer
 from .utils import build_absolute_uri_https
-from .utils import get_language_from_request
 
 
 class ImageFieldSerializer(serializers.ImageField):
@@ -44,6 +50,59 @@ class ImageFieldSerializer(serializers.ImageField):
         return value.url
 
 
+@extend_schema_field(OpenApiTypes.OBJECT)
+class ImageRenditionsField(serializers.Field):
+    """
+    Уменьшенные копии изображения в виде srcset по форматам:
+    {"webp": "https://.../320.webp 320w, ...", "jpeg": "..."}.
+    None, пока копии для текущего файла не сгенерированы.
+    """
+    meta_column = "renditions"
+
+    def __init__(self, image_field, **kwargs):
+        self.image_field = image_field
+        kwargs["source"] = "*"
+        kwargs["read_only"] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, instance):
+        field_file = getattr(instance, self.image_field)
+        meta = (instance.renditions or {}).get(self.image_field)
+        if not field_file or not meta or meta.get("source") != field_file.name:
+            return None
+        request = self.context.get("request")
+        return {
+            fmt: ", ".join(
+                f"{build_absolute_uri_https(request, default_storage.url(rendition_path(meta['hash'], width, fmt)))}"
+                f" {width}w"
+                for width in meta["widths"]
+            )
+            for fmt in RENDITION_FORMATS
+        }
+
+
+@extend_schema_field(OpenApiTypes.OBJECT)
+class ImageMetaField(serializers.Field):
+    """
+    Размеры, доминирующий цвет и LQIP-заглушка изображения:
+    {"width": 1600, "height": 1067, "color": "#a08c78", "lqip": "data:image/jpeg;base64,..."}.
+    Берутся из image_meta модели, файл не открывается.
+    """
+    meta_column = "image_meta"
+
+    def __init__(self, image_field, **kwargs):
+        self.image_field = image_field
+        kwargs["source"] = "*"
+        kwargs["read_only"] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, instance):
+        info = image_info(instance, self.image_field)
+        if info is None:
+            return None
+        return {key: info[key] for key in ("width", "height", "color", "lqip")}
+
+
 class FileFieldSerializer(serializers.FileField):
     """Кастомное поле для файлов с полным URL (https в продакшне)"""
     def to_representation(self, value):
@@ -55,106 +114,38 @@ class FileFieldSerializer(serializers.FileField):
         return value.url
 
 
-class StyleSerializer(serializers.ModelSerializer):
+class StyleSerializer(TranslatedModelSerializer):
     """Сериализатор для стилей"""
 
     class Meta:
         model = Style
         fields = ["id", "name", "slug"]
         read_only_fields = ["id", "slug"]
-    
-    def to_representation(self, instance):
-        """Возвращает данные на языке из query параметра lang"""
-        representation = super().to_representation(instance)
-        request = self.context.get("request")
-        
-        if request:
-            language = get_language_from_request(request)
-            
-            # Всегда используем языковые поля, если они доступны
-            lang_suffix = f"_{language}" if language else ""
-            lang_field = f"name{lang_suffix}"
-            
-            if hasattr(instance, lang_field):
-                lang_value = getattr(instance, lang_field, None)
-                if lang_value:
-                    representation["name"] = lang_value
-                elif not representation.get("name"):
-                    representation["name"] = instance.name
-            else:
-                representation["name"] = instance.name
-        
-        return representation
 
 
-class RoomSerializer(serializers.ModelSerializer):
+class RoomSerializer(TranslatedModelSerializer):
     """Сериализатор для комнат"""
 
     class Meta:
         model = Room
         fields = ["id", "name", "slug"]
         read_only_fields = ["id", "slug"]
-    
-    def to_representation(self, instance):
-        """Возвращает данные на языке из query параметра lang"""
-        representation = super().to_representation(instance)
-        request = self.context.get("request")
-        
-        if request:
-            language = get_language_from_request(request)
-            
-            # Всегда используем языковые поля, если они доступны
-            lang_suffix = f"_{language}" if language else ""
-            lang_field = f"name{lang_suffix}"
-            
-            if hasattr(instance, lang_field):
-                lang_value = getattr(instance, lang_field, None)
-                if lang_value:
-                    representation["name"] = lang_value
-                elif not representation.get("name"):
-                    representation["name"] = instance.name
-            else:
-                representation["name"] = instance.name
-        
-        return representation
 
 
-class ColorSerializer(serializers.ModelSerializer):
+class ColorSerializer(TranslatedModelSerializer):
     """Сериализатор для цветов"""
 
     class Meta:
         model = Color
         fields = ["id", "name", "slug", "hex_code"]
         read_only_fields = ["id", "slug"]
-    
-    def to_representation(self, instance):
-        """Возвращает данные на языке из query параметра lang"""
-        representation = super().to_representation(instance)
-        request = self.context.get("request")
-        
-        if request:
-            language = get_language_from_request(request)
-            
-            # Всегда используем языковые поля, если они доступны
-            lang_suffix = f"_{language}" if language else ""
-            lang_field = f"name{lang_suffix}"
-            
-            if hasattr(instance, lang_field):
-                lang_value = getattr(instance, lang_field, None)
-                if lang_value:
-                    representation["name"] = lang_value
-                elif not representation.get("name"):
-                    representation["name"] = instance.name
-            else:
-                representation["name"] = instance.name
-        
-        return representation
 
 
-class CollectionListSerializer(serializers.ModelSerializer):
+class CollectionListSerializer(TranslatedModelSerializer):
     """Сериализатор для списка коллекций"""
-    carpets_count = serializers.IntegerField(source="carpets.count", read_only=True)
     image = ImageFieldSerializer(required=False, allow_null=True)
+    image_srcset = ImageRenditionsField("image")
+    image_meta = ImageMetaField("image")
 
     class Meta:
         model = Collection
@@ -164,40 +155,20 @@ class CollectionListSerializer(serializers.ModelSerializer):
             "slug",
             "description",
             "image",
+            "image_srcset",
+            "image_meta",
             "is_new",
             "carpets_count",
             "created_at",
         ]
-        read_only_fields = ["id", "slug", "created_at"]
-    
-    def to_representation(self, instance):
-        """Возвращает данные на языке из query параметра lang"""
-        representation = super().to_representation(instance)
-        request = self.context.get("request")
-        
-        if request:
-            language = get_language_from_request(request)
-            
-            # Всегда используем языковые поля, если они доступны
-            lang_suffix = f"_{language}" if language else ""
-            
-            for field in ['name', 'description']:
-                lang_field = f"{field}{lang_suffix}"
-                if hasattr(instance, lang_field):
-                    lang_value = getattr(instance, lang_field, None)
-                    if lang_value:
-                        representation[field] = lang_value
-                    elif not representation.get(field):
-                        representation[field] = getattr(instance, field, None)
-                else:
-                    representation[field] = getattr(instance, field, None)
-        
-        return representation
+        read_only_fields = ["id", "slug", "carpets_count", "created_at"]
 
 
-class CollectionDetailSerializer(serializers.ModelSerializer):
+class CollectionDetailSerializer(TranslatedModelSerializer):
     """Сериализатор для детальной информации о коллекции"""
     image = ImageFieldSerializer(required=False, allow_null=True)
+    image_srcset = ImageRenditionsField("image")
+    image_meta = ImageMetaField("image")
 
     class Meta:
         model = Collection
@@ -207,86 +178,30 @@ class CollectionDetailSerializer(serializers.ModelSerializer):
             "slug",
             "description",
             "image",
+            "image_srcset",
+            "image_meta",
             "is_published",
             "is_new",
+            "carpets_count",
             "created_at",
             "update_at",
             # SEO поля
             "seo_title",
             "seo_description",
         ]
-        read_only_fields = ["id", "slug", "created_at", "update_at"]
-    
-    def to_representation(self, instance):
-        """Возвращает данные на языке из query параметра lang"""
-        representation = super().to_representation(instance)
-        request = self.context.get("request")
-        
-        if request:
-            language = get_language_from_request(request)
-            
-            # Всегда используем языковые поля, если они доступны
-            lang_suffix = f"_{language}" if language else ""
-            
-            for field in ['name', 'description']:
-                lang_field = f"{field}{lang_suffix}"
-                if hasattr(instance, lang_field):
-                    lang_value = getattr(instance, lang_field, None)
-                    if lang_value:
-                        representation[field] = lang_value
-                    elif not representation.get(field):
-                        representation[field] = getattr(instance, field, None)
-                else:
-                    representation[field] = getattr(instance, field, None)
-            
-            # SEO поля
-            for field in ['seo_title', 'seo_description']:
-                lang_field = f"{field}{lang_suffix}"
-                if hasattr(instance, lang_field):
-                    lang_value = getattr(instance, lang_field, None)
-                    if lang_value:
-                        representation[field] = lang_value
-                    elif not representation.get(field):
-                        representation[field] = getattr(instance, field, None)
-                else:
-                    representation[field] = getattr(instance, field, None)
-        
-        return representation
+        read_only_fields = ["id", "slug", "carpets_count", "created_at", "update_at"]
 
 
-class CharacteristicSerializer(serializers.ModelSerializer):
+class CharacteristicSerializer(TranslatedModelSerializer):
     """Сериализатор для характеристик"""
     
     class Meta:
         model = Characteristic
         fields = ["id", "name", "order"]
         read_only_fields = ["id"]
-    
-    def to_representation(self, instance):
-        """Возвращает данные на языке из query параметра lang"""
-        representation = super().to_representation(instance)
-        request = self.context.get("request")
-        
-        if request:
-            language = get_language_from_request(request)
-            
-            # Всегда используем языковые поля, если они доступны
-            lang_suffix = f"_{language}" if language else ""
-            lang_field = f"name{lang_suffix}"
-            
-            if hasattr(instance, lang_field):
-                lang_value = getattr(instance, lang_field, None)
-                if lang_value:
-                    representation["name"] = lang_value
-                elif not representation.get("name"):
-                    representation["name"] = instance.name
-            else:
-                representation["name"] = instance.name
-        
-        return representation
 
 
-class CarpetCharacteristicSerializer(serializers.ModelSerializer):
+class CarpetCharacteristicSerializer(TranslatedModelSerializer):
     """Сериализатор для характеристик ковра"""
     characteristic = CharacteristicSerializer(read_only=True)
     characteristic_id = serializers.PrimaryKeyRelatedField(
@@ -300,42 +215,21 @@ class CarpetCharacteristicSerializer(serializers.ModelSerializer):
         model = CarpetCharacteristic
         fields = ["id", "characteristic", "characteristic_id", "value", "order"]
         read_only_fields = ["id"]
-    
-    def to_representation(self, instance):
-        """Возвращает данные на языке из query параметра lang"""
-        representation = super().to_representation(instance)
-        request = self.context.get("request")
-        
-        if request:
-            language = get_language_from_request(request)
-            
-            # Всегда используем языковые поля для value, если они доступны
-            lang_suffix = f"_{language}" if language else ""
-            lang_field = f"value{lang_suffix}"
-            
-            if hasattr(instance, lang_field):
-                lang_value = getattr(instance, lang_field, None)
-                if lang_value:
-                    representation["value"] = lang_value
-                elif not representation.get("value"):
-                    representation["value"] = instance.value
-            else:
-                representation["value"] = instance.value
-        
-        return representation
 
 
 class CarpetImageSerializer(serializers.ModelSerializer):
     """Сериализатор для изображений галереи ковра"""
     image = ImageFieldSerializer(required=False, allow_null=True)
+    image_srcset = ImageRenditionsField("image")
+    image_meta = ImageMetaField("image")
     
     class Meta:
         model = CarpetImage
-        fields = ["id", "image", "order"]
+        fields = ["id", "image", "image_srcset", "image_meta", "order"]
         read_only_fields = ["id"]
 
 
-class CarpetListSerializer(serializers.ModelSerializer):
+class CarpetListSerializer(TranslatedModelSerializer):
     """Сериализатор для списка ковров"""
     collection_name = serializers.SerializerMethodField()
     collection_slug = serializers.CharField(source="collection.slug", read_only=True)
@@ -343,6 +237,9 @@ class CarpetListSerializer(serializers.ModelSerializer):
     rooms = RoomSerializer(many=True, read_only=True)
     colors = ColorSerializer(many=True, read_only=True)
     photo = ImageFieldSerializer(required=False, allow_null=True)
+    photo_srcset = ImageRenditionsField("photo")
+    photo_meta = ImageMetaField("photo")
+    watched = serializers.IntegerField(read_only=True)
     gallery_images = serializers.SerializerMethodField()
     characteristics = serializers.SerializerMethodField()
 
@@ -352,6 +249,8 @@ class CarpetListSerializer(serializers.ModelSerializer):
             "id",
             "code",
             "photo",
+            "photo_srcset",
+            "photo_meta",
             "collection_name",
             "collection_slug",
             "roll",
@@ -369,76 +268,56 @@ class CarpetListSerializer(serializers.ModelSerializer):
             "seo_description",
         ]
         read_only_fields = ["id", "watched", "created_at"]
+        # Вложенные связи, управляемые параметром ?expand= (см. api.fieldsets)
+        expandable_fields = ["styles", "rooms", "colors", "characteristics", "gallery_images"]
+        field_columns = {"collection_name": ["collection"]}
     
     def get_gallery_images(self, obj):
-        """Получить список изображений галереи ковра"""
-        images = obj.gallery_images.all().order_by('order')
+        """Получить список изображений галереи ковра (порядок задан в carpet_prefetches)"""
+        images = obj.gallery_images.all()
         return CarpetImageSerializer(images, many=True, context=self.context).data
     
     def get_characteristics(self, obj):
-        """Получить список характеристик ковра"""
-        characteristics = obj.characteristics.all().order_by('order', 'characteristic__order')
+        """Получить список характеристик ковра (порядок задан в carpet_prefetches)"""
+        characteristics = obj.characteristics.all()
         return CarpetCharacteristicSerializer(characteristics, many=True, context=self.context).data
     
     def get_collection_name(self, obj):
         """Получить название коллекции на нужном языке"""
-        request = self.context.get("request")
-        if request:
-            language = get_language_from_request(request)
-            lang_suffix = f"_{language}" if language else ""
-            lang_field = f"name{lang_suffix}"
-            
-            collection = obj.collection
-            if hasattr(collection, lang_field):
-                lang_value = getattr(collection, lang_field, None)
-                if lang_value:
-                    return lang_value
-            return collection.name
-        return obj.collection.name
-    
-    def to_representation(self, instance):
-        """Возвращает данные на языке из query параметра lang"""
-        representation = super().to_representation(instance)
-        request = self.context.get("request")
-        
-        if request:
-            language = get_language_from_request(request)
-            
-            # Всегда используем языковые поля для code, если они доступны
-            lang_suffix = f"_{language}" if language else ""
-            lang_field = f"code{lang_suffix}"
-            
-            if hasattr(instance, lang_field):
-                lang_value = getattr(instance, lang_field, None)
-                if lang_value:
-                    representation["code"] = lang_value
-                elif not representation.get("code"):
-                    representation["code"] = instance.code
-            else:
-                representation["code"] = instance.code
-            
-            # SEO поля
-            for field in ['seo_title', 'seo_description']:
-                lang_field = f"{field}{lang_suffix}"
-                if hasattr(instance, lang_field):
-                    lang_value = getattr(instance, lang_field, None)
-                    if lang_value:
-                        representation[field] = lang_value
-                    elif representation.get(field) is None:
-                        representation[field] = getattr(instance, field, None)
-                elif representation.get(field) is None:
-                    representation[field] = getattr(instance, field, None)
-        
-        return representation
+        return self.translate(obj.collection, "name")
+
+
+class CarpetCompactSerializer(CarpetListSerializer):
+    """
+    Компактное представление ковра для списков: стили, комнаты и цвета — списками ID,
+    характеристики — ID справочника со значением. Сами справочники отдаются один раз
+    на страницу в блоке taxonomy (см. api.compact).
+    """
+    styles = serializers.ListField(child=serializers.IntegerField(), source="style_ids", read_only=True)
+    rooms = serializers.ListField(child=serializers.IntegerField(), source="room_ids", read_only=True)
+    colors = serializers.ListField(child=serializers.IntegerField(), source="color_ids", read_only=True)
 
+    class Meta(CarpetListSerializer.Meta):
+        pass
 
-class CarpetDetailSerializer(serializers.ModelSerializer):
+    def get_characteristics(self, obj):
+        """Характеристики ковра: [{"id": ID характеристики, "value": значение, "order": порядок}]"""
+        return [
+            {"id": item.characteristic_id, "value": self.translate(item, "value"), "order": item.order}
+            for item in obj.characteristics.all()
+        ]
+
+
+class CarpetDetailSerializer(TranslatedModelSerializer):
     """Сериализатор для детальной информации о ковре"""
     collection = CollectionListSerializer(read_only=True)
     styles = StyleSerializer(many=True, read_only=True)
     rooms = RoomSerializer(many=True, read_only=True)
     colors = ColorSerializer(many=True, read_only=True)
     photo = ImageFieldSerializer(required=False, allow_null=True)
+    photo_srcset = ImageRenditionsField("photo")
+    photo_meta = ImageMetaField("photo")
+    watched = serializers.IntegerField(read_only=True)
     gallery_images = serializers.SerializerMethodField()
     characteristics = serializers.SerializerMethodField()
 
@@ -448,6 +327,8 @@ class CarpetDetailSerializer(serializers.ModelSerializer):
             "id",
             "code",
             "photo",
+            "photo_srcset",
+            "photo_meta",
             "collection",
             "is_new",
             "is_popular",
@@ -466,51 +347,18 @@ class CarpetDetailSerializer(serializers.ModelSerializer):
             "seo_description",
         ]
         read_only_fields = ["id", "watched", "created_at", "update_at"]
+        # Вложенные связи, управляемые параметром ?expand= (см. api.fieldsets)
+        expandable_fields = ["styles", "rooms", "colors", "characteristics", "gallery_images"]
     
     def get_gallery_images(self, obj):
-        """Получить список изображений галереи ковра"""
-        images = obj.gallery_images.all().order_by('order')
+        """Получить список изображений галереи ковра (порядок задан в carpet_prefetches)"""
+        images = obj.gallery_images.all()
         return CarpetImageSerializer(images, many=True, context=self.context).data
     
     def get_characteristics(self, obj):
-        """Получить список характеристик ковра"""
-        characteristics = obj.characteristics.all().order_by('order', 'characteristic__order')
+        """Получить список характеристик ковра (порядок задан в carpet_prefetches)"""
+        characteristics = obj.characteristics.all()
         return CarpetCharacteristicSerializer(characteristics, many=True, context=self.context).data
-    
-    def to_representation(self, instance):
-        """Возвращает данные на языке из query параметра lang"""
-        representation = super().to_representation(instance)
-        request = self.context.get("request")
-        
-        if request:
-            language = get_language_from_request(request)
-            
-            # Всегда используем языковые поля для code, если они доступны
-            lang_suffix = f"_{language}" if language else ""
-            lang_field = f"code{lang_suffix}"
-            
-            if hasattr(instance, lang_field):
-                lang_value = getattr(instance, lang_field, None)
-                if lang_value:
-                    representation["code"] = lang_value
-                elif not representation.get("code"):
-                    representation["code"] = instance.code
-            else:
-                representation["code"] = instance.code
-            
-            # SEO поля
-            for field in ['seo_title', 'seo_description']:
-                lang_field = f"{field}{lang_suffix}"
-                if hasattr(instance, lang_field):
-                    lang_value = getattr(instance, lang_field, None)
-                    if lang_value:
-                        representation[field] = lang_value
-                    elif representation.get(field) is None:
-                        representation[field] = getattr(instance, field, None)
-                elif representation.get(field) is None:
-                    representation[field] = getattr(instance, field, None)
-        
-        return representation
 
 
 class NewsImageSerializer(serializers.ModelSerializer):
@@ -523,9 +371,11 @@ class NewsImageSerializer(serializers.ModelSerializer):
         read_only_fields = ["id"]
 
 
-class NewsListSerializer(serializers.ModelSerializer):
+class NewsListSerializer(TranslatedModelSerializer):
     """Сериализатор для списка новостей"""
     cover_image = ImageFieldSerializer(required=False, allow_null=True)
+    cover_image_srcset = ImageRenditionsField("cover_image")
+    cover_image_meta = ImageMetaField("cover_image")
 
     class Meta:
         model = News
@@ -534,35 +384,18 @@ class NewsListSerializer(serializers.ModelSerializer):
             "title",
             "slug",
             "cover_image",
+            "cover_image_srcset",
+            "cover_image_meta",
             "created_at",
         ]
         read_only_fields = ["id", "slug", "created_at"]
-    
-    def to_representation(self, instance):
-        """Возвращает данные на языке из query параметра lang"""
-        representation = super().to_representation(instance)
-        request = self.context.get("request")
-        
-        if request:
-            language = get_language_from_request(request)
-            lang_suffix = f"_{language}" if language else ""
-            lang_field = f"title{lang_suffix}"
-            
-            if hasattr(instance, lang_field):
-                lang_value = getattr(instance, lang_field, None)
-                if lang_value:
-                    representation["title"] = lang_value
-                elif not representation.get("title"):
-                    representation["title"] = instance.title
-            else:
-                representation["title"] = instance.title
-        
-        return representation
 
 
-class NewsDetailSerializer(serializers.ModelSerializer):
+class NewsDetailSerializer(TranslatedModelSerializer):
     """Сериализатор для детальной информации о новости"""
     cover_image = ImageFieldSerializer(required=False, allow_null=True)
+    cover_image_srcset = ImageRenditionsField("cover_image")
+    cover_image_meta = ImageMetaField("cover_image")
     images = serializers.SerializerMethodField()
 
     class Meta:
@@ -572,6 +405,8 @@ class NewsDetailSerializer(serializers.ModelSerializer):
             "title",
             "slug",
             "cover_image",
+            "cover_image_srcset",
+            "cover_image_meta",
             "paragraph_1",
             "paragraph_2",
             "images",
@@ -583,62 +418,19 @@ class NewsDetailSerializer(serializers.ModelSerializer):
             "seo_description",
         ]
         read_only_fields = ["id", "slug", "created_at", "update_at"]
+        expandable_fields = ["images"]
     
     def get_images(self, obj):
         """Получить список изображений новости"""
         images = obj.images.all().order_by('order')
         return NewsImageSerializer(images, many=True, context=self.context).data
-    
-    def to_representation(self, instance):
-        """Возвращает данные на языке из query параметра lang"""
-        representation = super().to_representation(instance)
-        request = self.context.get("request")
-        
-        if request:
-            language = get_language_from_request(request)
-            lang_suffix = f"_{language}" if language else ""
-            
-            # Title
-            lang_field = f"title{lang_suffix}"
-            if hasattr(instance, lang_field):
-                lang_value = getattr(instance, lang_field, None)
-                if lang_value:
-                    representation["title"] = lang_value
-                elif not representation.get("title"):
-                    representation["title"] = instance.title
-            else:
-                representation["title"] = instance.title
-            
-            # Paragraphs
-            for field in ['paragraph_1', 'paragraph_2']:
-                lang_field = f"{field}{lang_suffix}"
-                if hasattr(instance, lang_field):
-                    lang_value = getattr(instance, lang_field, None)
-                    if lang_value:
-                        representation[field] = lang_value
-                    elif not representation.get(field):
-                        representation[field] = getattr(instance, field, None)
-                else:
-                    representation[field] = getattr(instance, field, None)
-            
-            # SEO поля
-            for field in ['seo_title', 'seo_description']:
-                lang_field = f"{field}{lang_suffix}"
-                if hasattr(instance, lang_field):
-                    lang_value = getattr(instance, lang_field, None)
-                    if lang_value:
-                        representation[field] = lang_value
-                    elif not representation.get(field):
-                        representation[field] = getattr(instance, field, None)
-                else:
-                    representation[field] = getattr(instance, field, None)
-        
-        return representation
 
 
-class GallerySerializer(serializers.ModelSerializer):
+class GallerySerializer(TranslatedModelSerializer):
     """Сериализатор для галереи"""
     image = ImageFieldSerializer(required=False, allow_null=True)
+    image_srcset = ImageRenditionsField("image")
+    image_meta = ImageMetaField("image")
 
     class Meta:
         model = Gallery
@@ -646,48 +438,52 @@ class GallerySerializer(serializers.ModelSerializer):
             "id",
             "title",
             "image",
+            "image_srcset",
+            "image_meta",
             "created_at",
             "order",
         ]
         read_only_fields = ["id", "created_at"]
-    
-    def to_representation(self, instance):
-        """Возвращает данные на языке из query параметра lang"""
-        representation = super().to_representation(instance)
-        request = self.context.get("request")
-        
-        if request:
-            language = get_language_from_request(request)
-            lang_suffix = f"_{language}" if language else ""
-            
-            # Поле title
-            lang_field = f"title{lang_suffix}"
-            if hasattr(instance, lang_field):
-                lang_value = getattr(instance, lang_field, None)
-                if lang_value:
-                    representation["title"] = lang_value
-                elif not representation.get("title"):
-                    representation["title"] = instance.title
-            else:
-                representation["title"] = instance.title
-        
-        return representation
 
 
-class MainGallerySerializer(serializers.ModelSerializer):
+class MainGallerySerializer(TranslatedModelSerializer):
     """Сериализатор для нижней галереи (одна запись)"""
     image_1 = ImageFieldSerializer(required=False, allow_null=True)
+    image_1_srcset = ImageRenditionsField("image_1")
+    image_1_meta = ImageMetaField("image_1")
     image_2 = ImageFieldSerializer(required=False, allow_null=True)
+    image_2_srcset = ImageRenditionsField("image_2")
+    image_2_meta = ImageMetaField("image_2")
     image_3 = ImageFieldSerializer(required=False, allow_null=True)
+    image_3_srcset = ImageRenditionsField("image_3")
+    image_3_meta = ImageMetaField("image_3")
     image_4 = ImageFieldSerializer(required=False, allow_null=True)
+    image_4_srcset = ImageRenditionsField("image_4")
+    image_4_meta = ImageMetaField("image_4")
     image_5 = ImageFieldSerializer(required=False, allow_null=True)
+    image_5_srcset = ImageRenditionsField("image_5")
+    image_5_meta = ImageMetaField("image_5")
     image_6 = ImageFieldSerializer(required=False, allow_null=True)
+    image_6_srcset = ImageRenditionsField("image_6")
+    image_6_meta = ImageMetaField("image_6")
     image_7 = ImageFieldSerializer(required=False, allow_null=True)
+    image_7_srcset = ImageRenditionsField("image_7")
+    image_7_meta = ImageMetaField("image_7")
     image_8 = ImageFieldSerializer(required=False, allow_null=True)
+    image_8_srcset = ImageRenditionsField("image_8")
+    image_8_meta = ImageMetaField("image_8")
     image_9 = ImageFieldSerializer(required=False, allow_null=True)
+    image_9_srcset = ImageRenditionsField("image_9")
+    image_9_meta = ImageMetaField("image_9")
     image_10 = ImageFieldSerializer(required=False, allow_null=True)
+    image_10_srcset = ImageRenditionsField("image_10")
+    image_10_meta = ImageMetaField("image_10")
     image_11 = ImageFieldSerializer(required=False, allow_null=True)
+    image_11_srcset = ImageRenditionsField("image_11")
+    image_11_meta = ImageMetaField("image_11")
     image_12 = ImageFieldSerializer(required=False, allow_null=True)
+    image_12_srcset = ImageRenditionsField("image_12")
+    image_12_meta = ImageMetaField("image_12")
 
     class Meta:
         model = MainGallery
@@ -695,41 +491,45 @@ class MainGallerySerializer(serializers.ModelSerializer):
             "id",
             "title",
             "image_1",
+            "image_1_srcset",
+            "image_1_meta",
             "image_2",
+            "image_2_srcset",
+            "image_2_meta",
             "image_3",
+            "image_3_srcset",
+            "image_3_meta",
             "image_4",
+            "image_4_srcset",
+            "image_4_meta",
             "image_5",
+            "image_5_srcset",
+            "image_5_meta",
             "image_6",
+            "image_6_srcset",
+            "image_6_meta",
             "image_7",
+            "image_7_srcset",
+            "image_7_meta",
             "image_8",
+            "image_8_srcset",
+            "image_8_meta",
             "image_9",
+            "image_9_srcset",
+            "image_9_meta",
             "image_10",
+            "image_10_srcset",
+            "image_10_meta",
             "image_11",
+            "image_11_srcset",
+            "image_11_meta",
             "image_12",
+            "image_12_srcset",
+            "image_12_meta",
             "created_at",
         ]
         read_only_fields = ["id", "created_at"]
 
-    def to_representation(self, instance):
-        """Возвращает данные на языке из query параметра lang"""
-        representation = super().to_representation(instance)
-        request = self.context.get("request")
-
-        if request:
-            language = get_language_from_request(request)
-            lang_suffix = f"_{language}" if language else ""
-            lang_field = f"title{lang_suffix}"
-            if hasattr(instance, lang_field):
-                lang_value = getattr(instance, lang_field, None)
-                if lang_value:
-                    representation["title"] = lang_value
-                elif not representation.get("title"):
-                    representation["title"] = instance.title
-            else:
-                representation["title"] = instance.title
-
-        return representation
-
 
 class AboutImageSerializer(serializers.ModelSerializer):
     """Сериализатор для изображений секции 'О нас'"""
@@ -741,7 +541,7 @@ class AboutImageSerializer(serializers.ModelSerializer):
         read_only_fields = ["id"]
 
 
-class HomePageSerializer(serializers.ModelSerializer):
+class HomePageSerializer(TranslatedModelSerializer):
     """Сериализатор для главной страницы с поддержкой мультиязычности"""
     # Секция 1: Баннер
     banner_image = ImageFieldSerializer(required=False, allow_null=True)
@@ -822,102 +622,8 @@ class HomePageSerializer(serializers.ModelSerializer):
         images = obj.about_images.all().order_by('order')
         return AboutImageSerializer(images, many=True, context=self.context).data
 
-    def to_representation(self, instance):
-        """Возвращает данные на языке из query параметра lang"""
-        representation = super().to_representation(instance)
-        request = self.context.get("request")
-        
-        if request:
-            # Получаем язык из query параметра
-            language = get_language_from_request(request)
-            lang_suffix = f"_{language}" if language else ""
-            
-            # Секция 1: Баннер
-            multilingual_fields_banner = [
-                'banner_title', 'banner_description', 'banner_link',
-                'banner_showroom_title'
-            ]
-            for field in multilingual_fields_banner:
-                lang_field = f"{field}{lang_suffix}"
-                if hasattr(instance, lang_field):
-                    value = getattr(instance, lang_field)
-                    if value:
-                        representation[field] = value
-            
-            # Секция 2: О нас
-            multilingual_fields_about = [
-                'about_section_title', 'about_title', 'about_link', 'about_youtube_link', 'about_bottom_description'
-            ]
-            for field in multilingual_fields_about:
-                lang_field = f"{field}{lang_suffix}"
-                if hasattr(instance, lang_field):
-                    value = getattr(instance, lang_field)
-                    if value:
-                        representation[field] = value
-            
-            # Секция 3: Шоурум
-            multilingual_fields_showroom = ['showroom_title']
-            for field in multilingual_fields_showroom:
-                lang_field = f"{field}{lang_suffix}"
-                if hasattr(instance, lang_field):
-                    value = getattr(instance, lang_field)
-                    if value:
-                        representation[field] = value
-            
-            # Секция 4: Преимущества
-            # Общие поля секции
-            multilingual_fields_advantage_section = ['advantage_title', 'advantage_subtitle']
-            for field in multilingual_fields_advantage_section:
-                lang_field = f"{field}{lang_suffix}"
-                if hasattr(instance, lang_field):
-                    value = getattr(instance, lang_field)
-                    if value:
-                        representation[field] = value
-            
-            # Поля карточек
-            for i in range(1, 5):
-                for subfield in ['title', 'description']:
-                    field = f"advantage_{i}_{subfield}"
-                    lang_field = f"{field}{lang_suffix}"
-                    if hasattr(instance, lang_field):
-                        value = getattr(instance, lang_field)
-                    if value:
-                        representation[field] = value
-            
-            # Секция: Instagram
-            multilingual_fields_instagram = ['instagram_section_title', 'instagram_section_text']
-            for field in multilingual_fields_instagram:
-                lang_field = f"{field}{lang_suffix}"
-                if hasattr(instance, lang_field):
-                    value = getattr(instance, lang_field)
-                    if value:
-                        representation[field] = value
 
-            # Секция 5: Призыв к действию
-            multilingual_fields_cta = ['cta_title', 'cta_description']
-            for field in multilingual_fields_cta:
-                lang_field = f"{field}{lang_suffix}"
-                if hasattr(instance, lang_field):
-                    value = getattr(instance, lang_field)
-                    if value:
-                        representation[field] = value
-            
-            # SEO поля
-            multilingual_fields_seo = [
-                'meta_title', 'meta_description', 'meta_keywords',
-                'og_title', 'og_description', 'canonical_url'
-            ]
-            for field in multilingual_fields_seo:
-                lang_field = f"{field}{lang_suffix}"
-                if hasattr(instance, lang_field):
-                    value = getattr(instance, lang_field)
-                    if value:
-                        representation[field] = value
-        
-        return representation
-
-
-class ProductionStepSerializer(serializers.ModelSerializer):
+class ProductionStepSerializer(TranslatedModelSerializer):
     """Сериализатор для этапов производства"""
     image = ImageFieldSerializer(required=False, allow_null=True)
 
@@ -925,54 +631,18 @@ class ProductionStepSerializer(serializers.ModelSerializer):
         model = ProductionStep
         fields = ["id", "title", "description", "image", "order"]
         read_only_fields = ["id"]
-    
-    def to_representation(self, instance):
-        """Возвращает данные на языке из query параметра lang"""
-        representation = super().to_representation(instance)
-        request = self.context.get("request")
-        
-        if request:
-            language = get_language_from_request(request)
-            lang_suffix = f"_{language}" if language else ""
-            
-            for field in ['title', 'description']:
-                lang_field = f"{field}{lang_suffix}"
-                if hasattr(instance, lang_field):
-                    value = getattr(instance, lang_field)
-                    if value:
-                        representation[field] = value
-        
-        return representation
 
 
-class CompanyHistorySerializer(serializers.ModelSerializer):
+class CompanyHistorySerializer(TranslatedModelSerializer):
     """Сериализатор для истории компании"""
     image = ImageFieldSerializer(required=False, allow_null=True)
     class Meta:
         model = CompanyHistory
         fields = ["id", "year", "year_title", "year_description", "image"]
         read_only_fields = ["id"]
-    
-    def to_representation(self, instance):
-        """Возвращает данные на языке из query параметра lang"""
-        representation = super().to_representation(instance)
-        request = self.context.get("request")
-        
-        if request:
-            language = get_language_from_request(request)
-            lang_suffix = f"_{language}" if language else ""
-            
-            for field in ['year_title', 'year_description']:
-                lang_field = f"{field}{lang_suffix}"
-                if hasattr(instance, lang_field):
-                    value = getattr(instance, lang_field)
-                    if value:
-                        representation[field] = value
-        
-        return representation
 
 
-class AboutPageSerializer(serializers.ModelSerializer):
+class AboutPageSerializer(TranslatedModelSerializer):
     """Сериализатор для страницы о компании с поддержкой мультиязычности"""
     # Секция 1: О компании
     about_image_1 = ImageFieldSerializer(required=False, allow_null=True)
@@ -1044,122 +714,15 @@ class AboutPageSerializer(serializers.ModelSerializer):
         read_only_fields = ["id"]
     
     def get_production_steps(self, obj):
-        """Получить этапы производства с учетом языка"""
-        steps = obj.production_steps.all().order_by('order')
-        request = self.context.get("request")
-        
-        if request:
-            language = get_language_from_request(request)
-            
-            data = []
-            for step in steps:
-                # Используем modeltranslation через временное переключение языка,
-                # чтобы получать корректный перевод полей title/description
-                with translation.override(language):
-                    title = step.title
-                    description = step.description
-                item = {
-                    "id": step.id,
-                    "order": step.order,
-                    "title": title,
-                    "description": description,
-                    "image": build_absolute_uri_https(request, step.image.url) if step.image else None,
-                }
-                data.append(item)
-            return data
-        
-        return ProductionStepSerializer(steps, many=True, context=self.context).data
+        """Этапы производства (из предзагрузки with_about_page_relations)"""
+        return ProductionStepSerializer(obj.production_steps.all(), many=True, context=self.context).data
     
     def get_company_history(self, obj):
-        """Получить историю компании с учетом языка"""
-        history = obj.company_history.all().order_by('year')
-        return CompanyHistorySerializer(history, many=True, context=self.context).data
-
-    def to_representation(self, instance):
-        """Возвращает данные на языке из query параметра lang"""
-        representation = super().to_representation(instance)
-        request = self.context.get("request")
-        
-        if request:
-            language = get_language_from_request(request)
-            lang_suffix = f"_{language}" if language else ""
-            
-            # Секция 1: О компании
-            multilingual_fields_about = [
-                'about_section_title', 'about_banner_title', 'about_banner_subtitle'
-            ]
-            for field in multilingual_fields_about:
-                lang_field = f"{field}{lang_suffix}"
-                if hasattr(instance, lang_field):
-                    value = getattr(instance, lang_field)
-                    if value:
-                        representation[field] = value
-            
-            # Секция 2: Процесс производства
-            multilingual_fields_production = [
-                'production_section_title', 'production_title'
-            ]
-            for field in multilingual_fields_production:
-                lang_field = f"{field}{lang_suffix}"
-                if hasattr(instance, lang_field):
-                    value = getattr(instance, lang_field)
-                    if value:
-                        representation[field] = value
-            
-            # Секция 3: История компании
-            multilingual_fields_history = ['history_section_title']
-            for field in multilingual_fields_history:
-                lang_field = f"{field}{lang_suffix}"
-                if hasattr(instance, lang_field):
-                    value = getattr(instance, lang_field)
-                    if value:
-                        representation[field] = value
-            
-            # Секция 4: Объемы производства
-            multilingual_fields_capacity = [
-                'capacity_section_title', 'capacity_title',
-                'capacity_card_1_title', 'capacity_card_1_subtitle',
-                'capacity_card_2_title', 'capacity_card_2_subtitle',
-                'capacity_card_3_title', 'capacity_card_3_subtitle',
-                'capacity_card_4_title', 'capacity_card_4_subtitle',
-            ]
-            for field in multilingual_fields_capacity:
-                lang_field = f"{field}{lang_suffix}"
-                if hasattr(instance, lang_field):
-                    value = getattr(instance, lang_field)
-                    if value:
-                        representation[field] = value
-            
-            # Секция 5: Партнерство для дилеров
-            multilingual_fields_dealer = [
-                'dealer_section_title', 'dealer_title',
-                'dealer_card_1_title', 'dealer_card_1_description',
-                'dealer_card_2_title', 'dealer_card_2_description',
-                'dealer_card_3_title', 'dealer_card_3_description',
-            ]
-            for field in multilingual_fields_dealer:
-                lang_field = f"{field}{lang_suffix}"
-                if hasattr(instance, lang_field):
-                    value = getattr(instance, lang_field)
-                    if value:
-                        representation[field] = value
-            
-            # SEO поля
-            multilingual_fields_seo = [
-                'meta_title', 'meta_description', 'meta_keywords',
-                'og_title', 'og_description', 'canonical_url'
-            ]
-            for field in multilingual_fields_seo:
-                lang_field = f"{field}{lang_suffix}"
-                if hasattr(instance, lang_field):
-                    value = getattr(instance, lang_field)
-                    if value:
-                        representation[field] = value
-        
-        return representation
+        """История компании (из предзагрузки with_about_page_relations)"""
+        return CompanyHistorySerializer(obj.company_history.all(), many=True, context=self.context).data
 
 
-class ContactPageSerializer(serializers.ModelSerializer):
+class ContactPageSerializer(TranslatedModelSerializer):
     """Сериализатор для страницы контактов"""
     # SEO поля
     og_image = ImageFieldSerializer(required=False, allow_null=True)
@@ -1193,41 +756,9 @@ class ContactPageSerializer(serializers.ModelSerializer):
             "canonical_url",
         ]
         read_only_fields = ["id"]
-    
-    def to_representation(self, instance):
-        """Возвращает данные на языке из query параметра lang"""
-        representation = super().to_representation(instance)
-        request = self.context.get("request")
-        
-        if request:
-            language = get_language_from_request(request)
-            
-            if language and language != "uz":
-                representation["page_title"] = getattr(instance, f"page_title_{language}", instance.page_title)
-                representation["address_label"] = getattr(instance, f"address_label_{language}", instance.address_label)
-                representation["address"] = getattr(instance, f"address_{language}", instance.address)
-                representation["phone_label"] = getattr(instance, f"phone_label_{language}", instance.phone_label)
-                representation["email_label"] = getattr(instance, f"email_label_{language}", instance.email_label)
-                representation["form_title"] = getattr(instance, f"form_title_{language}", instance.form_title)
-                representation["form_description"] = getattr(instance, f"form_description_{language}", instance.form_description)
-            
-            # SEO поля
-            multilingual_fields_seo = [
-                'meta_title', 'meta_description', 'meta_keywords',
-                'og_title', 'og_description', 'canonical_url'
-            ]
-            lang_suffix = f"_{language}" if language else ""
-            for field in multilingual_fields_seo:
-                lang_field = f"{field}{lang_suffix}"
-                if hasattr(instance, lang_field):
-                    value = getattr(instance, lang_field)
-                    if value:
-                        representation[field] = value
-        
-        return representation
 
 
-class SalesPointSerializer(serializers.ModelSerializer):
+class SalesPointSerializer(TranslatedModelSerializer):
     """Сериализатор для торговой точки"""
     
     class Meta:
@@ -1239,29 +770,16 @@ class SalesPointSerializer(serializers.ModelSerializer):
             "location",
             "phone",
             "map_link",
+            "latitude",
+            "longitude",
             "order",
         ]
         read_only_fields = ["id"]
-    
-    def to_representation(self, instance):
-        """Возвращает данные на языке из query параметра lang"""
-        representation = super().to_representation(instance)
-        request = self.context.get("request")
-        
-        if request:
-            language = get_language_from_request(request)
-            
-            if language and language != "uz":
-                representation["name"] = getattr(instance, f"name_{language}", instance.name)
-                representation["address"] = getattr(instance, f"address_{language}", instance.address)
-                representation["location"] = getattr(instance, f"location_{language}", instance.location)
-        
-        return representation
 
 
-class RegionSerializer(serializers.ModelSerializer):
-    """Сериализатор для региона со списком торговых точек"""
-    sales_points = serializers.SerializerMethodField()
+class RegionSerializer(TranslatedModelSerializer):
+    """Сериализатор для региона со списком опубликованных торговых точек (см. with_published_sales_points)"""
+    sales_points = SalesPointSerializer(many=True, read_only=True)
     
     class Meta:
         model = Region
@@ -1272,53 +790,17 @@ class RegionSerializer(serializers.ModelSerializer):
             "sales_points",
         ]
         read_only_fields = ["id", "slug"]
-    
-    def get_sales_points(self, obj):
-        """Получить торговые точки региона с учетом языка"""
-        points = obj.sales_points.filter(is_published=True).order_by('order')
-        request = self.context.get("request")
-        
-        if request:
-            language = get_language_from_request(request)
-            
-            data = []
-            for point in points:
-                item = {
-                    "id": point.id,
-                    "name": getattr(point, f"name_{language}", point.name) if language != "uz" else point.name,
-                    "address": getattr(point, f"address_{language}", point.address) if language != "uz" else point.address,
-                    "location": getattr(point, f"location_{language}", point.location) if language != "uz" else point.location,
-                    "phone": point.phone,
-                    "map_link": point.map_link,
-                    "order": point.order,
-                }
-                data.append(item)
-            return data
-        
-        return SalesPointSerializer(points, many=True, context={"request": request}).data
-    
-    def to_representation(self, instance):
-        """Возвращает данные на языке из query параметра lang"""
-        representation = super().to_representation(instance)
-        request = self.context.get("request")
-        
-        if request:
-            language = get_language_from_request(request)
-            
-            # Всегда используем языковые поля, если они доступны
-            lang_suffix = f"_{language}" if language else ""
-            lang_field = f"name{lang_suffix}"
-            
-            if hasattr(instance, lang_field):
-                lang_value = getattr(instance, lang_field, None)
-                if lang_value:
-                    representation["name"] = lang_value
-                elif not representation.get("name"):
-                    representation["name"] = instance.name
-            else:
-                representation["name"] = instance.name
-        
-        return representation
+
+
+class NearestSalesPointSerializer(SalesPointSerializer):
+    """Торговая точка в ответе поиска ближайших точек (с регионом)"""
+    region = serializers.SerializerMethodField()
+
+    class Meta(SalesPointSerializer.Meta):
+        fields = [*SalesPointSerializer.Meta.fields, "region"]
+
+    def get_region(self, obj):
+        return {"id": obj.region_id, "name": self.translate(obj.region, "name"), "slug": obj.region.slug}
 
 
 class ContactFormSubmissionSerializer(serializers.ModelSerializer):
@@ -1363,50 +845,22 @@ class DealerRequestSerializer(serializers.ModelSerializer):
         return value.strip()
 
 
-class FAQSerializer(serializers.ModelSerializer):
+class FAQSerializer(TranslatedModelSerializer):
     """Сериализатор для FAQ"""
     
     class Meta:
         model = FAQ
         fields = ["id", "question", "answer", "order"]
         read_only_fields = ["id"]
-    
-    def to_representation(self, instance):
-        """Возвращает данные на языке из query параметра lang"""
-        representation = super().to_representation(instance)
-        request = self.context.get("request")
-        
-        if request:
-            language = get_language_from_request(request)
-            
-            if language and language != "uz":
-                representation["question"] = getattr(instance, f"question_{language}", instance.question)
-                representation["answer"] = getattr(instance, f"answer_{language}", instance.answer)
-        
-        return representation
 
 
-class AdvantageCardSerializer(serializers.ModelSerializer):
+class AdvantageCardSerializer(TranslatedModelSerializer):
     """Сериализатор для карточек преимуществ"""
     
     class Meta:
         model = AdvantageCard
         fields = ["id", "title", "description", "svg_icon", "order"]
         read_only_fields = ["id"]
-    
-    def to_representation(self, instance):
-        """Возвращает данные на языке из query параметра lang"""
-        representation = super().to_representation(instance)
-        request = self.context.get("request")
-        
-        if request:
-            language = get_language_from_request(request)
-            
-            if language and language != "uz":
-                representation["title"] = getattr(instance, f"title_{language}", instance.title)
-                representation["description"] = getattr(instance, f"description_{language}", instance.description)
-        
-        return representation
 
 
 class InstagramPostSerializer(serializers.ModelSerializer):
@@ -1452,7 +906,7 @@ class InstagramPostSerializer(serializers.ModelSerializer):
         return representation
 
 
-class GlobalSettingsSerializer(serializers.ModelSerializer):
+class GlobalSettingsSerializer(TranslatedModelSerializer):
     """Сериализатор для глобальных настроек"""
     collection_cover_image = ImageFieldSerializer(required=False, allow_null=True)
     product_cover_image = ImageFieldSerializer(required=False, allow_null=True)
@@ -1486,40 +940,27 @@ class GlobalSettingsSerializer(serializers.ModelSerializer):
             "update_at",
         ]
         read_only_fields = ["id", "created_at", "update_at"]
-    
-    def to_representation(self, instance):
-        """Возвращает данные на языке из query параметра lang"""
-        representation = super().to_representation(instance)
-        request = self.context.get("request")
-        
-        if request:
-            language = get_language_from_request(request)
-            lang_suffix = f"_{language}" if language else ""
-            
-            # Мультиязычные поля
-            multilingual_fields = [
-                'copyright',
-                'form_modal_title',
-                'form_modal_text',
-                'success_modal_title',
-                'success_modal_text',
-                'dealer_form_title',
-                'dealer_form_description',
-                'address',
-                # SEO поля
-                'collections_seo_title',
-                'collections_seo_description',
-                'news_seo_title',
-                'news_seo_description',
-                'gallery_seo_title',
-                'gallery_seo_description',
-            ]
-            
-            for field in multilingual_fields:
-                lang_field = f"{field}{lang_suffix}"
-                if hasattr(instance, lang_field):
-                    value = getattr(instance, lang_field)
-                    if value:
-                        representation[field] = value
-        
-        return representation
+
+class SearchCarpetSerializer(TranslatedModelSerializer):
+    """Ковер в результатах поиска"""
+    collection_name = serializers.SerializerMethodField()
+    collection_slug = serializers.CharField(source="collection.slug", read_only=True)
+    photo = ImageFieldSerializer(required=False, allow_null=True)
+    photo_srcset = ImageRenditionsField("photo")
+
+    class Meta:
+        model = Carpet
+        fields = ["id", "code", "photo", "photo_srcset", "collection_name", "collection_slug"]
+
+    def get_collection_name(self, obj):
+        return self.translate(obj.collection, "name")
+
+
+class SearchCollectionSerializer(TranslatedModelSerializer):
+    """Коллекция в результатах поиска"""
+    image = ImageFieldSerializer(required=False, allow_null=True)
+    image_srcset = ImageRenditionsField("image")
+
+    class Meta:
+        model = Collection
+        fields = ["id", "name", "slug", "image", "image_srcset"]
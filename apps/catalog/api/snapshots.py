@@ -0,0 +1,202 @@
+"""
+Предрендеренные JSON-снапшоты страниц-синглтонов (главная, о компании,
+контакты, глобальные настройки, нижняя галерея).
+
+При изменении страницы или ее инлайнов (после коммита транзакции админки)
+ответ рендерится сериализатором сразу на всех языках и сохраняется готовыми
+байтами JSON в кэш (Redis) и в таблицу PageSnapshot — резервную копию на
+случай очистки кэша. ViewSet отдает эти байты как есть: на пути запроса нет
+ни обращений к моделям страниц, ни сериализации.
+
+Абсолютные URL файлов строятся от CATALOG_SNAPSHOT_BASE_URL (хост должен
+быть в ALLOWED_HOSTS).
+"""
+
+import hashlib
+import math
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.db import transaction
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+
+from apps.catalog.models import AboutImage
+from apps.catalog.models import AboutPage
+from apps.catalog.models import CompanyHistory
+from apps.catalog.models import ContactPage
+from apps.catalog.models import GlobalSettings
+from apps.catalog.models import HomePage
+from apps.catalog.models import MainGallery
+from apps.catalog.models import PageSnapshot
+from apps.catalog.models import ProductionStep
+
+from .cache import set_validator_headers
+from .prefetch import with_about_page_relations
+from .serializers import AboutPageSerializer
+from .serializers import ContactPageSerializer
+from .serializers import GlobalSettingsSerializer
+from .serializers import HomePageSerializer
+from .serializers import MainGallerySerializer
+from .utils import get_language_from_request
+
+SNAPSHOT_KEY_PREFIX = "catalog:snapshot"
+
+# Снапшот (basename ViewSet) -> (queryset страницы, сериализатор, модели, от которых зависит ответ)
+SNAPSHOTS = {
+    "homepage": (HomePage.objects.filter(is_published=True), HomePageSerializer, (HomePage, AboutImage)),
+    "about": (
+        with_about_page_relations(AboutPage.objects.filter(is_published=True)),
+        AboutPageSerializer,
+        (AboutPage, ProductionStep, CompanyHistory),
+    ),
+    "contact": (ContactPage.objects.filter(is_published=True), ContactPageSerializer, (ContactPage,)),
+    "global-settings": (
+        GlobalSettings.objects.filter(is_published=True),
+        GlobalSettingsSerializer,
+        (GlobalSettings,),
+    ),
+    "main-gallery": (MainGallery.objects.all(), MainGallerySerializer, (MainGallery,)),
+}
+
+# Модели, при изменении которых перестраиваются снапшоты
+SNAPSHOT_MODELS = {model for _, _, models in SNAPSHOTS.values() for model in models}
+
+
+def snapshots_for(model):
+    """Снапшоты, зависящие от модели"""
+    return [name for name, (_, _, models) in SNAPSHOTS.items() if model in models]
+
+
+def snapshot_key(name, language):
+    return f"{SNAPSHOT_KEY_PREFIX}:{name}:{language}"
+
+
+def snapshot_request(language):
+    """Запрос, от которого строятся абсолютные URL файлов в снапшоте"""
+    base_url = urlsplit(settings.CATALOG_SNAPSHOT_BASE_URL)
+    request = RequestFactory().get(
+        "/", {"lang": language}, secure=base_url.scheme == "https", HTTP_HOST=base_url.netloc,
+    )
+    return Request(request)
+
+
+def render_snapshot(name):
+    """JSON ответа страницы на каждом языке: {язык: bytes} ({} если страница не опубликована)"""
+    queryset, serializer_class, _ = SNAPSHOTS[name]
+    instance = queryset.first()
+    renderer = JSONRenderer()
+    rendered = {}
+    for language in settings.MODELTRANSLATION_LANGUAGES:
+        data = {}
+        if instance is not None:
+            context = {"request": snapshot_request(language), "language": language}
+            data = serializer_class(instance, context=context).data
+        rendered[language] = renderer.render(data)
+    return rendered
+
+
+def store_snapshot(name):
+    """Рендерит снапшот и сохраняет его в БД и кэш. Возвращает {язык: (bytes, хэш, время)}"""
+    updated_at = timezone.now()
+    snapshots = {}
+    for language, content in render_snapshot(name).items():
+        digest = hashlib.md5(content, usedforsecurity=False).hexdigest()
+        snapshots[language] = (content, digest, updated_at.timestamp())
+    PageSnapshot.objects.bulk_create(
+        [
+            PageSnapshot(name=name, language=language, content=content, digest=digest, updated_at=updated_at)
+            for language, (content, digest, _) in snapshots.items()
+        ],
+        update_conflicts=True,
+        unique_fields=["name", "language"],
+        update_fields=["content", "digest", "updated_at"],
+    )
+    cache.set_many(
+        {snapshot_key(name, language): snapshot for language, snapshot in snapshots.items()},
+        timeout=None,
+    )
+    return snapshots
+
+
+def get_snapshot(name, language):
+    """
+    (bytes, хэш, время обновления) снапшота: из кэша, затем из БД.
+    Если снапшота еще нет (например, сразу после деплоя), он рендерится.
+    """
+    key = snapshot_key(name, language)
+    snapshot = cache.get(key)
+    if snapshot is not None:
+        return snapshot
+    row = (
+        PageSnapshot.objects.filter(name=name, language=language)
+        .values_list("content", "digest", "updated_at")
+        .first()
+    )
+    if row is None:
+        return store_snapshot(name)[language]
+    snapshot = (bytes(row[0]), row[1], row[2].timestamp())
+    # add, а не set: снапшот, перестроенный параллельно после коммита, не перезаписывается
+    cache.add(key, snapshot, timeout=None)
+    return snapshot
+
+
+def rebuild_snapshot(name):
+    """Перестраивает снапшот; при ошибке удаляет его, чтобы следующий запрос отрендерил ответ сам"""
+    try:
+        store_snapshot(name)
+    except Exception:
+        delete_snapshot(name)
+        raise
+
+
+def delete_snapshot(name):
+    PageSnapshot.objects.filter(name=name).delete()
+    cache.delete_many([snapshot_key(name, language) for language in settings.MODELTRANSLATION_LANGUAGES])
+
+
+def _rebuild_callback(name):
+    def rebuild():
+        rebuild_snapshot(name)
+
+    rebuild.snapshot = name
+    return rebuild
+
+
+def _rebuild_scheduled(name):
+    return any(getattr(func, "snapshot", None) == name for _, func, _ in connection.run_on_commit)
+
+
+def invalidate_snapshots(model):
+    """
+    Удаляет снапшоты, зависящие от модели, и перестраивает их после коммита.
+
+    Сохранение страницы с инлайнами в админке — одна транзакция с несколькими
+    сигналами, снапшот перестраивается один раз. Удаление сразу нужно, чтобы
+    запрос в той же транзакции (и тесты без коммита) не получил старый ответ.
+    """
+    for name in snapshots_for(model):
+        delete_snapshot(name)
+        if connection.in_atomic_block and _rebuild_scheduled(name):
+            continue
+        transaction.on_commit(_rebuild_callback(name), robust=True)
+
+
+def snapshot_response(request, name):
+    """Ответ с JSON снапшота на языке запроса, с ETag/Last-Modified и поддержкой 304"""
+    language = get_language_from_request(request)
+    content, digest, updated_at = get_snapshot(name, language)
+    etag = f'W/"{name}.{language}.{digest}"'
+    last_modified = math.ceil(updated_at)
+
+    not_modified = get_conditional_response(request._request, etag=etag, last_modified=last_modified)
+    if not_modified is not None:
+        return set_validator_headers(not_modified, etag, last_modified)
+    response = HttpResponse(content, content_type="application/json")
+    return set_validator_headers(response, etag, last_modified)
@@ -4,6 +4,7 @@ from rest_framework.routers import DefaultRouter
 from .views import (
     AboutPageViewSet,
     AdvantageCardViewSet,
+    BootstrapViewSet,
     CarpetViewSet,
     CharacteristicViewSet,
     CollectionViewSet,
@@ -20,6 +21,7 @@ from .views import (
     NewsViewSet,
     RegionViewSet,
     RoomViewSet,
+    SearchViewSet,
     StyleViewSet,
 )
 
@@ -43,6 +45,8 @@ router.register("faq", FAQViewSet, basename="faq")
 router.register("advantages", AdvantageCardViewSet, basename="advantage")
 router.register("global-settings", GlobalSettingsViewSet, basename="global-settings")
 router.register("instagram-posts", InstagramPostViewSet, basename="instagram-post")
+router.register("search", SearchViewSet, basename="search")
+router.register("bootstrap", BootstrapViewSet, basename="bootstrap")
 
 app_name = "catalog_api"
 urlpatterns = router.urls
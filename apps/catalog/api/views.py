@@ -1,21 +1,29 @@
-from django.db.models import Count, Q
+from django.conf import settings
+from django.db.models import Exists, OuterRef
 from django_filters import rest_framework as filters
 from django_filters.rest_framework import DjangoFilterBackend
+from django_filters.utils import translate_validation
 from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import OpenApiParameter, extend_schema
 from rest_framework import status
 from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound
+from rest_framework.exceptions import ValidationError
 from rest_framework.filters import OrderingFilter
 from rest_framework.mixins import CreateModelMixin, ListModelMixin, RetrieveModelMixin
-from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet
 
+from apps.catalog.counters import record_view
+from apps.catalog.outbox import queue_notification
+from apps.catalog.search import MIN_QUERY_LENGTH
+from apps.catalog.search import search_queryset
 from apps.catalog.models import (
     AboutPage,
     AdvantageCard,
     Carpet,
     CarpetCharacteristic,
+    CarpetImage,
     Characteristic,
     Collection,
     Color,
@@ -29,11 +37,29 @@ from apps.catalog.models import (
     InstagramPost,
     MainGallery,
     News,
+    NewsImage,
     Region,
     Room,
+    SalesPoint,
     Style,
 )
 
+from .bitmaps import carpet_bitmap_index
+from .bootstrap import bootstrap_response
+from .cache import cache_response
+from .cache import cached_representations
+from .compact import compact_carpet_response
+from .compact import is_compact
+from .facets import carpet_facets
+from .fieldsets import SparseFieldsetsMixin
+from .fieldsets import only_columns
+from .fieldsets import trim_serializer
+from .nearest import sales_point_index
+from .pagination import CursorOptionalPagination
+from .pagination import StandardResultsSetPagination
+from .prefetch import with_about_page_relations
+from .prefetch import with_carpet_relations
+from .prefetch import with_published_sales_points
 from .serializers import (
     AboutPageSerializer,
     AdvantageCardSerializer,
@@ -53,12 +79,16 @@ from .serializers import (
     HomePageSerializer,
     InstagramPostSerializer,
     MainGallerySerializer,
+    NearestSalesPointSerializer,
     NewsDetailSerializer,
     NewsListSerializer,
     RegionSerializer,
+    SearchCarpetSerializer,
+    SearchCollectionSerializer,
     RoomSerializer,
     StyleSerializer,
 )
+from .snapshots import snapshot_response
 
 # OpenAPI параметр для языка
 LANG_PARAMETER = OpenApiParameter(
@@ -70,34 +100,98 @@ LANG_PARAMETER = OpenApiParameter(
     enum=["uz", "ru", "en"],
 )
 
+COMPACT_PARAMETER = OpenApiParameter(
+    name="compact",
+    type=OpenApiTypes.BOOL,
+    location=OpenApiParameter.QUERY,
+    description="Компактный ответ: связи ковров списками ID, справочники — в блоке taxonomy",
+    required=False,
+)
+
+SPARSE_PARAMETERS = [
+    OpenApiParameter(
+        name="fields",
+        type=OpenApiTypes.STR,
+        location=OpenApiParameter.QUERY,
+        description="Поля ответа через запятую (например: id,code,photo). По умолчанию: все",
+        required=False,
+    ),
+    OpenApiParameter(
+        name="expand",
+        type=OpenApiTypes.STR,
+        location=OpenApiParameter.QUERY,
+        description="Вложенные связи через запятую (например: styles,colors). Пустое значение отключает все",
+        required=False,
+    ),
+]
+
+
+# Модели, от которых зависит представление ковра (для инвалидации кэша ответов)
+CARPET_CACHE_MODELS = (
+    Carpet,
+    Collection,
+    Style,
+    Room,
+    Color,
+    CarpetImage,
+    CarpetCharacteristic,
+    Characteristic,
+)
+
+
+# Режимы совпадения значений фильтров по ManyToMany (параметры styles_mode, rooms_mode, colors_mode)
+MATCH_ANY = "any"
+MATCH_ALL = "all"
+MATCH_MODE_CHOICES = [(MATCH_ANY, "Любое из значений"), (MATCH_ALL, "Все значения")]
+# Значение параметра sort -> флаг, по которому оно фильтрует
+SORT_FLAGS = {"new": "is_new", "popular": "is_popular"}
+
 
-class StandardResultsSetPagination(PageNumberPagination):
-    """Пагинация для списков"""
-    page_size = 12
-    page_size_query_param = "page_size"
-    max_page_size = 100
+def split_values(value):
+    """Значения через запятую без пустых и повторов"""
+    return list(dict.fromkeys(v.strip() for v in (value or "").split(",") if v.strip()))
 
 
 class CommaSeparatedMultipleChoiceFilter(filters.Filter):
-    """Кастомный фильтр для значений через запятую"""
+    """
+    Фильтр по ManyToMany для значений через запятую.
+
+    Условие строится коррелированными подзапросами EXISTS по промежуточной
+    таблице, а не JOIN: ковер не дублируется при нескольких совпадениях и
+    нескольких таких фильтрах, DISTINCT не нужен. Режим из параметра
+    <имя фильтра>_mode: any (по умолчанию) — есть хотя бы одно из значений,
+    all — есть все значения.
+    """
     
     def __init__(self, *args, **kwargs):
         self.to_field_name = kwargs.pop('to_field_name', 'slug')
         self.field_name = kwargs.pop('field_name')
         super().__init__(*args, **kwargs)
+
+    def get_mode(self):
+        form = getattr(self.parent, "form", None)
+        cleaned = getattr(form, "cleaned_data", {})
+        return cleaned.get(f"{self.field_name}_mode") or MATCH_ANY
     
     def filter(self, qs, value):
         if not value:
             return qs
         
         # Разделяем значения по запятой
-        values = [v.strip() for v in value.split(',') if v.strip()]
+        values = split_values(value)
         if not values:
             return qs
-        
-        # Применяем фильтр напрямую через ManyToMany связь
-        lookup = f"{self.field_name}__{self.to_field_name}__in"
-        return qs.filter(**{lookup: values})
+
+        m2m_field = qs.model._meta.get_field(self.field_name)
+        through = m2m_field.remote_field.through
+        related = f"{m2m_field.m2m_reverse_field_name()}__{self.to_field_name}"
+        links = through.objects.filter(**{m2m_field.m2m_field_name(): OuterRef("pk")})
+
+        if self.get_mode() == MATCH_ALL:
+            for v in values:
+                qs = qs.filter(Exists(links.filter(**{related: v})))
+            return qs
+        return qs.filter(Exists(links.filter(**{f"{related}__in": values})))
 
 
 class CarpetFilter(filters.FilterSet):
@@ -119,6 +213,10 @@ class CarpetFilter(filters.FilterSet):
         to_field_name="slug",
         queryset=Collection.objects.all(),
     )
+    # Режимы совпадения для styles, rooms и colors (см. CommaSeparatedMultipleChoiceFilter)
+    styles_mode = filters.ChoiceFilter(choices=MATCH_MODE_CHOICES, method="filter_match_mode")
+    rooms_mode = filters.ChoiceFilter(choices=MATCH_MODE_CHOICES, method="filter_match_mode")
+    colors_mode = filters.ChoiceFilter(choices=MATCH_MODE_CHOICES, method="filter_match_mode")
     is_new = filters.BooleanFilter(field_name="is_new")
     is_popular = filters.BooleanFilter(field_name="is_popular")
 
@@ -126,41 +224,72 @@ class CarpetFilter(filters.FilterSet):
         model = Carpet
         fields = ["styles", "rooms", "colors", "collection", "is_new", "is_popular"]
 
+    def filter_match_mode(self, queryset, name, value):
+        """Режим не фильтрует сам по себе, его читает фильтр соответствующей связи"""
+        return queryset
+
+    def get_selection(self):
+        """Выбранные фильтры в виде для api.bitmaps.CarpetBitmapIndex (форма должна быть валидной)"""
+        cleaned = self.form.cleaned_data
+        selection = {}
+        for name in ("styles", "rooms", "colors"):
+            values = split_values(cleaned.get(name))
+            if values:
+                selection[name] = (values, cleaned.get(f"{name}_mode") == MATCH_ALL)
+        if cleaned.get("collection") is not None:
+            selection["collection"] = cleaned["collection"].slug
+        for flag in ("is_new", "is_popular"):
+            if cleaned.get(flag) is not None:
+                selection[flag] = cleaned[flag]
+        return selection
+
 
 @extend_schema(tags=["Ковры"])
-class CarpetViewSet(ListModelMixin, RetrieveModelMixin, GenericViewSet):
+class CarpetViewSet(SparseFieldsetsMixin, ListModelMixin, RetrieveModelMixin, GenericViewSet):
     """ViewSet для ковров"""
-    queryset = Carpet.objects.filter(is_published=True).select_related("collection").prefetch_related(
-        "styles", "rooms", "colors", "gallery_images", "characteristics__characteristic"
-    )
-    pagination_class = StandardResultsSetPagination
+    queryset = Carpet.objects.filter(is_published=True)
+    cache_models = CARPET_CACHE_MODELS
+    cache_unordered_params = ("styles", "rooms", "colors", "sort", "fields", "expand")
+    # Колонки сортировки нужны курсору пагинации
+    sparse_always_columns = ("created_at",)
+    pagination_class = CursorOptionalPagination
     filter_backends = [DjangoFilterBackend, OrderingFilter]
     filterset_class = CarpetFilter
     ordering_fields = ["created_at", "watched"]
-    ordering = ["-created_at"]
+    # Максимальное число ID в одном запросе batch
+    batch_max_ids = 200
+    # Порядок по умолчанию (-created_at) задан в Carpet.Meta: явный ordering здесь
+    # перекрывал бы сортировку из параметра sort в get_queryset
 
     def get_serializer_class(self):
         if self.action == "retrieve":
             return CarpetDetailSerializer
         return CarpetListSerializer
     
-    @extend_schema(parameters=[LANG_PARAMETER])
+    @extend_schema(parameters=[LANG_PARAMETER, COMPACT_PARAMETER, *SPARSE_PARAMETERS])
+    @cache_response
     def list(self, request, *args, **kwargs):
+        if is_compact(request):
+            queryset = self.filter_queryset(self.get_queryset())
+            return compact_carpet_response(request, queryset, self.paginator, self.get_sparse_fields())
         return super().list(request, *args, **kwargs)
     
-    @extend_schema(parameters=[LANG_PARAMETER])
+    @extend_schema(parameters=[LANG_PARAMETER, *SPARSE_PARAMETERS])
+    @cache_response
     def retrieve(self, request, *args, **kwargs):
         return super().retrieve(request, *args, **kwargs)
 
+    def get_sort(self):
+        """Значения параметра sort (new, popular); поддерживается несколько: sort=new,popular"""
+        return [s.lower() for s in split_values(self.request.query_params.get("sort"))]
+
     def get_queryset(self):
-        queryset = super().get_queryset()
+        compact = self.action == "list" and is_compact(self.request)
+        queryset = with_carpet_relations(super().get_queryset(), self.get_sparse_fields(), compact)
         
         # Сортировка по новым/популярным
-        # Поддержка нескольких значений: sort=new,popular
-        sort_by_raw = self.request.query_params.get("sort")
-        if sort_by_raw:
-            sort_by = [s.strip().lower() for s in sort_by_raw.split(",") if s.strip()]
-
+        sort_by = self.get_sort()
+        if sort_by:
             # Если выбрали одновременно "new" и "popular" — применяем оба фильтра (AND)
             if "new" in sort_by and "popular" in sort_by:
                 queryset = queryset.filter(is_new=True, is_popular=True).order_by("-watched", "-created_at")
@@ -171,27 +300,131 @@ class CarpetViewSet(ListModelMixin, RetrieveModelMixin, GenericViewSet):
         
         return queryset
 
+    def get_bitmap_index(self):
+        """Индекс битовых карт (api.bitmaps) или None, если он выключен"""
+        if not settings.CATALOG_BITMAP_FILTERS:
+            return None
+        return carpet_bitmap_index()
+
+    def get_bitmap_base(self, index):
+        """Ковры, оставленные параметром sort (флаги is_new/is_popular), в виде битовой карты"""
+        return index.match({SORT_FLAGS[value]: True for value in self.get_sort() if value in SORT_FLAGS})
+
+    def filter_queryset(self, queryset):
+        """
+        Для списка в порядке по умолчанию фильтры считаются по битовым картам,
+        а из БД загружаются только ковры страницы. Сортировка по популярности,
+        ?ordering= и keyset-курсор остаются за БД.
+        """
+        index = self.get_bitmap_index() if self.action == "list" else None
+        params = self.request.query_params
+        if (
+            index is None
+            or "popular" in self.get_sort()
+            or OrderingFilter.ordering_param in params
+            or CursorOptionalPagination.cursor_query_param in params
+        ):
+            return super().filter_queryset(queryset)
+        filterset = self.filterset_class(params, queryset=queryset, request=self.request)
+        if not filterset.is_valid():
+            raise translate_validation(filterset.errors)
+        return index.rows(index.match(filterset.get_selection(), base=self.get_bitmap_base(index)), queryset)
+
     @action(detail=True, methods=["post"])
     def increment_watch(self, request, pk=None):
         """Увеличить счетчик просмотров"""
-        carpet = self.get_object()
-        carpet.watched += 1
-        carpet.save(update_fields=["watched"])
-        return Response({"watched": carpet.watched}, status=status.HTTP_200_OK)
+        if not str(pk).isdigit():
+            raise NotFound
+        watched = record_view(int(pk))
+        if watched is None:
+            raise NotFound
+        return Response({"watched": watched}, status=status.HTTP_200_OK)
 
     @action(detail=False)
+    @cache_response
     def count(self, request):
         """Получить общее количество ковров"""
-        count = self.get_queryset().count()
+        index = self.get_bitmap_index()
+        if index is not None:
+            count = self.get_bitmap_base(index).bit_count()
+        else:
+            count = self.get_queryset().count()
         return Response({"count": count}, status=status.HTTP_200_OK)
 
+    def get_batch_ids(self, request):
+        """ID из ?ids=1,2,3 (GET) или {"ids": [1, 2, 3]} (POST) без повторов, в порядке запроса"""
+        if request.method == "POST":
+            raw = request.data.get("ids", [])
+            values = raw.split(",") if isinstance(raw, str) else raw
+        else:
+            values = [v for value in request.query_params.getlist("ids") for v in value.split(",")]
+        if not isinstance(values, list):
+            raise ValidationError({"ids": ["Ожидается список ID"]})
+        ids = []
+        for value in values:
+            value = str(value).strip()
+            if not value:
+                continue
+            if not value.isdigit():
+                raise ValidationError({"ids": [f"Некорректный ID: {value}"]})
+            ids.append(int(value))
+        ids = list(dict.fromkeys(ids))
+        if len(ids) > self.batch_max_ids:
+            raise ValidationError({"ids": [f"Не более {self.batch_max_ids} ID в одном запросе"]})
+        return ids
+
+    @extend_schema(
+        parameters=[
+            LANG_PARAMETER,
+            OpenApiParameter(
+                name="ids",
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                description="ID ковров через запятую (для длинных списков — POST с {\"ids\": [...]})",
+                required=False,
+            ),
+        ],
+        responses=CarpetDetailSerializer(many=True),
+    )
+    @action(detail=False, methods=["get", "post"])
+    def batch(self, request):
+        """
+        Несколько ковров в детальном представлении, в порядке запрошенных ID.
+        Ненайденные и неопубликованные ковры пропускаются.
+        """
+        def load(ids):
+            queryset = with_carpet_relations(Carpet.objects.filter(is_published=True, pk__in=ids))
+            serializer = CarpetDetailSerializer(queryset, many=True, context=self.get_serializer_context())
+            return {item["id"]: item for item in serializer.data}
+
+        data = cached_representations(self, request, self.get_batch_ids(request), load)
+        return Response(data, status=status.HTTP_200_OK)
+
+    @action(detail=False)
+    @cache_response
+    def facets(self, request):
+        """
+        Количество ковров для каждого значения фильтров (styles, rooms, colors,
+        collection, is_new, is_popular) с учетом уже выбранных фильтров
+        """
+        queryset = self.get_queryset()
+        filterset = self.filterset_class(request.query_params, queryset=queryset, request=request)
+        if not filterset.is_valid():
+            raise translate_validation(filterset.errors)
+        index = self.get_bitmap_index()
+        if index is not None:
+            facets = index.facets(filterset.get_selection(), base=self.get_bitmap_base(index))
+        else:
+            facets = carpet_facets(queryset, filterset)
+        return Response(facets, status=status.HTTP_200_OK)
+
 
 @extend_schema(tags=["Коллекции"])
-class CollectionViewSet(ListModelMixin, RetrieveModelMixin, GenericViewSet):
+class CollectionViewSet(SparseFieldsetsMixin, ListModelMixin, RetrieveModelMixin, GenericViewSet):
     """ViewSet для коллекций"""
-    queryset = Collection.objects.filter(is_published=True).annotate(
-        carpets_count=Count("carpets", filter=Q(carpets__is_published=True))
-    )
+    queryset = Collection.objects.filter(is_published=True)
+    cache_models = CARPET_CACHE_MODELS
+    cache_unordered_params = ("styles", "rooms", "colors", "fields", "expand")
     lookup_field = "slug"
 
     def get_serializer_class(self):
@@ -199,48 +432,91 @@ class CollectionViewSet(ListModelMixin, RetrieveModelMixin, GenericViewSet):
             return CollectionDetailSerializer
         return CollectionListSerializer
     
-    @extend_schema(parameters=[LANG_PARAMETER])
+    @extend_schema(parameters=[LANG_PARAMETER, *SPARSE_PARAMETERS])
+    @cache_response
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
     
-    @extend_schema(parameters=[LANG_PARAMETER])
+    @extend_schema(parameters=[LANG_PARAMETER, *SPARSE_PARAMETERS])
+    @cache_response
     def retrieve(self, request, *args, **kwargs):
         return super().retrieve(request, *args, **kwargs)
 
-    @extend_schema(parameters=[LANG_PARAMETER])
-    @action(detail=True, methods=["get"])
-    def carpets(self, request, slug=None):
-        """Получить ковры коллекции"""
-        collection = self.get_object()
-        carpets = Carpet.objects.filter(
-            collection=collection, is_published=True
-        ).select_related("collection").prefetch_related(
-            "styles", "rooms", "colors", "gallery_images", "characteristics__characteristic"
+    def get_collection_carpets(self, collection, fields=None, compact=False):
+        """
+        Опубликованные ковры коллекции и CarpetFilter по параметрам запроса.
+        Возвращает (queryset без фильтров, провалидированный filterset).
+        """
+        carpets = with_carpet_relations(
+            Carpet.objects.filter(collection=collection, is_published=True), fields, compact
         )
-        
-        # Применяем фильтры из запроса
-        filter_backend = DjangoFilterBackend()
-        carpets = filter_backend.filter_queryset(request, carpets, CarpetViewSet())
-        
-        paginator = StandardResultsSetPagination()
+        if fields is not None:
+            carpets = only_columns(carpets, CarpetListSerializer, fields, CarpetViewSet.sparse_always_columns)
+        filterset = CarpetFilter(self.request.query_params, queryset=carpets, request=self.request)
+        if not filterset.is_valid():
+            raise translate_validation(filterset.errors)
+        return carpets, filterset
+
+    def get_carpets_response(self, carpets, fields=None, compact=False):
+        """Страница ковров (?page=, ?cursor=) в полном или компактном представлении"""
+        request = self.request
+        paginator = CursorOptionalPagination()
+        if compact:
+            return compact_carpet_response(request, carpets, paginator, fields)
         page = paginator.paginate_queryset(carpets, request)
         
         if page is not None:
             serializer = CarpetListSerializer(page, many=True, context={"request": request})
-            return paginator.get_paginated_response(serializer.data)
+            return paginator.get_paginated_response(trim_serializer(serializer, fields).data)
         
         serializer = CarpetListSerializer(carpets, many=True, context={"request": request})
-        return Response(serializer.data)
+        return Response(trim_serializer(serializer, fields).data)
+
+    @extend_schema(parameters=[LANG_PARAMETER, COMPACT_PARAMETER, *SPARSE_PARAMETERS])
+    @action(detail=True, methods=["get"])
+    @cache_response
+    def carpets(self, request, slug=None):
+        """Получить ковры коллекции"""
+        collection = self.get_object()
+        # ?fields= и ?expand= относятся к коврам
+        fields = self.get_sparse_fields(CarpetListSerializer)
+        compact = is_compact(request)
+        _, filterset = self.get_collection_carpets(collection, fields, compact)
+        return self.get_carpets_response(filterset.qs, fields, compact)
+
+    @extend_schema(parameters=[LANG_PARAMETER, COMPACT_PARAMETER, *SPARSE_PARAMETERS])
+    @action(detail=True, methods=["get"])
+    @cache_response
+    def page(self, request, slug=None):
+        """
+        Страница коллекции одним запросом: коллекция, страница ковров с учетом
+        фильтров из запроса и фасеты по коврам коллекции.
+        Параметры фильтров, пагинации, fields/expand и compact — как у /carpets/.
+        """
+        collection = self.get_object()
+        fields = self.get_sparse_fields(CarpetListSerializer)
+        compact = is_compact(request)
+        carpets, filterset = self.get_collection_carpets(collection, fields, compact)
+        return Response(
+            {
+                "collection": CollectionDetailSerializer(collection, context=self.get_serializer_context()).data,
+                "carpets": self.get_carpets_response(filterset.qs, fields, compact).data,
+                "facets": carpet_facets(carpets, filterset),
+            },
+            status=status.HTTP_200_OK,
+        )
 
 
 @extend_schema(tags=["Стили"])
 class StyleViewSet(ListModelMixin, GenericViewSet):
     """ViewSet для стилей"""
     queryset = Style.objects.all()
+    cache_models = (Style,)
     serializer_class = StyleSerializer
     pagination_class = None
     
     @extend_schema(parameters=[LANG_PARAMETER])
+    @cache_response
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
@@ -249,10 +525,12 @@ class StyleViewSet(ListModelMixin, GenericViewSet):
 class RoomViewSet(ListModelMixin, GenericViewSet):
     """ViewSet для комнат"""
     queryset = Room.objects.all()
+    cache_models = (Room,)
     serializer_class = RoomSerializer
     pagination_class = None
     
     @extend_schema(parameters=[LANG_PARAMETER])
+    @cache_response
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
@@ -261,10 +539,12 @@ class RoomViewSet(ListModelMixin, GenericViewSet):
 class ColorViewSet(ListModelMixin, GenericViewSet):
     """ViewSet для цветов"""
     queryset = Color.objects.all()
+    cache_models = (Color,)
     serializer_class = ColorSerializer
     pagination_class = None
     
     @extend_schema(parameters=[LANG_PARAMETER])
+    @cache_response
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
@@ -273,19 +553,24 @@ class ColorViewSet(ListModelMixin, GenericViewSet):
 class CharacteristicViewSet(ListModelMixin, GenericViewSet):
     """ViewSet для справочника характеристик"""
     queryset = Characteristic.objects.filter(is_active=True)
+    cache_models = (Characteristic,)
     serializer_class = CharacteristicSerializer
     pagination_class = None
     
     @extend_schema(parameters=[LANG_PARAMETER])
+    @cache_response
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
 
 @extend_schema(tags=["Новости"])
-class NewsViewSet(ListModelMixin, RetrieveModelMixin, GenericViewSet):
+class NewsViewSet(SparseFieldsetsMixin, ListModelMixin, RetrieveModelMixin, GenericViewSet):
     """ViewSet для новостей"""
     queryset = News.objects.filter(is_published=True)
-    pagination_class = StandardResultsSetPagination
+    cache_models = (News, NewsImage)
+    cache_unordered_params = ("fields", "expand")
+    pagination_class = CursorOptionalPagination
+    sparse_always_columns = ("created_at",)
     lookup_field = "slug"
 
     def get_serializer_class(self):
@@ -293,11 +578,13 @@ class NewsViewSet(ListModelMixin, RetrieveModelMixin, GenericViewSet):
             return NewsDetailSerializer
         return NewsListSerializer
     
-    @extend_schema(parameters=[LANG_PARAMETER])
+    @extend_schema(parameters=[LANG_PARAMETER, *SPARSE_PARAMETERS])
+    @cache_response
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
     
-    @extend_schema(parameters=[LANG_PARAMETER])
+    @extend_schema(parameters=[LANG_PARAMETER, *SPARSE_PARAMETERS])
+    @cache_response
     def retrieve(self, request, *args, **kwargs):
         return super().retrieve(request, *args, **kwargs)
 
@@ -306,10 +593,12 @@ class NewsViewSet(ListModelMixin, RetrieveModelMixin, GenericViewSet):
 class GalleryViewSet(ListModelMixin, GenericViewSet):
     """ViewSet для галереи"""
     queryset = Gallery.objects.filter(is_published=True)
+    cache_models = (Gallery,)
     serializer_class = GallerySerializer
     pagination_class = StandardResultsSetPagination
     
     @extend_schema(parameters=[LANG_PARAMETER])
+    @cache_response
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
@@ -323,12 +612,8 @@ class MainGalleryViewSet(ListModelMixin, GenericViewSet):
     
     @extend_schema(parameters=[LANG_PARAMETER])
     def list(self, request, *args, **kwargs):
-        """Возвращает объект нижней галереи (или {} если записи нет)"""
-        instance = self.get_queryset().first()
-        if not instance:
-            return Response({})
-        serializer = self.get_serializer(instance)
-        return Response(serializer.data)
+        """Возвращает объект нижней галереи (или {} если записи нет, снапшот)"""
+        return snapshot_response(request, "main-gallery")
 
 
 @extend_schema(tags=["Главная секция"])
@@ -340,29 +625,21 @@ class HomePageViewSet(ListModelMixin, GenericViewSet):
     
     @extend_schema(parameters=[LANG_PARAMETER])
     def list(self, request, *args, **kwargs):
-        """Возвращает первый опубликованный объект главной страницы"""
-        instance = self.get_queryset().first()
-        if instance:
-            serializer = self.get_serializer(instance)
-            return Response(serializer.data)
-        return Response({}, status=status.HTTP_200_OK)
+        """Возвращает первый опубликованный объект главной страницы (снапшот)"""
+        return snapshot_response(request, "homepage")
 
 
 @extend_schema(tags=["О компании"])
 class AboutPageViewSet(ListModelMixin, GenericViewSet):
     """ViewSet для страницы о компании"""
-    queryset = AboutPage.objects.filter(is_published=True)
+    queryset = with_about_page_relations(AboutPage.objects.filter(is_published=True))
     serializer_class = AboutPageSerializer
     pagination_class = None
     
     @extend_schema(parameters=[LANG_PARAMETER])
     def list(self, request, *args, **kwargs):
-        """Возвращает первый опубликованный объект страницы о компании со всеми данными в одном запросе"""
-        instance = self.get_queryset().first()
-        if instance:
-            serializer = self.get_serializer(instance)
-            return Response(serializer.data)
-        return Response({}, status=status.HTTP_200_OK)
+        """Возвращает первый опубликованный объект страницы о компании со всеми данными (снапшот)"""
+        return snapshot_response(request, "about")
 
 
 @extend_schema(tags=["Контакты"])
@@ -374,26 +651,138 @@ class ContactPageViewSet(ListModelMixin, GenericViewSet):
     
     @extend_schema(parameters=[LANG_PARAMETER])
     def list(self, request, *args, **kwargs):
-        """Возвращает первый опубликованный объект страницы контактов"""
-        instance = self.get_queryset().first()
-        if instance:
-            serializer = self.get_serializer(instance)
-            return Response(serializer.data)
-        return Response({}, status=status.HTTP_200_OK)
+        """Возвращает первый опубликованный объект страницы контактов (снапшот)"""
+        return snapshot_response(request, "contact")
+
+
+@extend_schema(tags=["Поиск"])
+class SearchViewSet(GenericViewSet):
+    """
+    Поиск по коврам (код), коллекциям и новостям (названия) на всех языках.
+    Результаты сгруппированы по типу и отсортированы по релевантности,
+    опечатки и неполный ввод допускаются.
+    """
+    cache_models = (Carpet, Collection, News)
+    pagination_class = None
+    default_limit = 5
+    max_limit = 20
+
+    def get_limit(self):
+        try:
+            limit = int(self.request.query_params.get("limit", self.default_limit))
+        except ValueError:
+            return self.default_limit
+        return min(max(limit, 1), self.max_limit)
+
+    def search(self, queryset, serializer_class, text):
+        results = search_queryset(queryset, text)[: self.get_limit()]
+        return serializer_class(results, many=True, context=self.get_serializer_context()).data
+
+    @extend_schema(
+        parameters=[
+            LANG_PARAMETER,
+            OpenApiParameter(name="q", type=OpenApiTypes.STR, location=OpenApiParameter.QUERY,
+                             description=f"Строка поиска (не короче {MIN_QUERY_LENGTH} символов)"),
+            OpenApiParameter(name="limit", type=OpenApiTypes.INT, location=OpenApiParameter.QUERY,
+                             description="Максимум результатов каждого типа (по умолчанию 5, максимум 20)"),
+        ],
+    )
+    @cache_response
+    def list(self, request, *args, **kwargs):
+        text = request.query_params.get("q", "").strip()
+        if len(text) < MIN_QUERY_LENGTH:
+            return Response({"carpets": [], "collections": [], "news": []}, status=status.HTTP_200_OK)
+        return Response(
+            {
+                "carpets": self.search(
+                    Carpet.objects.filter(is_published=True).select_related("collection"),
+                    SearchCarpetSerializer,
+                    text,
+                ),
+                "collections": self.search(
+                    Collection.objects.filter(is_published=True),
+                    SearchCollectionSerializer,
+                    text,
+                ),
+                "news": self.search(News.objects.filter(is_published=True), NewsListSerializer, text),
+            },
+            status=status.HTTP_200_OK,
+        )
 
 
 @extend_schema(tags=["Регионы и торговые точки"])
 class RegionViewSet(ListModelMixin, GenericViewSet):
-    """ViewSet для регионов с торговыми точками"""
-    queryset = Region.objects.filter(is_published=True).prefetch_related('sales_points')
+    """
+    ViewSet для регионов с торговыми точками (локатор дилеров).
+    Ответ кэшируется для каждого языка и сбрасывается при изменении регионов и точек.
+    Ближайшие к координатам точки ищутся по индексу в памяти (api.nearest).
+    """
+    queryset = with_published_sales_points(Region.objects.filter(is_published=True))
+    cache_models = (Region, SalesPoint)
     serializer_class = RegionSerializer
     pagination_class = None
     lookup_field = "slug"
+    default_nearest_limit = 5
+    max_nearest_limit = 20
     
     @extend_schema(parameters=[LANG_PARAMETER])
+    @cache_response
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
+    def get_coordinates(self):
+        """(широта, долгота) из параметров lat и lon"""
+        errors = {}
+        coordinates = []
+        for name, bound in (("lat", 90), ("lon", 180)):
+            try:
+                value = float(self.request.query_params[name])
+            except KeyError:
+                errors[name] = ["Обязательный параметр"]
+                continue
+            except ValueError:
+                errors[name] = ["Ожидается число"]
+                continue
+            if not -bound <= value <= bound:
+                errors[name] = [f"Ожидается число от -{bound} до {bound}"]
+            coordinates.append(value)
+        if errors:
+            raise ValidationError(errors)
+        return tuple(coordinates)
+
+    def get_nearest_limit(self):
+        try:
+            limit = int(self.request.query_params.get("limit", self.default_nearest_limit))
+        except ValueError:
+            return self.default_nearest_limit
+        return min(max(limit, 1), self.max_nearest_limit)
+
+    @extend_schema(
+        parameters=[
+            LANG_PARAMETER,
+            OpenApiParameter(name="lat", type=OpenApiTypes.FLOAT, location=OpenApiParameter.QUERY,
+                             description="Широта", required=True),
+            OpenApiParameter(name="lon", type=OpenApiTypes.FLOAT, location=OpenApiParameter.QUERY,
+                             description="Долгота", required=True),
+            OpenApiParameter(name="limit", type=OpenApiTypes.INT, location=OpenApiParameter.QUERY,
+                             description="Количество точек (по умолчанию 5, максимум 20)"),
+        ],
+        responses=NearestSalesPointSerializer(many=True),
+    )
+    @action(detail=False)
+    def nearest(self, request):
+        """Ближайшие опубликованные торговые точки с расстоянием в километрах"""
+        latitude, longitude = self.get_coordinates()
+        found = sales_point_index().nearest(latitude, longitude, self.get_nearest_limit())
+        serializer = NearestSalesPointSerializer(
+            [point for _, point in found], many=True, context=self.get_serializer_context(),
+        )
+        data = [
+            {**item, "distance_km": round(distance, 2)}
+            for (distance, _), item in zip(found, serializer.data)
+        ]
+        return Response(data, status=status.HTTP_200_OK)
+
 
 @extend_schema(tags=["Форма обратной связи"])
 class ContactFormSubmissionViewSet(CreateModelMixin, GenericViewSet):
@@ -407,12 +796,8 @@ class ContactFormSubmissionViewSet(CreateModelMixin, GenericViewSet):
         serializer.is_valid(raise_exception=True)
         self.perform_create(serializer)
         payload = {k: str(v) if v is not None else "" for k, v in serializer.validated_data.items()}
-        try:
-            from apps.catalog.tasks import send_application_to_telegram
-            send_application_to_telegram.delay("contact", payload)
-        except ImportError:
-            from apps.catalog.telegram_notify import notify_telegram_application
-            notify_telegram_application("contact", payload)
+        # Уведомление в Telegram отправит Celery beat после коммита (apps.catalog.outbox)
+        queue_notification("contact", payload)
 
         return Response(
             {"message": "Заявка успешно отправлена", "success": True},
@@ -424,10 +809,12 @@ class ContactFormSubmissionViewSet(CreateModelMixin, GenericViewSet):
 class FAQViewSet(ListModelMixin, GenericViewSet):
     """ViewSet для FAQ"""
     queryset = FAQ.objects.filter(is_published=True)
+    cache_models = (FAQ,)
     serializer_class = FAQSerializer
     pagination_class = None
     
     @extend_schema(parameters=[LANG_PARAMETER])
+    @cache_response
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
@@ -436,10 +823,12 @@ class FAQViewSet(ListModelMixin, GenericViewSet):
 class AdvantageCardViewSet(ListModelMixin, GenericViewSet):
     """ViewSet для карточек преимуществ"""
     queryset = AdvantageCard.objects.filter(is_published=True)
+    cache_models = (AdvantageCard,)
     serializer_class = AdvantageCardSerializer
     pagination_class = None
     
     @extend_schema(parameters=[LANG_PARAMETER])
+    @cache_response
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
@@ -449,7 +838,7 @@ class InstagramPostViewSet(ListModelMixin, GenericViewSet):
     """ViewSet для постов Instagram"""
     queryset = InstagramPost.objects.filter(is_published=True)
     serializer_class = InstagramPostSerializer
-    pagination_class = StandardResultsSetPagination
+    pagination_class = CursorOptionalPagination
     
     def list(self, request, *args, **kwargs):
         """Возвращает список опубликованных постов Instagram, отсортированных по дате"""
@@ -465,12 +854,8 @@ class GlobalSettingsViewSet(ListModelMixin, GenericViewSet):
     
     @extend_schema(parameters=[LANG_PARAMETER])
     def list(self, request, *args, **kwargs):
-        """Возвращает первый опубликованный объект глобальных настроек"""
-        instance = self.get_queryset().first()
-        if instance:
-            serializer = self.get_serializer(instance)
-            return Response(serializer.data)
-        return Response({}, status=status.HTTP_200_OK)
+        """Возвращает первый опубликованный объект глобальных настроек (снапшот)"""
+        return snapshot_response(request, "global-settings")
 
 
 @extend_schema(tags=["Форма на дилерство"])
@@ -485,14 +870,36 @@ class DealerRequestViewSet(CreateModelMixin, GenericViewSet):
         serializer.is_valid(raise_exception=True)
         self.perform_create(serializer)
         payload = {k: str(v) if v is not None else "" for k, v in serializer.validated_data.items()}
-        try:
-            from apps.catalog.tasks import send_application_to_telegram
-            send_application_to_telegram.delay("dealer", payload)
-        except ImportError:
-            from apps.catalog.telegram_notify import notify_telegram_application
-            notify_telegram_application("dealer", payload)
+        # Уведомление в Telegram отправит Celery beat после коммита (apps.catalog.outbox)
+        queue_notification("dealer", payload)
 
         return Response(
             {"message": "Заявка успешно отправлена", "success": True},
             status=status.HTTP_201_CREATED
-        )
\ No newline at end of file
+        )
+
+
+@extend_schema(tags=["Глобальные настройки"])
+class BootstrapViewSet(GenericViewSet):
+    """
+    Глобальные данные сайта для первой отрисовки одним запросом: настройки,
+    контакты, FAQ, преимущества, регионы, справочники и коллекции.
+    У каждой секции своя версия в блоке versions.
+    """
+    pagination_class = None
+    # Секция ответа -> снапшот страницы или (ViewSet списка, его basename)
+    sections = {
+        "global_settings": "global-settings",
+        "contact": "contact",
+        "faq": (FAQViewSet, "faq"),
+        "advantages": (AdvantageCardViewSet, "advantage"),
+        "regions": (RegionViewSet, "region"),
+        "styles": (StyleViewSet, "style"),
+        "rooms": (RoomViewSet, "room"),
+        "colors": (ColorViewSet, "color"),
+        "collections": (CollectionViewSet, "collection"),
+    }
+
+    @extend_schema(parameters=[LANG_PARAMETER], responses=OpenApiTypes.OBJECT)
+    def list(self, request, *args, **kwargs):
+        return bootstrap_response(request, self.sections)
@@ -11,4 +11,6 @@ class CatalogConfig(AppConfig):
         Override this method in subclasses to run code when Django starts.
         """
         # Импортируем translations для регистрации переводов
-        import apps.catalog.translation  # noqa: F401
\ No newline at end of file
+        import apps.catalog.translation  # noqa: F401
+        # Подключаем сигналы инвалидации кэша
+        import apps.catalog.signals  # noqa: F401
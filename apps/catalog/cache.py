@@ -0,0 +1,69 @@
+"""
+Счетчики поколений (generation) моделей каталога для инвалидации кэша ответов API.
+
+Каждая модель имеет свой счетчик в кэше. Ключ закэшированного ответа включает
+текущие значения счетчиков всех моделей, от которых зависит ответ, поэтому
+увеличение счетчика делает все такие ответы недоступными без перебора ключей.
+
+Вместе со счетчиком хранится время последнего изменения модели — из него
+строится заголовок Last-Modified условных GET-запросов.
+"""
+
+import time
+
+from django.core.cache import cache
+
+GENERATION_KEY_PREFIX = "catalog:gen"
+MODIFIED_KEY_PREFIX = "catalog:modified"
+
+
+def generation_key(model):
+    return f"{GENERATION_KEY_PREFIX}:{model._meta.label_lower}"
+
+
+def modified_key(model):
+    return f"{MODIFIED_KEY_PREFIX}:{model._meta.label_lower}"
+
+
+def _initial_generation():
+    # Если счетчик вытеснен из кэша, новое значение не должно совпасть со старым,
+    # иначе снова станут видны устаревшие ответы
+    return time.time_ns()
+
+
+def get_generations(models):
+    """Текущие значения счетчиков для списка моделей (в том же порядке)"""
+    keys = [generation_key(model) for model in models]
+    generations = cache.get_many(keys)
+    for key in keys:
+        if key not in generations:
+            cache.add(key, _initial_generation(), timeout=None)
+            generations[key] = cache.get(key)
+    return [generations[key] for key in keys]
+
+
+def get_last_modified(models):
+    """
+    Время (unix timestamp) последнего изменения любой из моделей.
+
+    Если время модели неизвестно (вытеснено из кэша или модель еще не менялась
+    с момента запуска), оно считается текущим: клиент получит полный ответ
+    и дальше будет проверять уже новое значение.
+    """
+    keys = [modified_key(model) for model in models]
+    timestamps = cache.get_many(keys)
+    for key in keys:
+        if key not in timestamps:
+            cache.add(key, time.time(), timeout=None)
+            timestamps[key] = cache.get(key)
+    return max(timestamps.values(), default=None)
+
+
+def bump_generation(model):
+    """Увеличивает счетчик модели, инвалидируя все зависящие от нее ответы"""
+    key = generation_key(model)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, _initial_generation(), timeout=None)
+    cache.set(modified_key(model), time.time(), timeout=None)
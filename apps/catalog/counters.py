@@ -0,0 +1,221 @@
+"""
+Буферизованный счетчик просмотров ковров.
+
+Просмотры накапливаются в Redis (HINCRBY в общий hash) и не трогают Postgres.
+Периодическая задача flush_carpet_views (Celery beat) переносит накопленные
+дельты в узкую таблицу CarpetStats одним UPDATE ... SET watched = watched + delta
+(вместе со счетчиками за день и за неделю).
+
+Если кэш по умолчанию не django-redis (локальная разработка, тесты),
+счетчик увеличивается сразу атомарным UPDATE без чтения строки.
+"""
+
+import logging
+import uuid
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Case
+from django.db.models import F
+from django.db.models import IntegerField
+from django.db.models import Value
+from django.db.models import When
+from django.utils import timezone
+from django_redis import get_redis_connection
+from redis.exceptions import LockNotOwnedError
+from redis.exceptions import ResponseError
+from redis.exceptions import WatchError
+
+from apps.catalog.models import CarpetStats
+from apps.catalog.models import CarpetViewsFlush
+
+logger = logging.getLogger(__name__)
+
+PENDING_KEY = "catalog:carpet_views:pending"
+FLUSHING_KEY = "catalog:carpet_views:flushing"
+FLUSH_LOCK_KEY = "catalog:carpet_views:flush_lock"
+# ID переноса буфера FLUSHING_KEY (записывается в CarpetViewsFlush вместе с дельтами)
+FLUSH_ID_KEY = "catalog:carpet_views:flush_id"
+BASE_KEY_PREFIX = "catalog:carpet_views:base"
+# Номер переноса: увеличивается каждым flush_carpet_views вместе с очисткой буфера
+EPOCH_KEY = "catalog:carpet_views:epoch"
+# Сколько живет закэшированное значение watched из БД
+BASE_TIMEOUT = 10 * 60
+FLUSH_LOCK_TIMEOUT = 5 * 60
+FLUSH_BATCH_SIZE = 500
+# Сколько хранятся записи о примененных переносах
+FLUSH_HISTORY = timedelta(days=7)
+
+
+def _redis():
+    """Соединение Redis кэша по умолчанию или None, если кэш не django-redis"""
+    try:
+        return get_redis_connection("default")
+    except NotImplementedError:
+        return None
+
+
+def _base_key(carpet_id):
+    return f"{BASE_KEY_PREFIX}:{carpet_id}"
+
+
+def _decode_base(value, epoch):
+    """
+    Закэшированное значение watched, если оно прочитано из БД после последнего
+    переноса (хранится как "<номер переноса>:<watched>"), иначе None
+    """
+    if value is None:
+        return None
+    value_epoch, _, watched = value.decode().partition(":")
+    if not watched or value_epoch != (epoch or b"0").decode():
+        return None
+    return int(watched)
+
+
+def _published_stats(carpet_id):
+    return CarpetStats.objects.filter(carpet_id=carpet_id, carpet__is_published=True)
+
+
+def _increments(delta):
+    """
+    Значения для update(): прибавляют delta ко всем счетчикам.
+    Счетчики за день и неделю, оставшиеся от прошлого периода, начинаются заново.
+    """
+    today, week_start = CarpetStats.current_periods()
+    return {
+        "watched": F("watched") + delta,
+        "views_today": Case(
+            When(day=today, then=F("views_today") + delta),
+            default=delta,
+        ),
+        "views_week": Case(
+            When(week_start=week_start, then=F("views_week") + delta),
+            default=delta,
+        ),
+        "day": Value(today),
+        "week_start": Value(week_start),
+    }
+
+
+def roll_over_periods():
+    """Обнуляет счетчики за день и неделю у ковров без просмотров в текущем периоде"""
+    today, week_start = CarpetStats.current_periods()
+    CarpetStats.objects.exclude(day=today).exclude(views_today=0).update(views_today=0)
+    CarpetStats.objects.exclude(week_start=week_start).exclude(views_week=0).update(views_week=0)
+
+
+def record_view(carpet_id):
+    """
+    Учитывает просмотр ковра и возвращает текущее число просмотров
+    (сохраненное в БД + еще не перенесенное из буфера).
+    Возвращает None, если опубликованного ковра с таким id нет.
+    """
+    conn = _redis()
+    if conn is None:
+        if not _published_stats(carpet_id).update(**_increments(Value(1))):
+            return None
+        return _published_stats(carpet_id).values_list("watched", flat=True).first()
+
+    cached, epoch = conn.mget(_base_key(carpet_id), EPOCH_KEY)
+    base = _decode_base(cached, epoch)
+    if base is None:
+        # Номер переноса читается до БД: если перенос завершится после чтения,
+        # значение будет закэшировано со старым номером и отброшено следующим запросом
+        base = _published_stats(carpet_id).values_list("watched", flat=True).first()
+        if base is None:
+            return None
+        conn.set(_base_key(carpet_id), f"{int(epoch or 0)}:{base}", ex=BASE_TIMEOUT)
+
+    pipe = conn.pipeline()
+    pipe.hincrby(PENDING_KEY, carpet_id, 1)
+    pipe.hget(FLUSHING_KEY, carpet_id)
+    pending, flushing = pipe.execute()
+    return int(base) + pending + int(flushing or 0)
+
+
+def _apply_deltas(flush_id, deltas):
+    """
+    UPDATE catalog_carpetstats SET watched = watched + CASE carpet_id WHEN ... END пачками.
+    Возвращает False, если перенос flush_id уже был применен (дельты не прибавляются повторно).
+    """
+    items = sorted(deltas.items())
+    with transaction.atomic():
+        _, created = CarpetViewsFlush.objects.get_or_create(flush_id=flush_id)
+        if not created:
+            return False
+        for start in range(0, len(items), FLUSH_BATCH_SIZE):
+            batch = dict(items[start:start + FLUSH_BATCH_SIZE])
+            delta = Case(
+                *(When(carpet_id=pk, then=Value(value)) for pk, value in batch.items()),
+                default=Value(0),
+                output_field=IntegerField(),
+            )
+            CarpetStats.objects.filter(carpet_id__in=batch).update(**_increments(delta))
+    CarpetViewsFlush.objects.filter(applied_at__lt=timezone.now() - FLUSH_HISTORY).delete()
+    return True
+
+
+def flush_carpet_views():
+    """
+    Переносит накопленные в Redis просмотры в БД. Возвращает число перенесенных просмотров.
+
+    Накопленный hash атомарно переименовывается, поэтому новые просмотры
+    во время переноса попадают в новый буфер. Если предыдущий перенос
+    прервался, сначала дописывается оставшийся hash. У hash есть ID переноса,
+    который фиксируется в БД в одной транзакции с дельтами: если сбой случился
+    после коммита, повторный перенос того же hash только очищает его.
+    """
+    roll_over_periods()
+    conn = _redis()
+    if conn is None:
+        return 0
+
+    lock = conn.lock(FLUSH_LOCK_KEY, timeout=FLUSH_LOCK_TIMEOUT)
+    if not lock.acquire(blocking=False):
+        logger.info("Carpet views flush skipped: another flush is running")
+        return 0
+    try:
+        if not conn.exists(FLUSHING_KEY):
+            try:
+                conn.rename(PENDING_KEY, FLUSHING_KEY)
+            except ResponseError:
+                # Буфер пуст
+                return 0
+
+        conn.set(FLUSH_ID_KEY, uuid.uuid4().hex, nx=True)
+        flush_id = conn.get(FLUSH_ID_KEY).decode()
+        deltas = {
+            int(pk): int(value)
+            for pk, value in conn.hgetall(FLUSHING_KEY).items()
+            if int(value)
+        }
+        if deltas and not _apply_deltas(flush_id, deltas):
+            logger.warning("Carpet views flush %s was already applied, clearing the buffer", flush_id)
+            deltas = {}
+
+        # Значения watched в БД изменились: кэш базовых значений сбрасывается
+        # вместе с буфером, иначе перенесенные просмотры учитывались бы дважды.
+        # Новый номер переноса делает недействительными и базовые значения, прочитанные
+        # из БД до коммита переноса, но закэшированные после удаления ключей
+        # Буфер удаляется, только если это все еще он (после истечения блокировки
+        # другой перенос мог уже очистить его и переименовать следующий)
+        with conn.pipeline() as pipe:
+            try:
+                pipe.watch(FLUSH_ID_KEY)
+                if pipe.get(FLUSH_ID_KEY) == flush_id.encode():
+                    pipe.multi()
+                    pipe.incr(EPOCH_KEY)
+                    pipe.delete(*(_base_key(pk) for pk in deltas), FLUSHING_KEY, FLUSH_ID_KEY)
+                    pipe.execute()
+            except WatchError:
+                pass
+    finally:
+        try:
+            lock.release()
+        except LockNotOwnedError:
+            # Перенос шел дольше FLUSH_LOCK_TIMEOUT; повторное применение исключено ID переноса
+            logger.warning("Carpet views flush lock expired before release")
+
+    total = sum(deltas.values())
+    logger.info("Carpet views flushed: %s views for %s carpets", total, len(deltas))
+    return total
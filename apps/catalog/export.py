@@ -0,0 +1,207 @@
+"""
+Публикация ответов публичных эндпоинтов API каталога в виде файлов для nginx.
+
+Каждый эндпоинт из EXPORT_ENDPOINTS рендерится на всех языках обычным
+запросом через тестовый клиент Django (те же вьюхи, кэш и заголовки ссылок,
+что у живого API) и записывается в каталог новой версии вместе со сжатыми
+копиями .gz для gzip_static (только gzip, brotli не используется):
+
+    <CATALOG_EXPORT_ROOT>/versions/<версия>/api/styles/index.ru.json
+    <CATALOG_EXPORT_ROOT>/versions/<версия>/api/carpets/page-2.en.json
+    <CATALOG_EXPORT_ROOT>/current -> versions/<версия>
+
+Готовая версия подменяет текущую атомарной заменой символической ссылки
+current, поэтому nginx никогда не видит частично записанный набор файлов.
+nginx отдает файлы через try_files, а при промахе (другие параметры запроса,
+незаэкспортированный эндпоинт) проксирует запрос в Django. Если экспорт
+упал, ссылка current удаляется (все запросы идут в Django), а задача
+повторяется с растущей задержкой.
+
+После изменения данных каталога экспорт запускается Celery-задачей
+с задержкой CATALOG_EXPORT_DELAY, чтобы серия сохранений в админке
+дала один экспорт. Без CATALOG_EXPORT_ROOT экспорт выключен.
+"""
+
+import gzip
+import json
+import logging
+import os
+import shutil
+from functools import cache as memoize
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.test import Client
+from django.urls import resolve
+from django.urls import reverse
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+EXPORT_LOCK_KEY = "catalog:export:lock"
+EXPORT_SCHEDULED_KEY = "catalog:export:scheduled"
+EXPORT_LOCK_TIMEOUT = 10 * 60
+# Повторы упавшего экспорта (задержка удваивается от CATALOG_EXPORT_DELAY)
+EXPORT_MAX_RETRIES = 5
+
+VERSIONS_DIR = "versions"
+CURRENT_LINK = "current"
+MANIFEST_NAME = "manifest.json"
+
+# URL-имена эндпоинтов, которые экспортируются одним файлом на язык
+EXPORT_ENDPOINTS = (
+    "api:homepage-list",
+    "api:about-list",
+    "api:contact-list",
+    "api:global-settings-list",
+    "api:main-gallery-list",
+    "api:bootstrap-list",
+    "api:style-list",
+    "api:room-list",
+    "api:color-list",
+    "api:characteristic-list",
+    "api:faq-list",
+    "api:advantage-list",
+    "api:region-list",
+    "api:collection-list",
+)
+# Постраничные эндпоинты: экспортируются первые CATALOG_EXPORT_PAGES страниц
+EXPORT_PAGED_ENDPOINTS = (
+    "api:carpet-list",
+    "api:news-list",
+)
+
+
+@memoize
+def export_models():
+    """Модели, от которых зависят экспортируемые ответы"""
+    from apps.catalog.api.snapshots import SNAPSHOT_MODELS
+
+    models = set(SNAPSHOT_MODELS)
+    for name in (*EXPORT_ENDPOINTS, *EXPORT_PAGED_ENDPOINTS):
+        view_class = resolve(reverse(name)).func.cls
+        models.update(getattr(view_class, "cache_models", ()))
+    return models
+
+
+def export_file_name(language, page=None):
+    """Имя файла в каталоге эндпоинта (см. map $prerender_file в конфиге nginx)"""
+    if page is None:
+        return f"index.{language}.json"
+    return f"page-{page}.{language}.json"
+
+
+def write_file(path, content):
+    """Записывает JSON и сжатую копию .gz для gzip_static"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(content)
+    Path(f"{path}.gz").write_bytes(gzip.compress(content, compresslevel=9, mtime=0))
+
+
+class ExportClient:
+    """Запросы к API от имени CATALOG_SNAPSHOT_BASE_URL (абсолютные ссылки в ответах)"""
+
+    def __init__(self):
+        base_url = urlsplit(settings.CATALOG_SNAPSHOT_BASE_URL)
+        self.secure = base_url.scheme == "https"
+        self.client = Client(HTTP_HOST=base_url.netloc, HTTP_ACCEPT="application/json")
+
+    def get(self, path, **params):
+        return self.client.get(path, params, secure=self.secure)
+
+
+def render_endpoints(directory):
+    """Рендерит все эндпоинты в directory. Возвращает список записанных файлов (относительно directory)"""
+    client = ExportClient()
+    files = []
+
+    def export(path, language, page=None):
+        params = {"lang": language} if page is None else {"lang": language, "page": page}
+        response = client.get(path, **params)
+        if page is not None and response.status_code == 404:
+            return False
+        if response.status_code != 200:
+            raise RuntimeError(f"{path} {params}: HTTP {response.status_code}")
+        name = Path(path.lstrip("/")) / export_file_name(language, page)
+        write_file(directory / name, response.content)
+        files.append(str(name))
+        return True
+
+    for language in settings.MODELTRANSLATION_LANGUAGES:
+        for name in EXPORT_ENDPOINTS:
+            export(reverse(name), language)
+        for name in EXPORT_PAGED_ENDPOINTS:
+            path = reverse(name)
+            export(path, language)
+            for page in range(1, settings.CATALOG_EXPORT_PAGES + 1):
+                if not export(path, language, page):
+                    break
+    return files
+
+
+def switch_current(root, version):
+    """Атомарно направляет ссылку current на версию"""
+    link = root / CURRENT_LINK
+    temporary = root / f".{CURRENT_LINK}-{version}"
+    temporary.symlink_to(Path(VERSIONS_DIR) / version)
+    os.replace(temporary, link)
+
+
+def remove_current(root):
+    """Убирает ссылку current: nginx отдает запросы Django, пока экспорт не восстановится"""
+    (root / CURRENT_LINK).unlink(missing_ok=True)
+
+
+def prune_versions(root, keep):
+    """Удаляет старые версии, кроме keep последних и текущей"""
+    versions = sorted(path for path in (root / VERSIONS_DIR).iterdir() if path.is_dir())
+    current = (root / CURRENT_LINK).resolve()
+    for path in versions[:-keep]:
+        if path.resolve() != current:
+            shutil.rmtree(path, ignore_errors=True)
+
+
+def export_api(root=None):
+    """
+    Экспортирует API в новую версию и делает ее текущей.
+    Возвращает имя версии или None, если экспорт уже выполняется другим процессом.
+    """
+    root = Path(root or settings.CATALOG_EXPORT_ROOT)
+    if not cache.add(EXPORT_LOCK_KEY, True, timeout=EXPORT_LOCK_TIMEOUT):
+        return None
+    try:
+        version = timezone.now().strftime("%Y%m%dT%H%M%S%f")
+        directory = root / VERSIONS_DIR / version
+        directory.mkdir(parents=True)
+        try:
+            files = render_endpoints(directory)
+            manifest = {"version": version, "files": files}
+            (directory / MANIFEST_NAME).write_text(json.dumps(manifest, ensure_ascii=False, indent=2))
+        except BaseException:
+            shutil.rmtree(directory, ignore_errors=True)
+            # Данные уже изменились, а старые файлы их не содержат: лучше отдавать ответы Django
+            remove_current(root)
+            logger.exception("API export failed, exported files are disabled until the next export")
+            raise
+        switch_current(root, version)
+        prune_versions(root, settings.CATALOG_EXPORT_KEEP_VERSIONS)
+        return version
+    finally:
+        cache.delete(EXPORT_LOCK_KEY)
+
+
+def _enqueue_export():
+    from apps.catalog.tasks import export_api as export_api_task
+
+    # Пока задача ждет запуска, повторные изменения не ставят новую
+    if cache.add(EXPORT_SCHEDULED_KEY, True, timeout=settings.CATALOG_EXPORT_DELAY):
+        export_api_task.apply_async(countdown=settings.CATALOG_EXPORT_DELAY)
+
+
+def schedule_export(model):
+    """Ставит экспорт после коммита, если изменена модель, от которой зависят файлы"""
+    if settings.CATALOG_EXPORT_ROOT and model in export_models():
+        transaction.on_commit(_enqueue_export)
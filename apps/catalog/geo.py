@@ -0,0 +1,81 @@
+"""
+Координаты торговых точек: разбор ссылок на карты и расстояния.
+
+Координаты извлекаются из ссылок Google Maps и Яндекс Карт без обращения
+к внешним сервисам. Короткие ссылки (maps.app.goo.gl, yandex.uz/maps/-/...)
+координат не содержат — для них широта и долгота вводятся в админке.
+"""
+
+import math
+import re
+from urllib.parse import parse_qs
+from urllib.parse import unquote
+from urllib.parse import urlsplit
+
+EARTH_RADIUS_KM = 6371.0088
+
+_NUMBER = r"(-?\d{1,3}(?:\.\d+)?)"
+_PAIR = re.compile(rf"^\s*{_NUMBER}\s*,\s*{_NUMBER}\s*$")
+# Google: .../@41.31,69.27,15z и ...!3d41.31!4d69.27 (точка метки приоритетнее центра карты)
+_GOOGLE_PIN = re.compile(rf"!3d{_NUMBER}!4d{_NUMBER}")
+_GOOGLE_CENTER = re.compile(rf"@{_NUMBER},{_NUMBER}")
+# Google: .../maps/place/41.31,69.27 и .../maps/search/41.31,+69.27
+_GOOGLE_PLACE = re.compile(rf"/(?:place|search)/{_NUMBER},\s*\+?{_NUMBER}(?:/|$)")
+# Параметры запроса с парой "широта,долгота" (Google) и "долгота,широта" (Яндекс)
+GOOGLE_PARAMS = ("q", "query", "ll", "destination", "center")
+YANDEX_PARAMS = ("pt", "whatshere[point]", "ll")
+
+
+def _valid(lat, lon):
+    if -90 <= lat <= 90 and -180 <= lon <= 180:
+        return lat, lon
+    return None
+
+
+def _pair(value, lon_first=False):
+    match = _PAIR.match(value.split("~")[0])
+    if not match:
+        return None
+    first, second = float(match.group(1)), float(match.group(2))
+    return _valid(second, first) if lon_first else _valid(first, second)
+
+
+def parse_map_coordinates(url):
+    """
+    (широта, долгота) из ссылки на карту или None.
+
+        parse_map_coordinates("https://www.google.com/maps/@41.3111,69.2797,15z") -> (41.3111, 69.2797)
+        parse_map_coordinates("https://yandex.uz/maps/?ll=69.2797,41.3111&z=15") -> (41.3111, 69.2797)
+    """
+    if not url:
+        return None
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    params = parse_qs(parts.query)
+    path = unquote(parts.path)
+
+    if "yandex" in host:
+        for name in YANDEX_PARAMS:
+            for value in params.get(name, ()):
+                if coordinates := _pair(value, lon_first=True):
+                    return coordinates
+        return None
+
+    for pattern in (_GOOGLE_PIN, _GOOGLE_PLACE, _GOOGLE_CENTER):
+        if match := pattern.search(path):
+            return _valid(float(match.group(1)), float(match.group(2)))
+    for name in GOOGLE_PARAMS:
+        for value in params.get(name, ()):
+            if coordinates := _pair(value):
+                return coordinates
+    return None
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Расстояние по дуге большого круга (км) между точками в градусах"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    a = (
+        math.sin((phi2 - phi1) / 2) ** 2
+        + math.cos(phi1) * math.cos(phi2) * math.sin(math.radians(lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
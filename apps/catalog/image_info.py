@@ -0,0 +1,119 @@
+"""
+Размеры, доминирующий цвет и LQIP-заглушка изображений каталога.
+
+Вычисляются один раз при сохранении изображения (post_save) из только что
+загруженного файла и хранятся в JSON-поле image_meta модели рядом с изображением:
+    {"photo": {"source": "photos/...jpg", "width": 1600, "height": 1067,
+               "color": "#a08c78", "lqip": "data:image/jpeg;base64,..."}}
+API и админка читают их оттуда, не открывая файлы.
+Поля изображений те же, что и для уменьшенных копий (RENDITION_FIELDS).
+"""
+
+import base64
+import logging
+from io import BytesIO
+
+from django.core.files.storage import default_storage
+from PIL import ExifTags
+from PIL import Image
+from PIL import ImageOps
+
+from apps.catalog.renditions import rendition_fields
+
+logger = logging.getLogger(__name__)
+
+# Размер заглушки (по большей стороне) и выборки для доминирующего цвета
+LQIP_SIZE = 16
+COLOR_SAMPLE_SIZE = 64
+COLOR_PALETTE_SIZE = 5
+# Значения EXIF Orientation, при которых ширина и высота меняются местами
+ROTATED_ORIENTATIONS = {5, 6, 7, 8}
+
+IMAGE_ERRORS = (OSError, ValueError, Image.DecompressionBombError)
+
+
+def _dominant_color(sample):
+    """Самый частый цвет палитры из COLOR_PALETTE_SIZE цветов"""
+    quantized = sample.quantize(colors=COLOR_PALETTE_SIZE)
+    _, index = max(quantized.getcolors())
+    red, green, blue = quantized.getpalette()[index * 3:index * 3 + 3]
+    return f"#{red:02x}{green:02x}{blue:02x}"
+
+
+def _lqip(sample):
+    placeholder = sample.copy()
+    placeholder.thumbnail((LQIP_SIZE, LQIP_SIZE))
+    buffer = BytesIO()
+    placeholder.save(buffer, "JPEG", quality=50)
+    return "data:image/jpeg;base64," + base64.b64encode(buffer.getvalue()).decode()
+
+
+def compute_image_info(file):
+    """
+    Ширина и высота (с учетом EXIF-поворота), доминирующий цвет и LQIP.
+    Для JPEG изображение декодируется в уменьшенном масштабе (draft).
+    """
+    with Image.open(file) as image:
+        width, height = image.size
+        if image.getexif().get(ExifTags.Base.Orientation) in ROTATED_ORIENTATIONS:
+            width, height = height, width
+        image.draft("RGB", (COLOR_SAMPLE_SIZE, COLOR_SAMPLE_SIZE))
+        sample = ImageOps.exif_transpose(image).convert("RGB")
+    sample.thumbnail((COLOR_SAMPLE_SIZE, COLOR_SAMPLE_SIZE))
+    return {
+        "width": width,
+        "height": height,
+        "color": _dominant_color(sample),
+        "lqip": _lqip(sample),
+    }
+
+
+def image_info_from_storage(name):
+    """compute_image_info для файла в хранилище (используется в пуле процессов бэкфилла)"""
+    with default_storage.open(name, "rb") as file:
+        return {"source": name, **compute_image_info(file)}
+
+
+def image_info(instance, field):
+    """Сохраненные данные изображения, если они относятся к текущему файлу, иначе None"""
+    field_file = getattr(instance, field)
+    info = (instance.image_meta or {}).get(field)
+    if not field_file or not info or info.get("source") != field_file.name:
+        return None
+    return info
+
+
+def image_info_outdated(instance, field):
+    field_file = getattr(instance, field)
+    if not field_file:
+        return field in (instance.image_meta or {})
+    return image_info(instance, field) is None
+
+
+def update_image_info(instance):
+    """
+    Пересчитывает данные для измененных полей изображений экземпляра
+    и сохраняет image_meta (без повторной отправки сигналов сохранения).
+    """
+    meta = dict(instance.image_meta or {})
+    changed = False
+    for field in rendition_fields(type(instance)):
+        if not image_info_outdated(instance, field):
+            continue
+        changed = True
+        field_file = getattr(instance, field)
+        meta.pop(field, None)
+        if not field_file:
+            continue
+        # Для только что загруженного файла читается сам загруженный объект, а не хранилище
+        field_file.open("rb")
+        try:
+            meta[field] = {"source": field_file.name, **compute_image_info(field_file)}
+        except IMAGE_ERRORS as e:
+            logger.warning("Image info for %s #%s %s failed: %s", instance._meta.label, instance.pk, field, e)
+        finally:
+            field_file.close()
+
+    if changed:
+        instance.image_meta = meta
+        type(instance)._default_manager.filter(pk=instance.pk).update(image_meta=meta)
@@ -0,0 +1,76 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import as_completed
+
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.db import models
+from django.db.models import F
+from django.db.models import Value
+
+from apps.catalog.cache import bump_generation
+from apps.catalog.image_info import IMAGE_ERRORS
+from apps.catalog.image_info import image_info_from_storage
+from apps.catalog.image_info import image_info_outdated
+from apps.catalog.renditions import RENDITION_FIELDS
+from apps.catalog.renditions import JSONBMerge
+
+
+class Command(BaseCommand):
+    help = 'Вычисляет размеры, доминирующий цвет и LQIP для уже загруженных изображений каталога'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=os.cpu_count() or 1,
+            help='Количество процессов для обработки изображений (по умолчанию — число CPU)',
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Пересчитать данные для всех изображений, а не только для отсутствующих',
+        )
+
+    def collect(self, force):
+        """(label, pk, field, имя файла) для изображений без актуальных данных"""
+        jobs = []
+        for label, fields in RENDITION_FIELDS.items():
+            model = apps.get_model(label)
+            for instance in model._default_manager.only('pk', 'image_meta', *fields).iterator():
+                for field in fields:
+                    field_file = getattr(instance, field)
+                    if field_file and (force or image_info_outdated(instance, field)):
+                        jobs.append((label, instance.pk, field, field_file.name))
+        return jobs
+
+    def handle(self, *args, **options):
+        jobs = self.collect(options['force'])
+        self.stdout.write(f'Изображений к обработке: {len(jobs)}')
+
+        processed = 0
+        updated_models = set()
+        # Процессы создаются через fork и наследуют настроенный Django (в том числе хранилище).
+        # Рабочие процессы только читают файлы и не обращаются к БД, в БД пишет этот процесс
+        context = multiprocessing.get_context('fork')
+        with ProcessPoolExecutor(max_workers=options['workers'], mp_context=context) as pool:
+            futures = {pool.submit(image_info_from_storage, name): job for *job, name in jobs}
+            for future in as_completed(futures):
+                label, pk, field = futures[future]
+                try:
+                    info = future.result()
+                except IMAGE_ERRORS as e:
+                    self.stdout.write(self.style.WARNING(f'{label} #{pk} {field}: {e}'))
+                    continue
+                model = apps.get_model(label)
+                # Запись только если за время обработки файл не заменили
+                model._default_manager.filter(pk=pk, **{field: info['source']}).update(
+                    image_meta=JSONBMerge(F('image_meta'), Value({field: info}, output_field=models.JSONField())),
+                )
+                updated_models.add(model)
+                processed += 1
+
+        for model in updated_models:
+            bump_generation(model)
+        self.stdout.write(self.style.SUCCESS(f'Обработано изображений: {processed}'))
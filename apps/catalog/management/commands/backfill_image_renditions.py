@@ -0,0 +1,48 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from PIL import Image
+
+from apps.catalog.renditions import RENDITION_FIELDS
+from apps.catalog.renditions import build_renditions
+from apps.catalog.renditions import renditions_outdated
+
+
+class Command(BaseCommand):
+    help = 'Генерирует уменьшенные копии (WebP/JPEG) для уже загруженных изображений каталога'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--async',
+            action='store_true',
+            dest='use_celery',
+            help='Ставить задачи в очередь Celery вместо генерации в текущем процессе',
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Обработать все изображения, а не только без актуальных копий '
+                 '(уже существующие файлы копий не пересоздаются)',
+        )
+
+    def handle(self, *args, **options):
+        from apps.catalog.tasks import generate_image_renditions
+
+        total = 0
+        for label, fields in RENDITION_FIELDS.items():
+            model = apps.get_model(label)
+            for instance in model._default_manager.only('pk', 'renditions', *fields).iterator():
+                for field in fields:
+                    if not options['force'] and not renditions_outdated(instance, field):
+                        continue
+                    if options['use_celery']:
+                        generate_image_renditions.delay(label, instance.pk, field)
+                    else:
+                        try:
+                            build_renditions(label, instance.pk, field)
+                        except (OSError, ValueError, Image.DecompressionBombError) as e:
+                            self.stdout.write(self.style.WARNING(f'{label} #{instance.pk} {field}: {e}'))
+                            continue
+                    total += 1
+
+        action = 'Поставлено в очередь' if options['use_celery'] else 'Обработано'
+        self.stdout.write(self.style.SUCCESS(f'{action} изображений: {total}'))
@@ -0,0 +1,26 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+
+from apps.catalog.export import export_api
+
+
+class Command(BaseCommand):
+    help = 'Экспортирует ответы публичных эндпоинтов API в JSON-файлы (с .gz), которые отдает nginx'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--root',
+            default=None,
+            help='Каталог экспорта (по умолчанию CATALOG_EXPORT_ROOT)',
+        )
+
+    def handle(self, *args, **options):
+        root = options['root'] or settings.CATALOG_EXPORT_ROOT
+        if not root:
+            raise CommandError('Не задан каталог экспорта: CATALOG_EXPORT_ROOT или --root')
+        version = export_api(root)
+        if version is None:
+            self.stdout.write(self.style.WARNING('Экспорт уже выполняется другим процессом'))
+            return
+        self.stdout.write(self.style.SUCCESS(f'Опубликована версия {version}'))
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.9 on 2026-10-17 20:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0042_homepage_instagram_section_text_en_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='carpet',
+            index=models.Index(condition=models.Q(('is_published', True)), fields=['-created_at', 'id'], name='carpet_pub_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='carpet',
+            index=models.Index(condition=models.Q(('is_published', True)), fields=['-watched', '-created_at', 'id'], name='carpet_pub_watched_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='instagrampost',
+            index=models.Index(condition=models.Q(('is_published', True)), fields=['-timestamp', 'id'], name='insta_pub_timestamp_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='news',
+            index=models.Index(condition=models.Q(('is_published', True)), fields=['-created_at', 'id'], name='news_pub_created_id_idx'),
+        ),
+    ]
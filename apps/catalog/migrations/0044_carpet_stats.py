@@ -0,0 +1,62 @@
+# Generated by Django 5.2.9 on 2026-10-17 20:49
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def copy_watched_to_stats(apps, schema_editor):
+    """Перенос счетчика просмотров из catalog_carpet в catalog_carpetstats"""
+    Carpet = apps.get_model("catalog", "Carpet")
+    CarpetStats = apps.get_model("catalog", "CarpetStats")
+    CarpetStats.objects.bulk_create(
+        [
+            CarpetStats(carpet_id=pk, watched=watched)
+            for pk, watched in Carpet.objects.values_list("pk", "watched").iterator()
+        ],
+        batch_size=1000,
+    )
+
+
+def copy_watched_to_carpet(apps, schema_editor):
+    Carpet = apps.get_model("catalog", "Carpet")
+    CarpetStats = apps.get_model("catalog", "CarpetStats")
+    for carpet_id, watched in CarpetStats.objects.values_list("carpet_id", "watched").iterator():
+        Carpet.objects.filter(pk=carpet_id).update(watched=watched)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0043_carpet_news_instagram_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CarpetStats',
+            fields=[
+                ('carpet', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='catalog.carpet', verbose_name='Ковер')),
+                ('watched', models.IntegerField(default=0, verbose_name='Просмотры')),
+                ('views_today', models.IntegerField(default=0, verbose_name='Просмотры за день')),
+                ('views_week', models.IntegerField(default=0, verbose_name='Просмотры за неделю')),
+                ('day', models.DateField(blank=True, null=True, verbose_name='День счетчика за день')),
+                ('week_start', models.DateField(blank=True, null=True, verbose_name='Начало недели счетчика за неделю')),
+            ],
+            options={
+                'verbose_name': 'Статистика ковра',
+                'verbose_name_plural': 'Статистика ковров',
+            },
+        ),
+        migrations.RunPython(copy_watched_to_stats, copy_watched_to_carpet),
+        migrations.RemoveIndex(
+            model_name='carpet',
+            name='carpet_pub_watched_id_idx',
+        ),
+        migrations.RemoveField(
+            model_name='carpet',
+            name='watched',
+        ),
+        migrations.AddIndex(
+            model_name='carpetstats',
+            index=models.Index(fields=['-watched', 'carpet'], name='carpetstats_watched_idx'),
+        ),
+    ]
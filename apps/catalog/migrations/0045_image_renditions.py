@@ -0,0 +1,43 @@
+# Generated by Django 5.2.9 on 2026-10-17 20:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0044_carpet_stats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='carpet',
+            name='renditions',
+            field=models.JSONField(blank=True, default=dict, editable=False, verbose_name='Уменьшенные копии изображений'),
+        ),
+        migrations.AddField(
+            model_name='carpetimage',
+            name='renditions',
+            field=models.JSONField(blank=True, default=dict, editable=False, verbose_name='Уменьшенные копии изображений'),
+        ),
+        migrations.AddField(
+            model_name='collection',
+            name='renditions',
+            field=models.JSONField(blank=True, default=dict, editable=False, verbose_name='Уменьшенные копии изображений'),
+        ),
+        migrations.AddField(
+            model_name='gallery',
+            name='renditions',
+            field=models.JSONField(blank=True, default=dict, editable=False, verbose_name='Уменьшенные копии изображений'),
+        ),
+        migrations.AddField(
+            model_name='maingallery',
+            name='renditions',
+            field=models.JSONField(blank=True, default=dict, editable=False, verbose_name='Уменьшенные копии изображений'),
+        ),
+        migrations.AddField(
+            model_name='news',
+            name='renditions',
+            field=models.JSONField(blank=True, default=dict, editable=False, verbose_name='Уменьшенные копии изображений'),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.9 on 2026-10-17 20:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0045_image_renditions'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='carpet',
+            name='image_meta',
+            field=models.JSONField(blank=True, default=dict, editable=False, verbose_name='Размеры и превью изображений'),
+        ),
+        migrations.AddField(
+            model_name='carpetimage',
+            name='image_meta',
+            field=models.JSONField(blank=True, default=dict, editable=False, verbose_name='Размеры и превью изображений'),
+        ),
+        migrations.AddField(
+            model_name='collection',
+            name='image_meta',
+            field=models.JSONField(blank=True, default=dict, editable=False, verbose_name='Размеры и превью изображений'),
+        ),
+        migrations.AddField(
+            model_name='gallery',
+            name='image_meta',
+            field=models.JSONField(blank=True, default=dict, editable=False, verbose_name='Размеры и превью изображений'),
+        ),
+        migrations.AddField(
+            model_name='maingallery',
+            name='image_meta',
+            field=models.JSONField(blank=True, default=dict, editable=False, verbose_name='Размеры и превью изображений'),
+        ),
+        migrations.AddField(
+            model_name='news',
+            name='image_meta',
+            field=models.JSONField(blank=True, default=dict, editable=False, verbose_name='Размеры и превью изображений'),
+        ),
+    ]
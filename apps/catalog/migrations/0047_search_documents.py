@@ -0,0 +1,125 @@
+# Generated by Django 5.2.9 on 2026-10-17 20:57
+
+from functools import reduce
+from operator import add
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations, models
+from django.db.models import F, Func, TextField, Value
+from django.db.models.functions import Coalesce
+
+# Триграммные индексы создаются, только если расширение pg_trgm доступно в сборке Postgres
+# (в образе postgres оно есть). Без него поиск работает без нечеткого сопоставления.
+TRIGRAM_INDEXES_SQL = """
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm') THEN
+        CREATE EXTENSION IF NOT EXISTS pg_trgm;
+        CREATE INDEX IF NOT EXISTS carpet_search_text_trgm_idx
+            ON catalog_carpet USING gin (search_text gin_trgm_ops);
+        CREATE INDEX IF NOT EXISTS collection_search_text_trgm_idx
+            ON catalog_collection USING gin (search_text gin_trgm_ops);
+        CREATE INDEX IF NOT EXISTS news_search_text_trgm_idx
+            ON catalog_news USING gin (search_text gin_trgm_ops);
+    END IF;
+END
+$$;
+"""
+
+DROP_TRIGRAM_INDEXES_SQL = """
+DROP INDEX IF EXISTS carpet_search_text_trgm_idx;
+DROP INDEX IF EXISTS collection_search_text_trgm_idx;
+DROP INDEX IF EXISTS news_search_text_trgm_idx;
+"""
+
+
+# Состав документов на момент этой миграции (копия, а не импорт apps.catalog.search:
+# последующие изменения поиска не должны влиять на применение старой миграции)
+LANGUAGE_CONFIGS = {'uz': 'simple', 'ru': 'russian', 'en': 'english'}
+SEARCH_DOCUMENTS = {
+    'Carpet': [('code', 'A', False), ('seo_title', 'C', True)],
+    'Collection': [('name', 'A', True), ('seo_title', 'C', True), ('description', 'D', True)],
+    'News': [('title', 'A', True), ('seo_title', 'C', True)],
+}
+
+
+def fill_search_documents(apps, schema_editor):
+    for model_name, document in SEARCH_DOCUMENTS.items():
+        model = apps.get_model('catalog', model_name)
+        vector = reduce(add, [
+            SearchVector(
+                f'{field}_{language}',
+                config=config if stemmed else 'simple',
+                weight=weight,
+            )
+            for field, weight, stemmed in document
+            for language, config in LANGUAGE_CONFIGS.items()
+        ])
+        columns = [
+            Coalesce(F(f'{field}_{language}'), Value(''))
+            for field, weight, _ in document
+            if weight == 'A'
+            for language in LANGUAGE_CONFIGS
+        ]
+        text = Func(
+            Func(Value(' '), *columns, function='CONCAT_WS', output_field=TextField()),
+            function='LOWER',
+            output_field=TextField(),
+        )
+        model.objects.update(search_vector=vector, search_text=text)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0046_image_meta'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='carpet',
+            name='search_text',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='carpet',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='collection',
+            name='search_text',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='collection',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='news',
+            name='search_text',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='news',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='carpet',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='carpet_search_vector_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='collection',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='collection_search_vector_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='news',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='news_search_vector_idx'),
+        ),
+        migrations.RunSQL(TRIGRAM_INDEXES_SQL, DROP_TRIGRAM_INDEXES_SQL),
+        migrations.RunPython(fill_search_documents, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.9 on 2026-10-17 21:30
+
+from django.db import migrations
+
+# Промежуточные таблицы M2M ковров создаются Django автоматически, поэтому индексы
+# задаются SQL. Уникальный индекс (carpet_id, <справочник>_id) уже есть и обслуживает
+# проверку EXISTS для конкретного ковра; обратный (<справочник>_id, carpet_id) позволяет
+# выбирать ковры по значению фильтра и считать фасеты сканированием только индекса.
+M2M_TABLES = [
+    ("catalog_carpet_styles", "style_id"),
+    ("catalog_carpet_rooms", "room_id"),
+    ("catalog_carpet_colors", "color_id"),
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0047_search_documents'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=f"CREATE INDEX IF NOT EXISTS {table}_rev_idx ON {table} ({column}, carpet_id);",
+            reverse_sql=f"DROP INDEX IF EXISTS {table}_rev_idx;",
+        )
+        for table, column in M2M_TABLES
+    ]
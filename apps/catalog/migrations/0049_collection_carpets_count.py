@@ -0,0 +1,34 @@
+# Generated by Django 5.2.9 on 2026-10-17 21:13
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def fill_carpets_count(apps, schema_editor):
+    Carpet = apps.get_model('catalog', 'Carpet')
+    Collection = apps.get_model('catalog', 'Collection')
+    published = (
+        Carpet.objects.filter(collection=OuterRef('pk'), is_published=True)
+        .order_by()
+        .values('collection')
+        .annotate(count=Count('pk'))
+        .values('count')
+    )
+    Collection.objects.update(carpets_count=Coalesce(Subquery(published), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0048_carpet_m2m_reverse_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='collection',
+            name='carpets_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Опубликованных ковров'),
+        ),
+        migrations.RunPython(fill_carpets_count, migrations.RunPython.noop),
+    ]
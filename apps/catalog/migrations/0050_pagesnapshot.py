@@ -0,0 +1,29 @@
+# Generated by Django 5.2.9 on 2026-10-17 21:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0049_collection_carpets_count'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PageSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, verbose_name='Страница')),
+                ('language', models.CharField(max_length=5, verbose_name='Язык')),
+                ('content', models.BinaryField(verbose_name='JSON')),
+                ('digest', models.CharField(max_length=32, verbose_name='Хэш содержимого')),
+                ('updated_at', models.DateTimeField(verbose_name='Дата обновления')),
+            ],
+            options={
+                'verbose_name': 'Снапшот страницы',
+                'verbose_name_plural': 'Снапшоты страниц',
+                'constraints': [models.UniqueConstraint(fields=('name', 'language'), name='page_snapshot_name_language_uniq')],
+            },
+        ),
+    ]
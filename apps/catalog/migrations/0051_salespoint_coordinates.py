@@ -0,0 +1,41 @@
+# Generated by Django 5.2.9 on 2026-10-17 21:28
+
+from django.db import migrations, models
+
+from apps.catalog.geo import parse_map_coordinates
+
+
+def fill_coordinates(apps, schema_editor):
+    SalesPoint = apps.get_model('catalog', 'SalesPoint')
+    points = []
+    for point in SalesPoint.objects.exclude(map_link__isnull=True).exclude(map_link='').only('pk', 'map_link'):
+        coordinates = parse_map_coordinates(point.map_link)
+        if coordinates is not None:
+            point.latitude, point.longitude = coordinates
+            points.append(point)
+    SalesPoint.objects.bulk_update(points, ['latitude', 'longitude'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0050_pagesnapshot'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='salespoint',
+            name='latitude',
+            field=models.FloatField(blank=True, help_text='Заполняется автоматически из ссылки на карту; для коротких ссылок укажите вручную', null=True, verbose_name='Широта'),
+        ),
+        migrations.AddField(
+            model_name='salespoint',
+            name='longitude',
+            field=models.FloatField(blank=True, help_text='Заполняется автоматически из ссылки на карту; для коротких ссылок укажите вручную', null=True, verbose_name='Долгота'),
+        ),
+        migrations.AddIndex(
+            model_name='salespoint',
+            index=models.Index(fields=['latitude', 'longitude'], name='sales_point_coordinates_idx'),
+        ),
+        migrations.RunPython(fill_coordinates, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.9 on 2026-10-17 21:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0052_telegramnotification'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CarpetViewsFlush',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('flush_id', models.CharField(max_length=32, unique=True, verbose_name='ID переноса')),
+                ('applied_at', models.DateTimeField(auto_now_add=True, verbose_name='Дата применения')),
+            ],
+            options={
+                'verbose_name': 'Перенос просмотров',
+                'verbose_name_plural': 'Переносы просмотров',
+            },
+        ),
+    ]
@@ -1,11 +1,19 @@
+from datetime import timedelta
+
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.core.exceptions import ValidationError
 from django.db import models
+from django.db.models.functions import Coalesce
 from django.urls import reverse
+from django.utils import timezone
 from django.utils.text import slugify
 import os
 import re
 import random
 
+from apps.catalog.geo import parse_map_coordinates
+
 
 def generate_unique_slug(model_class, source_text, current_pk=None, current_slug=None):
     """
@@ -131,11 +139,19 @@ class Collection(models.Model):
     name = models.CharField(max_length=50, verbose_name='Категория')
     description = models.TextField(default='Описания коллекции', verbose_name='Описания', blank=True, null=True)
     image = models.ImageField(upload_to='photos/collection_avatar/%Y/%m/', verbose_name='photo Коллекции')
+    renditions = models.JSONField(default=dict, blank=True, editable=False, verbose_name='Уменьшенные копии изображений')
+    image_meta = models.JSONField(default=dict, blank=True, editable=False, verbose_name='Размеры и превью изображений')
     is_published = models.BooleanField(default=True, verbose_name='Публикация')
     slug = models.SlugField(unique=True, null=True, blank=True, verbose_name='Slug', editable=False)
     created_at = models.DateTimeField(auto_now_add=True, verbose_name='Дата создания')
     update_at = models.DateTimeField(auto_now=True, verbose_name='Дата обновления')
+    # Поиск (apps.catalog.search), обновляются сигналом post_save
+    search_vector = SearchVectorField(null=True, editable=False)
+    search_text = models.TextField(blank=True, default='', editable=False)
     is_new = models.BooleanField(default=False, verbose_name='Новая коллекция')
+    # Количество опубликованных ковров (денормализовано для списков коллекций и админки).
+    # Пересчитывается при создании, публикации, снятии с публикации, переносе и удалении ковра
+    carpets_count = models.PositiveIntegerField(default=0, editable=False, verbose_name='Опубликованных ковров')
     
     # SEO поля
     seo_title = models.CharField(
@@ -174,7 +190,25 @@ class Collection(models.Model):
             if need_update_slug:
                 self.slug = generate_unique_slug(Collection, source_name, self.pk)
         
+        creating = self._state.adding
         super().save(*args, **kwargs)
+        if not creating:
+            # Сохранение перезаписывает carpets_count значением, загруженным вместе с объектом
+            Collection.refresh_carpets_count(self.pk)
+
+    @classmethod
+    def refresh_carpets_count(cls, *pks):
+        """Пересчитывает carpets_count коллекций одним UPDATE"""
+        published = (
+            Carpet.objects.filter(collection=models.OuterRef('pk'), is_published=True)
+            .order_by()
+            .values('collection')
+            .annotate(count=models.Count('pk'))
+            .values('count')
+        )
+        cls.objects.filter(pk__in=pks).update(
+            carpets_count=Coalesce(models.Subquery(published), 0),
+        )
 
     def __str__(self):
         return self.name
@@ -185,6 +219,9 @@ class Collection(models.Model):
     class Meta:
         verbose_name = 'Коллекция'
         verbose_name_plural = 'Коллекции'
+        indexes = [
+            GinIndex(fields=['search_vector'], name='collection_search_vector_idx'),
+        ]
 
 
 # Функция для определения пути загрузки изображений
@@ -370,11 +407,15 @@ class Carpet(models.Model):
     created_at = models.DateTimeField(auto_now_add=True, verbose_name='Дата создания')
     update_at = models.DateTimeField(auto_now=True, verbose_name='Дата обновления')
     photo = models.ImageField(upload_to=carpet_image_upload_to, blank=True, null=True, verbose_name='Изображения')
-    watched = models.IntegerField(default=0, verbose_name='Просмотры')
+    renditions = models.JSONField(default=dict, blank=True, editable=False, verbose_name='Уменьшенные копии изображений')
+    image_meta = models.JSONField(default=dict, blank=True, editable=False, verbose_name='Размеры и превью изображений')
     is_published = models.BooleanField(default=True, verbose_name='Публикация')
     collection = models.ForeignKey(Collection, on_delete=models.CASCADE, verbose_name='Коллекция',
                                    related_name='carpets')
     roll = models.BooleanField(default=False, verbose_name='Рулон')
+    # Поиск (apps.catalog.search), обновляются сигналом post_save
+    search_vector = SearchVectorField(null=True, editable=False)
+    search_text = models.TextField(blank=True, default='', editable=False)
     
     # Флаги для фильтрации
     is_new = models.BooleanField(default=False, verbose_name='Новый')
@@ -411,7 +452,24 @@ class Carpet(models.Model):
             self.code = code_value
             if hasattr(self, 'code_uz'):
                 self.code_uz = code_value
+        creating = self._state.adding
         super(Carpet, self).save(*args, **kwargs)
+        if creating:
+            CarpetStats.objects.get_or_create(carpet=self)
+
+        # Пересчет Collection.carpets_count для старой и новой коллекции
+        counted = (self.collection_id, self.is_published)
+        previous = getattr(self, '_counted_state', (None, None))
+        if creating or counted != previous:
+            Collection.refresh_carpets_count(*{self.collection_id, previous[0]} - {None})
+        self._counted_state = counted
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Значения из БД, от которых зависит Collection.carpets_count (None для отложенных полей)
+        instance._counted_state = (instance.__dict__.get('collection_id'), instance.__dict__.get('is_published'))
+        return instance
 
     def __str__(self):
         return self.code or f'Ковер #{self.id}'
@@ -420,6 +478,71 @@ class Carpet(models.Model):
         verbose_name = 'Ковер'
         verbose_name_plural = 'Ковры'
         ordering = ['-created_at']
+        indexes = [
+            # Составные ключи keyset-пагинации: сортировка по умолчанию и sort=popular
+            models.Index(
+                fields=['-created_at', 'id'],
+                condition=models.Q(is_published=True),
+                name='carpet_pub_created_id_idx',
+            ),
+            GinIndex(fields=['search_vector'], name='carpet_search_vector_idx'),
+        ]
+
+
+# Счетчики просмотров ковра. Вынесены из Carpet в узкую таблицу, чтобы частые
+# обновления счетчиков не переписывали широкие строки catalog_carpet
+class CarpetStats(models.Model):
+    carpet = models.OneToOneField(
+        Carpet,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='stats',
+        verbose_name='Ковер',
+    )
+    watched = models.IntegerField(default=0, verbose_name='Просмотры')
+    views_today = models.IntegerField(default=0, verbose_name='Просмотры за день')
+    views_week = models.IntegerField(default=0, verbose_name='Просмотры за неделю')
+    day = models.DateField(null=True, blank=True, verbose_name='День счетчика за день')
+    week_start = models.DateField(null=True, blank=True, verbose_name='Начало недели счетчика за неделю')
+
+    def __str__(self):
+        return f'Статистика {self.carpet_id}'
+
+    @staticmethod
+    def current_periods():
+        """Текущий день и понедельник текущей недели (в TIME_ZONE проекта)"""
+        today = timezone.localdate()
+        return today, today - timedelta(days=today.weekday())
+
+    def current_views_today(self):
+        today, _ = self.current_periods()
+        return self.views_today if self.day == today else 0
+
+    def current_views_week(self):
+        _, week_start = self.current_periods()
+        return self.views_week if self.week_start == week_start else 0
+
+    class Meta:
+        verbose_name = 'Статистика ковра'
+        verbose_name_plural = 'Статистика ковров'
+        indexes = [
+            models.Index(fields=['-watched', 'carpet'], name='carpetstats_watched_idx'),
+        ]
+
+
+# Уже примененные переносы просмотров из Redis (см. apps.catalog.counters.flush_carpet_views).
+# Запись создается в одной транзакции с прибавлением дельт, поэтому повторный
+# перенос того же буфера после сбоя ничего не прибавляет
+class CarpetViewsFlush(models.Model):
+    flush_id = models.CharField(max_length=32, unique=True, verbose_name='ID переноса')
+    applied_at = models.DateTimeField(auto_now_add=True, verbose_name='Дата применения')
+
+    def __str__(self):
+        return self.flush_id
+
+    class Meta:
+        verbose_name = 'Перенос просмотров'
+        verbose_name_plural = 'Переносы просмотров'
 
 
 # Модель для изображений галереи ковра
@@ -435,6 +558,8 @@ class CarpetImage(models.Model):
         upload_to=carpet_gallery_upload_to,
         verbose_name='Изображение'
     )
+    renditions = models.JSONField(default=dict, blank=True, editable=False, verbose_name='Уменьшенные копии изображений')
+    image_meta = models.JSONField(default=dict, blank=True, editable=False, verbose_name='Размеры и превью изображений')
     order = models.PositiveIntegerField(default=0, verbose_name='Порядок сортировки')
     created_at = models.DateTimeField(auto_now_add=True, verbose_name='Дата создания')
     
@@ -481,6 +606,9 @@ class NewsImage(models.Model):
 class News(models.Model):
     title = models.CharField(max_length=200, verbose_name='Заголовок')
     slug = models.SlugField(unique=True, null=True, blank=True, verbose_name='Slug', editable=False)
+    # Поиск (apps.catalog.search), обновляются сигналом post_save
+    search_vector = SearchVectorField(null=True, editable=False)
+    search_text = models.TextField(blank=True, default='', editable=False)
     
     # Обложка
     cover_image = models.ImageField(
@@ -490,6 +618,8 @@ class News(models.Model):
         null=True,
         help_text='Главное изображение новости'
     )
+    renditions = models.JSONField(default=dict, blank=True, editable=False, verbose_name='Уменьшенные копии изображений')
+    image_meta = models.JSONField(default=dict, blank=True, editable=False, verbose_name='Размеры и превью изображений')
     
     # Абзацы с форматированием (CKEditor)
     paragraph_1 = models.TextField(
@@ -578,6 +708,14 @@ class News(models.Model):
         verbose_name = 'Новость'
         verbose_name_plural = 'Новости'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(
+                fields=['-created_at', 'id'],
+                condition=models.Q(is_published=True),
+                name='news_pub_created_id_idx',
+            ),
+            GinIndex(fields=['search_vector'], name='news_search_vector_idx'),
+        ]
 
     def get_absolute_url(self):
         return reverse('catalog:news_detail', kwargs={'news_slug': self.slug})
@@ -589,6 +727,8 @@ class News(models.Model):
 class Gallery(models.Model):
     title = models.CharField(max_length=200, blank=True, null=True, verbose_name='Название')
     image = models.ImageField(upload_to='photos/gallery/%Y/%m/', verbose_name='Изображение')
+    renditions = models.JSONField(default=dict, blank=True, editable=False, verbose_name='Уменьшенные копии изображений')
+    image_meta = models.JSONField(default=dict, blank=True, editable=False, verbose_name='Размеры и превью изображений')
     is_published = models.BooleanField(default=True, verbose_name='Публикация')
     created_at = models.DateTimeField(auto_now_add=True, verbose_name='Дата создания')
     order = models.PositiveIntegerField(default=0, verbose_name='Порядок сортировки')
@@ -680,6 +820,8 @@ class MainGallery(models.Model):
         null=True,
         verbose_name="Изображение 12",
     )
+    renditions = models.JSONField(default=dict, blank=True, editable=False, verbose_name="Уменьшенные копии изображений")
+    image_meta = models.JSONField(default=dict, blank=True, editable=False, verbose_name="Размеры и превью изображений")
 
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="Дата создания")
     update_at = models.DateTimeField(auto_now=True, verbose_name="Дата обновления")
@@ -1255,11 +1397,48 @@ class SalesPoint(models.Model):
         verbose_name='Ссылка на карту',
         help_text='Ссылка на Google Maps или Яндекс.Карты'
     )
+    latitude = models.FloatField(
+        blank=True,
+        null=True,
+        verbose_name='Широта',
+        help_text='Заполняется автоматически из ссылки на карту; для коротких ссылок укажите вручную'
+    )
+    longitude = models.FloatField(
+        blank=True,
+        null=True,
+        verbose_name='Долгота',
+        help_text='Заполняется автоматически из ссылки на карту; для коротких ссылок укажите вручную'
+    )
     
     # Дополнительно
     order = models.PositiveIntegerField(default=0, verbose_name='Порядок сортировки')
     is_published = models.BooleanField(default=True, verbose_name='Публикация')
     
+    def save(self, *args, **kwargs):
+        # Координаты берутся из новой ссылки на карту, а если их нет — из текущей.
+        # Введенные в админке вручную координаты (изменены в этом же сохранении) не перезаписываются
+        loaded_link, loaded_latitude, loaded_longitude = getattr(self, '_loaded_location', (None, None, None))
+        link_changed = self.map_link != loaded_link
+        edited = (self.latitude, self.longitude) != (loaded_latitude, loaded_longitude)
+        if not edited and (link_changed or self.latitude is None or self.longitude is None):
+            coordinates = parse_map_coordinates(self.map_link)
+            if coordinates is not None:
+                self.latitude, self.longitude = coordinates
+            elif link_changed:
+                # Из новой ссылки координаты не извлекаются, старые указывали бы на прежнее место
+                self.latitude = self.longitude = None
+        super().save(*args, **kwargs)
+        self._loaded_location = (self.map_link, self.latitude, self.longitude)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Значения из БД, по которым save() определяет, что изменилось (None для отложенных полей)
+        instance._loaded_location = tuple(
+            instance.__dict__.get(field) for field in ('map_link', 'latitude', 'longitude')
+        )
+        return instance
+
     def __str__(self):
         return f"{self.name} - {self.region.name}"
     
@@ -1267,6 +1446,9 @@ class SalesPoint(models.Model):
         verbose_name = 'Торговая точка'
         verbose_name_plural = 'Торговые точки'
         ordering = ['region__order', 'order', 'name']
+        indexes = [
+            models.Index(fields=['latitude', 'longitude'], name='sales_point_coordinates_idx'),
+        ]
 
 
 # Модель для формы заявки
@@ -1601,6 +1783,11 @@ class InstagramPost(models.Model):
             models.Index(fields=['instagram_id']),
             models.Index(fields=['-timestamp']),
             models.Index(fields=['is_published', '-timestamp']),
+            models.Index(
+                fields=['-timestamp', 'id'],
+                condition=models.Q(is_published=True),
+                name='insta_pub_timestamp_id_idx',
+            ),
         ]
 
 
@@ -1655,3 +1842,57 @@ class DealerRequest(models.Model):
             models.Index(fields=['-created_at']),
             models.Index(fields=['is_processed', '-created_at']),
         ]
+
+
+# Предрендеренные JSON-ответы API страниц-синглтонов (см. apps.catalog.api.snapshots).
+# Основная копия хранится в кэше (Redis), таблица — резервная на случай его очистки
+class PageSnapshot(models.Model):
+    name = models.CharField(max_length=50, verbose_name='Страница')
+    language = models.CharField(max_length=5, verbose_name='Язык')
+    content = models.BinaryField(verbose_name='JSON')
+    digest = models.CharField(max_length=32, verbose_name='Хэш содержимого')
+    updated_at = models.DateTimeField(verbose_name='Дата обновления')
+
+    def __str__(self):
+        return f'{self.name} ({self.language})'
+
+    class Meta:
+        verbose_name = 'Снапшот страницы'
+        verbose_name_plural = 'Снапшоты страниц'
+        constraints = [
+            models.UniqueConstraint(fields=['name', 'language'], name='page_snapshot_name_language_uniq'),
+        ]
+
+
+# Очередь уведомлений о заявках в Telegram (transactional outbox, см. apps.catalog.outbox).
+# Запись создается в транзакции заявки, отправкой занимается Celery beat
+class TelegramNotification(models.Model):
+    FORM_TYPE_CHOICES = [
+        ('contact', 'Обратная связь'),
+        ('dealer', 'Дилерство'),
+    ]
+    STATUS_CHOICES = [
+        ('pending', 'Ожидает отправки'),
+        ('sent', 'Отправлено'),
+        ('failed', 'Не отправлено'),
+    ]
+
+    form_type = models.CharField(max_length=20, choices=FORM_TYPE_CHOICES, verbose_name='Форма')
+    payload = models.JSONField(verbose_name='Данные заявки')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending', verbose_name='Статус')
+    attempts = models.PositiveSmallIntegerField(default=0, verbose_name='Попыток отправки')
+    next_attempt_at = models.DateTimeField(default=timezone.now, verbose_name='Следующая попытка')
+    last_error = models.TextField(blank=True, verbose_name='Последняя ошибка')
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='Дата создания')
+    sent_at = models.DateTimeField(blank=True, null=True, verbose_name='Дата отправки')
+
+    def __str__(self):
+        return f'{self.get_form_type_display()} #{self.pk} ({self.get_status_display()})'
+
+    class Meta:
+        verbose_name = 'Уведомление в Telegram'
+        verbose_name_plural = 'Уведомления в Telegram'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='telegram_notification_due_idx'),
+        ]
@@ -0,0 +1,140 @@
+"""
+Очередь уведомлений о заявках в Telegram (transactional outbox).
+
+Запрос формы только добавляет строку TelegramNotification в своей транзакции
+(ATOMIC_REQUESTS): заявка и уведомление сохраняются или откатываются вместе,
+а запрос не ждет ни брокер Celery, ни Telegram.
+
+Очередь разбирает задача drain_telegram_outbox по расписанию Celery beat
+(TELEGRAM_OUTBOX_INTERVAL). Все накопившиеся заявки уходят одним
+сообщением-дайджестом (в пределах лимита длины сообщения Telegram), за один
+запуск отправляется не больше TELEGRAM_OUTBOX_MESSAGES_PER_RUN сообщений
+с паузой TELEGRAM_OUTBOX_MESSAGE_INTERVAL между ними — это держит отправку
+в пределах лимитов Telegram для одного чата. Ответ 429 откладывает всю очередь
+на retry_after, остальные ошибки — отправленные уведомления с экспоненциальной
+задержкой; после TELEGRAM_OUTBOX_MAX_ATTEMPTS попыток уведомление помечается
+неотправленным (видно в админке).
+
+Доставка «хотя бы один раз»: если воркер упадет между ответом Telegram
+и записью статуса, сообщение будет отправлено повторно.
+"""
+
+import logging
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F
+from django.utils import timezone
+
+from apps.catalog.models import TelegramNotification
+from apps.catalog.telegram_notify import MESSAGE_MAX_LENGTH
+from apps.catalog.telegram_notify import TelegramError
+from apps.catalog.telegram_notify import format_application
+from apps.catalog.telegram_notify import send_telegram_message
+from apps.catalog.telegram_notify import telegram_configured
+
+logger = logging.getLogger(__name__)
+
+OUTBOX_LOCK_KEY = "catalog:telegram-outbox:lock"
+OUTBOX_LOCK_TIMEOUT = 5 * 60
+DIGEST_SEPARATOR = "\n\n"
+
+
+def queue_notification(form_type, payload):
+    """Ставит уведомление о заявке в очередь (в текущей транзакции)"""
+    return TelegramNotification.objects.create(form_type=form_type, payload=payload)
+
+
+def retry_delay(attempts):
+    """Задержка перед следующей попыткой (в секундах) после attempts неудачных"""
+    delay = settings.TELEGRAM_OUTBOX_RETRY_DELAY * 2 ** (attempts - 1)
+    return min(delay, settings.TELEGRAM_OUTBOX_MAX_RETRY_DELAY)
+
+
+def build_digest(notifications):
+    """
+    Текст сообщения и уведомления, которые в него вошли.
+    Несколько заявок объединяются под общим заголовком, пока текст помещается в одно сообщение.
+    """
+    texts = [format_application(item.form_type, item.payload)[:MESSAGE_MAX_LENGTH] for item in notifications]
+    if len(texts) == 1:
+        return texts[0], list(notifications)
+
+    def digest(count):
+        header = f"📬 <b>Новые заявки: {count}</b>"
+        return DIGEST_SEPARATOR.join([header, *texts[:count]])
+
+    count = len(texts)
+    while count > 1 and len(digest(count)) > MESSAGE_MAX_LENGTH:
+        count -= 1
+    if count == 1:
+        return texts[0], list(notifications[:1])
+    return digest(count), list(notifications[:count])
+
+
+def due_notifications():
+    return list(
+        TelegramNotification.objects.filter(status="pending", next_attempt_at__lte=timezone.now())
+        .order_by("id")[:settings.TELEGRAM_OUTBOX_BATCH_SIZE]
+    )
+
+
+def mark_sent(notifications):
+    TelegramNotification.objects.filter(pk__in=[item.pk for item in notifications]).update(
+        status="sent", sent_at=timezone.now(), attempts=F("attempts") + 1, last_error="",
+    )
+
+
+def postpone_all(seconds):
+    """Telegram просит подождать: вся очередь откладывается без учета попытки"""
+    until = timezone.now() + timedelta(seconds=seconds)
+    TelegramNotification.objects.filter(status="pending", next_attempt_at__lt=until).update(next_attempt_at=until)
+
+
+def mark_failed_attempt(notifications, error):
+    now = timezone.now()
+    for item in notifications:
+        item.attempts += 1
+        item.last_error = str(error)
+        if item.attempts >= settings.TELEGRAM_OUTBOX_MAX_ATTEMPTS:
+            item.status = "failed"
+        else:
+            item.next_attempt_at = now + timedelta(seconds=retry_delay(item.attempts))
+    TelegramNotification.objects.bulk_update(notifications, ["attempts", "last_error", "status", "next_attempt_at"])
+
+
+def drain_outbox():
+    """
+    Отправляет накопившиеся уведомления. Возвращает число доставленных заявок
+    (None, если очередь уже разбирает другой воркер или Telegram не настроен).
+    """
+    if not telegram_configured():
+        logger.warning("Telegram outbox skipped: TELEGRAM_BOT_TOKEN or TELEGRAM_CHAT_ID not set")
+        return None
+    if not cache.add(OUTBOX_LOCK_KEY, True, timeout=OUTBOX_LOCK_TIMEOUT):
+        return None
+    try:
+        delivered = 0
+        for number in range(settings.TELEGRAM_OUTBOX_MESSAGES_PER_RUN):
+            notifications = due_notifications()
+            if not notifications:
+                break
+            if number:
+                time.sleep(settings.TELEGRAM_OUTBOX_MESSAGE_INTERVAL)
+            text, included = build_digest(notifications)
+            try:
+                send_telegram_message(text)
+            except TelegramError as error:
+                logger.warning("Telegram outbox: %s", error)
+                if error.retry_after is not None:
+                    postpone_all(error.retry_after)
+                else:
+                    mark_failed_attempt(included, error)
+                break
+            mark_sent(included)
+            delivered += len(included)
+        return delivered
+    finally:
+        cache.delete(OUTBOX_LOCK_KEY)
@@ -0,0 +1,181 @@
+"""
+Уменьшенные копии (renditions) изображений каталога.
+
+После сохранения изображения Celery-задача генерирует копии фиксированной
+ширины в WebP и JPEG. Файлы лежат в renditions/<hash[:2]>/<hash>/<width>.<ext>,
+где hash — sha256 содержимого исходного файла, поэтому повторная генерация
+для того же содержимого ничего не пересоздает, а одинаковые загрузки
+используют общие файлы.
+
+В JSON-поле renditions модели хранится, для какого файла и каких ширин копии готовы:
+    {"photo": {"source": "photos/...jpg", "hash": "...", "widths": [320, 640]}}
+"""
+
+import hashlib
+from io import BytesIO
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import models
+from django.db import transaction
+from django.db.models import F
+from django.db.models import Func
+from django.db.models import Q
+from django.db.models import Value
+from PIL import Image
+from PIL import ImageOps
+
+from apps.catalog.cache import bump_generation
+
+RENDITIONS_DIR = "renditions"
+
+# Модель -> поля изображений, для которых генерируются копии
+RENDITION_FIELDS = {
+    "catalog.carpet": ("photo",),
+    "catalog.carpetimage": ("image",),
+    "catalog.collection": ("image",),
+    "catalog.news": ("cover_image",),
+    "catalog.gallery": ("image",),
+    "catalog.maingallery": tuple(f"image_{number}" for number in range(1, 13)),
+}
+
+# Формат -> (расширение, формат Pillow, параметры сохранения)
+RENDITION_FORMATS = {
+    "webp": ("webp", "WEBP", {"quality": 80, "method": 4}),
+    "jpeg": ("jpg", "JPEG", {"quality": 82, "optimize": True, "progressive": True}),
+}
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+class JSONBMerge(Func):
+    """jsonb || jsonb: добавляет/заменяет ключи верхнего уровня без гонок с другими полями"""
+    template = "%(expressions)s"
+    arg_joiner = " || "
+    output_field = models.JSONField()
+
+
+class JSONBDeleteKey(Func):
+    """jsonb - text: удаляет ключ верхнего уровня"""
+    template = "%(expressions)s"
+    arg_joiner = " - "
+    output_field = models.JSONField()
+
+
+def rendition_fields(model):
+    return RENDITION_FIELDS.get(model._meta.label_lower, ())
+
+
+def rendition_path(digest, width, fmt):
+    extension = RENDITION_FORMATS[fmt][0]
+    return f"{RENDITIONS_DIR}/{digest[:2]}/{digest}/{width}.{extension}"
+
+
+def content_hash(field_file):
+    digest = hashlib.sha256()
+    field_file.open("rb")
+    try:
+        for chunk in field_file.chunks(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    finally:
+        field_file.close()
+    return digest.hexdigest()
+
+
+def rendition_widths(original_width):
+    """Ширины копий: без увеличения, узкие исходники получают одну копию в исходной ширине"""
+    widths = [width for width in settings.CATALOG_IMAGE_RENDITION_WIDTHS if width < original_width]
+    return widths or [original_width]
+
+
+def _encode(image, fmt):
+    _, pillow_format, options = RENDITION_FORMATS[fmt]
+    if pillow_format == "JPEG" and image.mode != "RGB":
+        image = image.convert("RGB")
+    buffer = BytesIO()
+    image.save(buffer, pillow_format, **options)
+    return ContentFile(buffer.getvalue())
+
+
+def generate_renditions(field_file, digest):
+    """Создает недостающие файлы копий и возвращает список их ширин"""
+    field_file.open("rb")
+    try:
+        with Image.open(field_file) as source:
+            image = ImageOps.exif_transpose(source)
+            if image.mode not in ("RGB", "RGBA"):
+                image = image.convert("RGBA" if "transparency" in image.info else "RGB")
+            widths = rendition_widths(image.width)
+            for width in widths:
+                paths = {fmt: rendition_path(digest, width, fmt) for fmt in RENDITION_FORMATS}
+                missing = [fmt for fmt, path in paths.items() if not default_storage.exists(path)]
+                if not missing:
+                    continue
+                height = max(1, round(image.height * width / image.width))
+                resized = image.resize((width, height), Image.Resampling.LANCZOS)
+                for fmt in missing:
+                    default_storage.save(paths[fmt], _encode(resized, fmt))
+    finally:
+        field_file.close()
+    return widths
+
+
+def renditions_outdated(instance, field):
+    """Нужно ли (пере)генерировать копии: файл сменился, появился или удален"""
+    field_file = getattr(instance, field)
+    meta = (instance.renditions or {}).get(field)
+    if not field_file:
+        return meta is not None
+    return meta is None or meta.get("source") != field_file.name
+
+
+def schedule_renditions(instance):
+    """Ставит генерацию копий для измененных полей изображений после коммита"""
+    from apps.catalog.tasks import generate_image_renditions
+
+    label = instance._meta.label_lower
+    for field in rendition_fields(type(instance)):
+        if renditions_outdated(instance, field):
+            transaction.on_commit(
+                lambda field=field: generate_image_renditions.delay(label, instance.pk, field),
+            )
+
+
+def build_renditions(label, pk, field):
+    """
+    Генерирует копии для поля изображения и записывает результат в instance.renditions.
+
+    Запись выполняется только если в БД все еще тот же файл: результат
+    устаревшей задачи не перезапишет данные для новой загрузки.
+    """
+    from apps.catalog.api.snapshots import invalidate_snapshots
+    from apps.catalog.export import schedule_export
+
+    model = apps.get_model(label)
+    instance = model._default_manager.filter(pk=pk).first()
+    if instance is None:
+        return
+    field_file = getattr(instance, field)
+
+    if not field_file:
+        queryset = model._default_manager.filter(
+            Q(**{field: ""}) | Q(**{f"{field}__isnull": True}), pk=pk,
+        )
+        updated = queryset.update(renditions=JSONBDeleteKey(F("renditions"), Value(field)))
+    else:
+        digest = content_hash(field_file)
+        meta = {
+            "source": field_file.name,
+            "hash": digest,
+            "widths": generate_renditions(field_file, digest),
+        }
+        queryset = model._default_manager.filter(pk=pk, **{field: field_file.name})
+        updated = queryset.update(
+            renditions=JSONBMerge(F("renditions"), Value({field: meta}, output_field=models.JSONField())),
+        )
+    if updated:
+        bump_generation(model)
+        invalidate_snapshots(model)
+        schedule_export(model)
@@ -0,0 +1,109 @@
+"""
+Полнотекстовый и триграммный поиск по коврам, коллекциям и новостям на всех языках.
+
+У моделей из SEARCH_DOCUMENTS есть два служебных поля, которые обновляются
+сигналом post_save одним UPDATE (значения считаются в Postgres):
+- search_vector — взвешенный tsvector по полям *_uz/*_ru/*_en (GIN-индекс);
+- search_text — названия/коды в нижнем регистре для нечеткого поиска
+  по триграммам (GIN-индекс gin_trgm_ops, расширение pg_trgm).
+
+Если pg_trgm в базе не установлено, нечеткий поиск заменяется поиском подстроки.
+"""
+
+from functools import reduce
+from operator import add
+from operator import or_
+
+from django.contrib.postgres.search import SearchQuery
+from django.contrib.postgres.search import SearchRank
+from django.contrib.postgres.search import SearchVector
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.db import connection
+from django.db.models import F
+from django.db.models import Func
+from django.db.models import Q
+from django.db.models import TextField
+from django.db.models import Value
+from django.db.models.functions import Coalesce
+
+LANGUAGE_CONFIGS = {"uz": "simple", "ru": "russian", "en": "english"}
+
+# Модель -> [(поле, вес, со стеммингом по языку)]. Поля с весом A участвуют в нечетком поиске
+SEARCH_DOCUMENTS = {
+    "catalog.carpet": [("code", "A", False), ("seo_title", "C", True)],
+    "catalog.collection": [("name", "A", True), ("seo_title", "C", True), ("description", "D", True)],
+    "catalog.news": [("title", "A", True), ("seo_title", "C", True)],
+}
+
+MIN_QUERY_LENGTH = 2
+
+
+def search_vector(label):
+    """Выражение tsvector для документа модели (по всем языковым колонкам)"""
+    vectors = [
+        SearchVector(
+            f"{field}_{language}",
+            config=config if stemmed else "simple",
+            weight=weight,
+        )
+        for field, weight, stemmed in SEARCH_DOCUMENTS[label]
+        for language, config in LANGUAGE_CONFIGS.items()
+    ]
+    return reduce(add, vectors)
+
+
+def search_text(label):
+    """Выражение для search_text: поля с весом A на всех языках через пробел, в нижнем регистре"""
+    columns = [
+        Coalesce(F(f"{field}_{language}"), Value(""))
+        for field, weight, _ in SEARCH_DOCUMENTS[label]
+        if weight == "A"
+        for language in LANGUAGE_CONFIGS
+    ]
+    # Func вместо Lower: менеджер modeltranslation не умеет переписывать Transform в update()
+    concatenated = Func(Value(" "), *columns, function="CONCAT_WS", output_field=TextField())
+    return Func(concatenated, function="LOWER", output_field=TextField())
+
+
+def update_search_document(model, pk):
+    """Пересчитывает search_vector и search_text одной строки"""
+    label = model._meta.label_lower
+    model._default_manager.filter(pk=pk).update(
+        search_vector=search_vector(label),
+        search_text=search_text(label),
+    )
+
+
+def trigram_available():
+    """Установлено ли расширение pg_trgm (результат кэшируется на соединение)"""
+    if not hasattr(connection, "_catalog_trigram_available"):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+            connection._catalog_trigram_available = cursor.fetchone() is not None
+    return connection._catalog_trigram_available
+
+
+def search_queryset(queryset, text):
+    """
+    Фильтрует queryset по строке поиска и сортирует по релевантности.
+
+    Совпадения ищутся по tsvector (стемминг ru/en, без стемминга uz и кодов)
+    и по триграммам названий (опечатки, частичный ввод). Итоговая релевантность —
+    сумма ts_rank и триграммного сходства.
+    """
+    text = " ".join(text.split())
+    query = reduce(
+        or_,
+        (SearchQuery(text, config=config, search_type="websearch") for config in sorted(set(LANGUAGE_CONFIGS.values()))),
+    )
+    rank = SearchRank(F("search_vector"), query)
+    if trigram_available():
+        fuzzy = Q(search_text__trigram_word_similar=text)
+        rank = rank + TrigramWordSimilarity(text, "search_text")
+    else:
+        fuzzy = Q(search_text__contains=text.lower())
+    return (
+        queryset.filter(Q(search_vector=query) | fuzzy)
+        .annotate(search_rank=rank)
+        .order_by("-search_rank", "pk")
+    )
@@ -0,0 +1,95 @@
+"""
+Сигналы каталога: инвалидация кэша ответов API, перестроение снапшотов страниц
+и обработка изображений при изменении данных
+"""
+
+from django.apps import apps
+from django.db import connection
+from django.db import transaction
+from django.db.models.signals import m2m_changed
+from django.db.models.signals import post_delete
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from apps.catalog.api.snapshots import SNAPSHOT_MODELS
+from apps.catalog.api.snapshots import invalidate_snapshots
+from apps.catalog.cache import bump_generation
+from apps.catalog.export import schedule_export
+from apps.catalog.image_info import update_image_info
+from apps.catalog.models import Carpet
+from apps.catalog.models import Collection
+from apps.catalog.renditions import RENDITION_FIELDS
+from apps.catalog.renditions import schedule_renditions
+from apps.catalog.search import SEARCH_DOCUMENTS
+from apps.catalog.search import update_search_document
+
+M2M_CHANGE_ACTIONS = {"post_add", "post_remove", "post_clear"}
+
+
+def is_catalog_model(model):
+    return model._meta.app_label == "catalog"
+
+
+def invalidate_model(model):
+    """
+    Увеличивает счетчик поколения модели сразу и повторно после коммита транзакции.
+
+    Повторное увеличение нужно, чтобы ответ, закэшированный конкурентным запросом
+    между сохранением и коммитом (со старыми данными), тоже стал недоступен.
+    После коммита также ставится экспорт API в файлы (apps.catalog.export).
+    """
+    bump_generation(model)
+    if connection.in_atomic_block:
+        transaction.on_commit(lambda: bump_generation(model))
+    schedule_export(model)
+
+
+@receiver(post_save, dispatch_uid="catalog_invalidate_on_save")
+@receiver(post_delete, dispatch_uid="catalog_invalidate_on_delete")
+def invalidate_on_change(sender, **kwargs):
+    if is_catalog_model(sender):
+        invalidate_model(sender)
+
+
+@receiver(m2m_changed, dispatch_uid="catalog_invalidate_on_m2m_change")
+def invalidate_on_m2m_change(sender, instance, action, model, **kwargs):
+    if action not in M2M_CHANGE_ACTIONS or not is_catalog_model(type(instance)):
+        return
+    invalidate_model(type(instance))
+    invalidate_model(model)
+
+
+def refresh_carpets_count_on_delete(sender, instance, **kwargs):
+    Collection.refresh_carpets_count(instance.collection_id)
+
+
+def invalidate_snapshots_on_change(sender, raw=False, **kwargs):
+    if not raw:
+        invalidate_snapshots(sender)
+
+
+def process_images_on_save(sender, instance, raw=False, **kwargs):
+    if not raw:
+        update_image_info(instance)
+        schedule_renditions(instance)
+
+
+def update_search_document_on_save(sender, instance, raw=False, **kwargs):
+    if not raw:
+        update_search_document(sender, instance.pk)
+
+
+post_delete.connect(refresh_carpets_count_on_delete, sender=Carpet, dispatch_uid="catalog_carpets_count")
+
+# Обработчики подключаются к конкретным моделям, а не ко всем отправителям:
+# исторические модели из RunPython-миграций не имеют новых полей
+for model in SNAPSHOT_MODELS:
+    label = model._meta.label_lower
+    post_save.connect(invalidate_snapshots_on_change, sender=model, dispatch_uid=f"catalog_snapshots_save_{label}")
+    post_delete.connect(invalidate_snapshots_on_change, sender=model, dispatch_uid=f"catalog_snapshots_delete_{label}")
+for label in RENDITION_FIELDS:
+    post_save.connect(process_images_on_save, sender=apps.get_model(label), dispatch_uid=f"catalog_images_{label}")
+for label in SEARCH_DOCUMENTS:
+    post_save.connect(
+        update_search_document_on_save, sender=apps.get_model(label), dispatch_uid=f"catalog_search_{label}",
+    )
@@ -11,5 +11,50 @@ def send_application_to_telegram(self, form_type: str, payload: dict):
     Send form submission to Telegram chat.
     form_type: 'contact' | 'dealer'
     payload: dict with form fields (e.g. name, phone, email, message or name, company, email, message).
+    Kept for tasks queued before the outbox; new submissions go through drain_telegram_outbox.
     """
     notify_telegram_application(form_type, payload)
+
+
+@shared_task(ignore_result=True)
+def drain_telegram_outbox():
+    """Отправка накопившихся уведомлений о заявках в Telegram (запускается Celery beat)."""
+    from apps.catalog.outbox import drain_outbox
+
+    drain_outbox()
+
+
+@shared_task(ignore_result=True)
+def flush_carpet_views():
+    """Перенос накопленных в Redis просмотров ковров в БД (запускается Celery beat)."""
+    from apps.catalog.counters import flush_carpet_views as flush
+
+    flush()
+
+
+@shared_task(ignore_result=True)
+def generate_image_renditions(model_label: str, pk: int, field: str):
+    """Генерация уменьшенных копий изображения (WebP/JPEG фиксированной ширины)."""
+    from apps.catalog.renditions import build_renditions
+
+    build_renditions(model_label, pk, field)
+
+
+@shared_task(bind=True, ignore_result=True, max_retries=None)
+def export_api(self):
+    """Экспорт ответов публичного API в файлы для nginx (после изменения данных каталога)."""
+    from django.conf import settings
+
+    from apps.catalog.export import EXPORT_MAX_RETRIES
+    from apps.catalog.export import export_api as export
+
+    try:
+        version = export()
+    except Exception as exc:
+        # Пока экспорт не удался, ссылки current нет и API отдает Django
+        if self.request.retries >= EXPORT_MAX_RETRIES:
+            raise
+        raise self.retry(exc=exc, countdown=settings.CATALOG_EXPORT_DELAY * 2 ** self.request.retries)
+    if version is None:
+        # Экспорт уже идет и мог начаться до последних изменений
+        export_api.apply_async(countdown=settings.CATALOG_EXPORT_DELAY)
@@ -4,6 +4,7 @@ import json
 import logging
 import urllib.error
 import urllib.request
+from html import escape
 from urllib.parse import urlencode
 
 from django.conf import settings
@@ -11,18 +12,25 @@ from django.conf import settings
 logger = logging.getLogger(__name__)
 
 
-def _send_telegram_message(text: str) -> bool:
-    """Send message to Telegram chat. Returns True on success."""
-    token = getattr(settings, "TELEGRAM_BOT_TOKEN", None)
-    chat_id = getattr(settings, "TELEGRAM_CHAT_ID", None)
-    if not token or not chat_id:
-        logger.warning(
-            "Telegram notify skipped: TELEGRAM_BOT_TOKEN or TELEGRAM_CHAT_ID not set "
-            "(token=%s, chat_id=%s)",
-            "set" if token else "empty",
-            "set" if chat_id else "empty",
-        )
-        return False
+MESSAGE_MAX_LENGTH = 4096
+
+
+class TelegramError(Exception):
+    """Telegram API request failed. retry_after is set when Telegram asks to slow down (HTTP 429)."""
+
+    def __init__(self, description: str, retry_after: int | None = None):
+        super().__init__(description)
+        self.retry_after = retry_after
+
+
+def telegram_configured() -> bool:
+    return bool(getattr(settings, "TELEGRAM_BOT_TOKEN", None) and getattr(settings, "TELEGRAM_CHAT_ID", None))
+
+
+def send_telegram_message(text: str) -> None:
+    """Send message to Telegram chat. Raises TelegramError on failure."""
+    token = settings.TELEGRAM_BOT_TOKEN
+    chat_id = settings.TELEGRAM_CHAT_ID
     url = f"https://api.telegram.org/bot{token}/sendMessage"
     data = urlencode({"chat_id": chat_id, "text": text, "parse_mode": "HTML"}).encode()
     req = urllib.request.Request(url, data=data, method="POST")
@@ -30,32 +38,50 @@ def _send_telegram_message(text: str) -> bool:
     try:
         with urllib.request.urlopen(req, timeout=10) as resp:
             body = resp.read().decode()
-            if resp.status != 200:
-                logger.warning("Telegram API HTTP %s: %s", resp.status, body[:500])
-                return False
-            result = json.loads(body) if body else {}
-            if not result.get("ok"):
-                logger.warning(
-                    "Telegram API error: %s",
-                    result.get("description", body[:300]),
-                )
-                return False
-            logger.info("Telegram notification sent to chat_id=%s", chat_id)
-            return True
+    except urllib.error.HTTPError as e:
+        body = e.read().decode(errors="replace")
+        try:
+            result = json.loads(body)
+        except json.JSONDecodeError:
+            result = {}
+        retry_after = result.get("parameters", {}).get("retry_after") if e.code == 429 else None
+        raise TelegramError(f"HTTP {e.code}: {result.get('description', body[:300])}", retry_after) from e
     except (urllib.error.URLError, OSError) as e:
-        logger.warning("Telegram request failed: %s", e)
-        return False
+        raise TelegramError(f"Request failed: {e}") from e
+    try:
+        result = json.loads(body) if body else {}
     except json.JSONDecodeError as e:
-        logger.warning("Telegram API invalid JSON: %s", e)
+        raise TelegramError(f"Invalid JSON: {e}") from e
+    if not result.get("ok"):
+        raise TelegramError(result.get("description", body[:300]))
+    logger.info("Telegram notification sent to chat_id=%s", chat_id)
+
+
+def _send_telegram_message(text: str) -> bool:
+    """Send message to Telegram chat. Returns True on success."""
+    if not telegram_configured():
+        logger.warning(
+            "Telegram notify skipped: TELEGRAM_BOT_TOKEN or TELEGRAM_CHAT_ID not set "
+            "(token=%s, chat_id=%s)",
+            "set" if getattr(settings, "TELEGRAM_BOT_TOKEN", None) else "empty",
+            "set" if getattr(settings, "TELEGRAM_CHAT_ID", None) else "empty",
+        )
+        return False
+    try:
+        send_telegram_message(text)
+    except TelegramError as e:
+        logger.warning("Telegram API error: %s", e)
         return False
+    return True
 
 
-def notify_telegram_application(form_type: str, payload: dict) -> None:
+def format_application(form_type: str, payload: dict) -> str:
     """
-    Build message and send form submission to Telegram chat.
+    Build message text for a form submission.
     form_type: 'contact' | 'dealer'
-    payload: dict with form fields.
+    payload: dict with form fields (values are HTML-escaped).
     """
+    payload = {key: escape(str(value)) for key, value in payload.items()}
     if form_type == "contact":
         lines = [
             "📩 <b>Новая заявка (обратная связь)</b>",
@@ -74,6 +100,13 @@ def notify_telegram_application(form_type: str, payload: dict) -> None:
         ]
     else:
         lines = ["📋 Заявка", json.dumps(payload, ensure_ascii=False, indent=2)]
+    return "\n".join(lines)
+
 
-    text = "\n".join(lines)
-    _send_telegram_message(text)
+def notify_telegram_application(form_type: str, payload: dict) -> None:
+    """
+    Build message and send form submission to Telegram chat.
+    form_type: 'contact' | 'dealer'
+    payload: dict with form fields.
+    """
+    _send_telegram_message(format_application(form_type, payload))
@@ -0,0 +1,76 @@
+from factory import Faker
+from factory import Sequence
+from factory import SubFactory
+from factory.django import DjangoModelFactory
+from factory.django import ImageField
+
+from apps.catalog.models import Carpet
+from apps.catalog.models import CarpetCharacteristic
+from apps.catalog.models import CarpetImage
+from apps.catalog.models import Characteristic
+from apps.catalog.models import Collection
+from apps.catalog.models import Color
+from apps.catalog.models import Room
+from apps.catalog.models import Style
+
+
+class CollectionFactory(DjangoModelFactory[Collection]):
+    name = Sequence(lambda n: f"Collection {n}")
+    image = ImageField(width=8, height=8)
+
+    class Meta:
+        model = Collection
+
+
+class StyleFactory(DjangoModelFactory[Style]):
+    name = Sequence(lambda n: f"Style {n}")
+
+    class Meta:
+        model = Style
+
+
+class RoomFactory(DjangoModelFactory[Room]):
+    name = Sequence(lambda n: f"Room {n}")
+
+    class Meta:
+        model = Room
+
+
+class ColorFactory(DjangoModelFactory[Color]):
+    name = Sequence(lambda n: f"Color {n}")
+    hex_code = Faker("hex_color")
+
+    class Meta:
+        model = Color
+
+
+class CharacteristicFactory(DjangoModelFactory[Characteristic]):
+    name = Sequence(lambda n: f"Characteristic {n}")
+
+    class Meta:
+        model = Characteristic
+
+
+class CarpetFactory(DjangoModelFactory[Carpet]):
+    code = Sequence(lambda n: f"YEC-{n:04d}")
+    collection = SubFactory(CollectionFactory)
+
+    class Meta:
+        model = Carpet
+
+
+class CarpetImageFactory(DjangoModelFactory[CarpetImage]):
+    carpet = SubFactory(CarpetFactory)
+    image = ImageField(width=8, height=8)
+
+    class Meta:
+        model = CarpetImage
+
+
+class CarpetCharacteristicFactory(DjangoModelFactory[CarpetCharacteristic]):
+    carpet = SubFactory(CarpetFactory)
+    characteristic = SubFactory(CharacteristicFactory)
+    value = Faker("word")
+
+    class Meta:
+        model = CarpetCharacteristic
@@ -0,0 +1,809 @@
+import base64
+import json
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from apps.catalog.api import bootstrap
+from apps.catalog.api.cache import RESPONSE_KEY_PREFIX
+from apps.catalog.api.nearest import sales_point_index
+from apps.catalog.counters import _apply_deltas
+from apps.catalog.geo import haversine_km
+from apps.catalog.geo import parse_map_coordinates
+from apps.catalog.models import AboutImage
+from apps.catalog.models import AboutPage
+from apps.catalog.models import CarpetStats
+from apps.catalog.models import CompanyHistory
+from apps.catalog.models import HomePage
+from apps.catalog.models import ProductionStep
+from apps.catalog.models import Region
+from apps.catalog.models import SalesPoint
+
+from apps.catalog.tests.factories import CarpetCharacteristicFactory
+from apps.catalog.tests.factories import CarpetFactory
+from apps.catalog.tests.factories import CarpetImageFactory
+from apps.catalog.tests.factories import CollectionFactory
+from apps.catalog.tests.factories import ColorFactory
+from apps.catalog.tests.factories import RoomFactory
+from apps.catalog.tests.factories import StyleFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def api_client() -> APIClient:
+    return APIClient()
+
+
+@pytest.fixture
+def collection():
+    return CollectionFactory()
+
+
+@pytest.fixture
+def carpets(collection):
+    styles = StyleFactory.create_batch(2)
+    rooms = RoomFactory.create_batch(2)
+    colors = ColorFactory.create_batch(2)
+    carpets = CarpetFactory.create_batch(6, collection=collection)
+    for carpet in carpets:
+        carpet.styles.set(styles)
+        carpet.rooms.set(rooms)
+        carpet.colors.set(colors)
+        CarpetImageFactory.create_batch(2, carpet=carpet)
+        CarpetCharacteristicFactory.create_batch(2, carpet=carpet)
+    return carpets
+
+
+def _count_queries(client, url, **params):
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(url, params)
+    assert response.status_code == 200
+    return len(ctx.captured_queries)
+
+
+class TestCarpetPrefetch:
+    def test_list_query_count_does_not_depend_on_page_size(self, api_client, carpets):
+        url = reverse("api:carpet-list")
+        assert _count_queries(api_client, url, page_size=1) == _count_queries(api_client, url, page_size=6)
+
+    def test_collection_carpets_query_count_does_not_depend_on_page_size(
+        self, api_client, collection, carpets,
+    ):
+        url = reverse("api:collection-carpets", kwargs={"slug": collection.slug})
+        assert _count_queries(api_client, url, page_size=1) == _count_queries(api_client, url, page_size=6)
+
+    def test_gallery_images_are_ordered(self, api_client, collection):
+        carpet = CarpetFactory(collection=collection)
+        CarpetImageFactory(carpet=carpet, order=2)
+        CarpetImageFactory(carpet=carpet, order=1)
+        response = api_client.get(reverse("api:carpet-detail", kwargs={"pk": carpet.pk}))
+        assert [image["order"] for image in response.data["gallery_images"]] == [1, 2]
+
+
+class TestTranslatedFields:
+    def test_requested_language_is_returned(self, api_client):
+        StyleFactory(name_uz="Klassik", name_ru="Классика", name_en="Classic")
+        response = api_client.get(reverse("api:style-list"), {"lang": "ru"})
+        assert response.data[0]["name"] == "Классика"
+
+    def test_empty_translation_falls_back_to_default_language(self, api_client):
+        StyleFactory(name_uz="Klassik", name_ru="", name_en=None)
+        response = api_client.get(reverse("api:style-list"), {"lang": "en"})
+        assert response.data[0]["name"] == "Klassik"
+
+    def test_nested_collection_name_is_translated(self, api_client):
+        carpet = CarpetFactory(collection=CollectionFactory(name_uz="Bahor", name_ru="Весна"))
+        response = api_client.get(reverse("api:carpet-list"), {"lang": "ru"})
+        assert response.data["results"][0]["collection_name"] == "Весна"
+        assert response.data["results"][0]["code"] == carpet.code
+
+
+class TestResponseCache:
+    def test_repeated_request_is_served_from_cache(self, api_client):
+        StyleFactory()
+        url = reverse("api:style-list")
+        api_client.get(url, {"lang": "ru"})
+        with CaptureQueriesContext(connection) as ctx:
+            response = api_client.get(url, {"lang": "ru"})
+        assert response.status_code == 200
+        assert not [q for q in ctx.captured_queries if "catalog_style" in q["sql"]]
+
+    def test_save_invalidates_cached_response(self, api_client):
+        style = StyleFactory(name_uz="Eski")
+        url = reverse("api:style-list")
+        api_client.get(url)
+        style.name_uz = "Yangi"
+        style.save()
+        assert api_client.get(url).data[0]["name"] == "Yangi"
+
+    def test_m2m_change_invalidates_cached_carpet_list(self, api_client, collection):
+        carpet = CarpetFactory(collection=collection)
+        url = reverse("api:carpet-list")
+        api_client.get(url)
+        carpet.styles.add(StyleFactory())
+        assert len(api_client.get(url).data["results"][0]["styles"]) == 1
+
+    def test_filter_value_order_does_not_change_cache_key(self, api_client, carpets):
+        url = reverse("api:carpet-list")
+        slugs = [style.slug for style in carpets[0].styles.all()]
+        api_client.get(url, {"styles": ",".join(slugs)})
+        with CaptureQueriesContext(connection) as ctx:
+            api_client.get(url, {"styles": ",".join(reversed(slugs))})
+        assert not [q for q in ctx.captured_queries if "catalog_carpet" in q["sql"]]
+
+
+class TestConditionalGet:
+    def test_validators_and_cache_headers(self, api_client):
+        StyleFactory()
+        response = api_client.get(reverse("api:style-list"))
+        assert response["ETag"].startswith('W/"')
+        assert "Last-Modified" in response
+        assert "public" in response["Cache-Control"]
+        assert "max-age" in response["Cache-Control"]
+        assert "Accept-Language" in response["Vary"]
+
+    def test_matching_etag_returns_304_without_catalog_queries(self, api_client):
+        StyleFactory()
+        url = reverse("api:style-list")
+        etag = api_client.get(url, {"lang": "ru"})["ETag"]
+        with CaptureQueriesContext(connection) as ctx:
+            response = api_client.get(url, {"lang": "ru"}, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304
+        assert response["ETag"] == etag
+        assert not [q for q in ctx.captured_queries if "catalog_" in q["sql"]]
+
+        assert api_client.get(url, {"lang": "en"}, HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+    def test_change_invalidates_etag(self, api_client):
+        style = StyleFactory()
+        url = reverse("api:style-list")
+        etag = api_client.get(url)["ETag"]
+        style.save()
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert response["ETag"] != etag
+
+
+class TestCarpetFacets:
+    def test_facet_counts_with_drill_down(self, api_client, collection):
+        modern, classic = StyleFactory.create_batch(2)
+        kitchen = RoomFactory()
+        first = CarpetFactory(collection=collection, is_new=True)
+        first.styles.add(modern)
+        first.rooms.add(kitchen)
+        second = CarpetFactory(collection=collection)
+        second.styles.add(classic)
+        CarpetFactory(collection=collection, is_popular=True).styles.add(classic)
+
+        response = api_client.get(
+            reverse("api:carpet-facets"), {"styles": modern.slug, "rooms": kitchen.slug},
+        )
+
+        assert response.status_code == 200
+        # Собственный выбор фасета не учитывается: стили считаются только с фильтром rooms
+        assert response.data["styles"] == {modern.slug: 1, classic.slug: 0}
+        # Комнаты считаются с фильтром styles=modern
+        assert response.data["rooms"] == {kitchen.slug: 1}
+        assert response.data["collection"] == {collection.slug: 1}
+        assert response.data["is_new"] == 1
+        assert response.data["is_popular"] == 0
+        assert response.data["total"] == 1
+
+    def test_flag_selection(self, api_client, collection):
+        CarpetFactory(collection=collection, is_new=True, is_popular=True)
+        CarpetFactory(collection=collection, is_new=True)
+        CarpetFactory(collection=collection, is_popular=True)
+        CarpetFactory(collection=collection)
+        url = reverse("api:carpet-facets")
+
+        response = api_client.get(url, {"is_new": "true"})
+        assert response.status_code == 200
+        # Флаг is_new не сужает собственный счетчик, но ограничивает is_popular и total
+        assert (response.data["is_new"], response.data["is_popular"], response.data["total"]) == (2, 1, 2)
+
+        response = api_client.get(url, {"is_new": "true", "is_popular": "false"})
+        assert response.status_code == 200
+        assert (response.data["is_new"], response.data["is_popular"], response.data["total"]) == (1, 1, 1)
+
+    def test_query_count_is_fixed(self, api_client, carpets):
+        with CaptureQueriesContext(connection) as ctx:
+            api_client.get(reverse("api:carpet-facets"))
+        selects = [q for q in ctx.captured_queries if q["sql"].startswith("SELECT")]
+        assert len(selects) == 5
+
+
+class TestCursorPagination:
+    def _walk(self, client, url, **params):
+        ids = []
+        response = client.get(url, {"cursor": "", "page_size": 4, **params})
+        while True:
+            assert response.status_code == 200
+            ids += [carpet["id"] for carpet in response.data["results"]]
+            if not response.data["next"]:
+                return ids
+            response = client.get(response.data["next"])
+
+    def test_pages_cover_all_carpets_in_order(self, api_client, carpets):
+        ids = self._walk(api_client, reverse("api:carpet-list"))
+        expected = sorted(carpets, key=lambda carpet: (carpet.created_at, -carpet.id), reverse=True)
+        assert ids == [carpet.id for carpet in expected]
+
+    def test_popular_sort_with_equal_views(self, api_client, collection):
+        carpets = CarpetFactory.create_batch(7, collection=collection, is_popular=True)
+        ids = self._walk(api_client, reverse("api:carpet-list"), sort="popular")
+        assert sorted(ids) == sorted(carpet.id for carpet in carpets)
+
+    def test_cursor_page_does_not_count_rows(self, api_client, carpets):
+        with CaptureQueriesContext(connection) as ctx:
+            api_client.get(reverse("api:carpet-list"), {"cursor": ""})
+        assert not any("COUNT(" in query["sql"] for query in ctx.captured_queries)
+
+    def test_invalid_cursor(self, api_client, carpets):
+        response = api_client.get(reverse("api:carpet-list"), {"cursor": "broken"})
+        assert response.status_code == 404
+
+    @pytest.mark.parametrize("values", [["x", "x"], ["2026-01-01T00:00:00+00:00", "x"], [None, 1], [[], {}]])
+    def test_tampered_cursor_values(self, api_client, carpets, values):
+        payload = json.dumps({"o": ["-created_at", "id"], "v": values})
+        cursor = base64.urlsafe_b64encode(payload.encode()).decode()
+        response = api_client.get(reverse("api:carpet-list"), {"cursor": cursor})
+        assert response.status_code == 404
+
+
+class TestIncrementWatch:
+    def test_increment_returns_new_total(self, api_client, collection):
+        carpet = CarpetFactory(collection=collection)
+        CarpetStats.objects.filter(carpet=carpet).update(watched=10)
+        url = reverse("api:carpet-increment-watch", kwargs={"pk": carpet.pk})
+        api_client.post(url)
+        response = api_client.post(url)
+        assert response.data == {"watched": 12}
+        stats = CarpetStats.objects.get(carpet=carpet)
+        assert (stats.watched, stats.current_views_today(), stats.current_views_week()) == (12, 2, 2)
+
+    def test_flushed_deltas_are_applied_once(self, collection):
+        carpet = CarpetFactory(collection=collection)
+        assert _apply_deltas("flush-1", {carpet.pk: 3})
+        # Повтор того же переноса после сбоя между коммитом и очисткой буфера
+        assert not _apply_deltas("flush-1", {carpet.pk: 3})
+        assert CarpetStats.objects.get(carpet=carpet).watched == 3
+
+    def test_ordering_by_watched(self, api_client, carpets):
+        for watched, carpet in enumerate(carpets):
+            CarpetStats.objects.filter(carpet=carpet).update(watched=watched)
+        response = api_client.get(reverse("api:carpet-list"), {"ordering": "-watched"})
+        assert [carpet["watched"] for carpet in response.data["results"]] == [5, 4, 3, 2, 1, 0]
+
+    def test_increment_does_not_load_carpet_relations(self, api_client, carpets):
+        url = reverse("api:carpet-increment-watch", kwargs={"pk": carpets[0].pk})
+        with CaptureQueriesContext(connection) as ctx:
+            api_client.post(url)
+        forbidden = (
+            "catalog_carpetimage",
+            "catalog_carpetcharacteristic",
+            "catalog_collection",
+            'UPDATE "catalog_carpet"',
+        )
+        assert not any(part in query["sql"] for query in ctx.captured_queries for part in forbidden)
+
+    def test_unpublished_carpet_is_not_found(self, api_client, collection):
+        carpet = CarpetFactory(collection=collection, is_published=False)
+        response = api_client.post(reverse("api:carpet-increment-watch", kwargs={"pk": carpet.pk}))
+        assert response.status_code == 404
+
+
+class TestSearch:
+    def test_results_are_grouped_and_ranked(self, api_client):
+        collection = CollectionFactory(name_uz="Klassik", name_ru="Классика", name_en="Classic")
+        CollectionFactory(name_uz="Modern", name_ru="Модерн", name_en="Modern")
+        carpet = CarpetFactory(collection=collection, code="CLS-100")
+        response = api_client.get(reverse("api:search-list"), {"q": "классика", "lang": "en"})
+        assert [item["slug"] for item in response.data["collections"]] == [collection.slug]
+        assert response.data["collections"][0]["name"] == "Classic"
+
+        response = api_client.get(reverse("api:search-list"), {"q": "cls-100"})
+        assert [item["id"] for item in response.data["carpets"]] == [carpet.id]
+
+    def test_russian_word_forms_match(self, api_client):
+        collection = CollectionFactory(name_ru="Восточные узоры")
+        response = api_client.get(reverse("api:search-list"), {"q": "восточный узор"})
+        assert [item["id"] for item in response.data["collections"]] == [collection.id]
+
+    def test_short_query_returns_empty_groups(self, api_client, carpets):
+        response = api_client.get(reverse("api:search-list"), {"q": "a"})
+        assert response.data == {"carpets": [], "collections": [], "news": []}
+
+
+class TestSparseFieldsets:
+    def test_fields_trim_response_and_queries(self, api_client, carpets):
+        url = reverse("api:carpet-list")
+        full = _count_queries(api_client, url)
+        with CaptureQueriesContext(connection) as ctx:
+            response = api_client.get(url, {"fields": "id,code,photo,collection_slug", "lang": "ru"})
+        assert set(response.data["results"][0]) == {"id", "code", "photo", "collection_slug"}
+        assert len(ctx.captured_queries) < full
+        carpet_sql = next(q["sql"] for q in ctx.captured_queries if 'FROM "catalog_carpet"' in q["sql"])
+        assert "seo_description" not in carpet_sql
+        assert not [q for q in ctx.captured_queries if "catalog_style" in q["sql"]]
+
+    def test_expand_limits_nested_relations(self, api_client, carpets):
+        url = reverse("api:carpet-detail", kwargs={"pk": carpets[0].pk})
+        with CaptureQueriesContext(connection) as ctx:
+            response = api_client.get(url, {"expand": "styles"})
+        assert len(response.data["styles"]) == 2
+        assert "colors" not in response.data and "gallery_images" not in response.data
+        assert "seo_title" in response.data
+        assert not [q for q in ctx.captured_queries if "catalog_color" in q["sql"]]
+
+    def test_collection_carpets_use_carpet_fields(self, api_client, carpets, collection):
+        url = reverse("api:collection-carpets", kwargs={"slug": collection.slug})
+        response = api_client.get(url, {"fields": "id,collection_name", "expand": ""})
+        assert response.data["results"][0] == {"id": carpets[-1].id, "collection_name": collection.name_uz}
+
+    def test_unknown_field_is_rejected(self, api_client):
+        response = api_client.get(reverse("api:news-list"), {"fields": "id,body"})
+        assert response.status_code == 400
+        assert "fields" in response.data
+
+
+class TestCompactCarpetList:
+    def test_carpets_reference_shared_taxonomy(self, api_client, carpets):
+        response = api_client.get(reverse("api:carpet-list"), {"compact": "1", "lang": "ru"})
+        carpet = response.data["results"][0]
+        style_ids = sorted(style.id for style in carpets[0].styles.all())
+        assert carpet["styles"] == style_ids
+        assert [style["id"] for style in response.data["taxonomy"]["styles"]] == style_ids
+        characteristic_ids = {item["id"] for item in carpet["characteristics"]}
+        assert characteristic_ids <= {item["id"] for item in response.data["taxonomy"]["characteristics"]}
+        assert response.data["count"] == len(carpets)
+
+    def test_query_count_does_not_depend_on_page_size(self, api_client, carpets):
+        url = reverse("api:carpet-list")
+        small = _count_queries(api_client, url, compact="1", page_size=2)
+        large = _count_queries(api_client, url, compact="1", page_size=6)
+        assert small == large
+
+    def test_collection_carpets_with_fields(self, api_client, carpets, collection):
+        url = reverse("api:collection-carpets", kwargs={"slug": collection.slug})
+        response = api_client.get(url, {"compact": "true", "fields": "id,colors", "expand": "colors"})
+        assert set(response.data["results"][0]) == {"id", "colors"}
+        assert set(response.data["taxonomy"]) == {"colors"}
+
+
+class TestCarpetBatch:
+    def test_request_order_and_missing_ids(self, api_client, carpets, collection):
+        hidden = CarpetFactory(collection=collection, is_published=False)
+        ids = [carpets[3].id, hidden.id, 999999, carpets[0].id]
+        response = api_client.get(reverse("api:carpet-batch"), {"ids": ",".join(map(str, ids))})
+        assert [item["id"] for item in response.data] == [carpets[3].id, carpets[0].id]
+        assert len(response.data[0]["styles"]) == 2
+
+    def test_post_uses_object_cache(self, api_client, carpets):
+        url = reverse("api:carpet-batch")
+        api_client.post(url, {"ids": [carpets[0].id, carpets[1].id]}, format="json")
+        with CaptureQueriesContext(connection) as ctx:
+            response = api_client.post(url, {"ids": [carpets[1].id, carpets[2].id]}, format="json")
+        assert [item["id"] for item in response.data] == [carpets[1].id, carpets[2].id]
+        carpet_sql = next(q["sql"] for q in ctx.captured_queries if 'FROM "catalog_carpet"' in q["sql"])
+        assert f"IN ({carpets[2].id})" in carpet_sql
+
+    def test_invalid_and_too_many_ids(self, api_client):
+        url = reverse("api:carpet-batch")
+        assert api_client.get(url, {"ids": "1,x"}).status_code == 400
+        response = api_client.post(url, {"ids": list(range(1, 300))}, format="json")
+        assert response.status_code == 400
+
+
+class TestCarpetM2MFilters:
+    def test_any_mode_returns_each_carpet_once(self, api_client, carpets):
+        slugs = [style.slug for style in carpets[0].styles.all()]
+        rooms = [room.slug for room in carpets[0].rooms.all()]
+        params = {"styles": ",".join(slugs), "rooms": ",".join(rooms)}
+        with CaptureQueriesContext(connection) as ctx:
+            response = api_client.get(reverse("api:carpet-list"), params)
+        assert response.data["count"] == len(carpets)
+        assert len({item["id"] for item in response.data["results"]}) == len(carpets)
+        carpet_sql = [q["sql"] for q in ctx.captured_queries if 'FROM "catalog_carpet"' in q["sql"]]
+        assert all("EXISTS" in sql and "DISTINCT" not in sql for sql in carpet_sql)
+
+    def test_all_mode_requires_every_value(self, api_client, collection):
+        modern, classic = StyleFactory.create_batch(2)
+        both = CarpetFactory(collection=collection)
+        both.styles.set([modern, classic])
+        CarpetFactory(collection=collection).styles.set([modern])
+        url = reverse("api:carpet-list")
+        params = {"styles": f"{modern.slug},{classic.slug}"}
+        assert api_client.get(url, params).data["count"] == 2
+        response = api_client.get(url, {**params, "styles_mode": "all"})
+        assert [item["id"] for item in response.data["results"]] == [both.id]
+        assert api_client.get(url, {**params, "styles_mode": "some"}).status_code == 400
+
+
+class TestBitmapFilters:
+    @pytest.fixture
+    def catalog(self, collection):
+        modern, classic = StyleFactory.create_batch(2)
+        room = RoomFactory()
+        carpets = CarpetFactory.create_batch(5, collection=collection)
+        carpets[0].styles.set([modern, classic])
+        carpets[1].styles.set([modern])
+        carpets[2].styles.set([classic])
+        carpets[3].rooms.set([room])
+        carpets[1].is_new = carpets[3].is_new = True
+        carpets[1].save()
+        carpets[3].save()
+        CarpetFactory(collection=CollectionFactory(), is_popular=True).styles.set([modern])
+        CarpetFactory(collection=collection, is_published=False).styles.set([modern])
+        return {"modern": modern.slug, "classic": classic.slug, "room": room.slug, "collection": collection.slug}
+
+    def _responses(self, client, settings, url, params):
+        settings.CATALOG_BITMAP_FILTERS = False
+        expected = client.get(url, params)
+        settings.CATALOG_BITMAP_FILTERS = True
+        return expected, client.get(url, params)
+
+    @pytest.mark.parametrize("query", [
+        {},
+        {"styles": "{modern},{classic}"},
+        {"styles": "{modern},{classic}", "styles_mode": "all"},
+        {"styles": "{modern}", "is_new": "true", "collection": "{collection}"},
+        {"rooms": "{room}", "is_popular": "false", "sort": "new"},
+    ])
+    def test_matches_database_results(self, api_client, settings, catalog, query):
+        params = {key: value.format(**catalog) for key, value in query.items()}
+        expected, actual = self._responses(api_client, settings, reverse("api:carpet-facets"), params)
+        assert actual.data == expected.data
+
+        expected, actual = self._responses(api_client, settings, reverse("api:carpet-list"), params)
+        assert actual.data["count"] == expected.data["count"]
+        assert [item["id"] for item in actual.data["results"]] == [item["id"] for item in expected.data["results"]]
+
+    def test_page_is_loaded_by_ids(self, api_client, settings, catalog):
+        settings.CATALOG_BITMAP_FILTERS = True
+        url = reverse("api:carpet-list")
+        api_client.get(reverse("api:carpet-count"))
+        with CaptureQueriesContext(connection) as ctx:
+            response = api_client.get(url, {"styles": catalog["modern"], "page_size": 2, "page": 2})
+        assert response.data["count"] == 3
+        carpet_sql = [q["sql"] for q in ctx.captured_queries if 'FROM "catalog_carpet"' in q["sql"]]
+        assert len(carpet_sql) == 1 and "COUNT" not in carpet_sql[0]
+
+    def test_index_follows_catalog_changes(self, api_client, settings, catalog, collection):
+        settings.CATALOG_BITMAP_FILTERS = True
+        url = reverse("api:carpet-count")
+        assert api_client.get(url).data["count"] == 6
+        CarpetFactory(collection=collection)
+        assert api_client.get(url).data["count"] == 7
+
+
+class TestCollectionCarpetsCount:
+    def test_count_follows_publish_move_and_delete(self, collection):
+        other = CollectionFactory()
+        carpet = CarpetFactory(collection=collection)
+        CarpetFactory(collection=collection, is_published=False)
+        collection.refresh_from_db()
+        assert collection.carpets_count == 1
+
+        carpet.collection = other
+        carpet.save()
+        collection.refresh_from_db()
+        other.refresh_from_db()
+        assert (collection.carpets_count, other.carpets_count) == (0, 1)
+
+        carpet.is_published = False
+        carpet.save()
+        other.refresh_from_db()
+        assert other.carpets_count == 0
+
+        published = CarpetFactory(collection=other)
+        published.delete()
+        other.refresh_from_db()
+        assert other.carpets_count == 0
+
+    def test_list_and_detail_without_per_collection_queries(self, api_client):
+        for collection in CollectionFactory.create_batch(3):
+            CarpetFactory.create_batch(2, collection=collection)
+        with CaptureQueriesContext(connection) as ctx:
+            response = api_client.get(reverse("api:collection-list"))
+        assert {item["carpets_count"] for item in response.data} == {2}
+        assert not [q for q in ctx.captured_queries if 'FROM "catalog_carpet"' in q["sql"]]
+
+        slug = response.data[0]["slug"]
+        assert api_client.get(reverse("api:collection-detail", kwargs={"slug": slug})).data["carpets_count"] == 2
+
+
+class TestCollectionPage:
+    def test_sections_are_scoped_to_collection(self, api_client, carpets, collection):
+        CarpetFactory(collection=CollectionFactory())
+        style = carpets[0].styles.first()
+        url = reverse("api:collection-page", kwargs={"slug": collection.slug})
+        response = api_client.get(url, {"styles": style.slug, "page_size": 4})
+        assert response.data["collection"]["slug"] == collection.slug
+        assert response.data["collection"]["carpets_count"] == len(carpets)
+        assert response.data["carpets"]["count"] == len(carpets)
+        assert len(response.data["carpets"]["results"]) == 4
+        assert response.data["facets"]["styles"][style.slug] == len(carpets)
+        assert response.data["facets"]["total"] == len(carpets)
+
+    def test_invalid_filter_is_rejected(self, api_client, collection):
+        url = reverse("api:collection-page", kwargs={"slug": collection.slug})
+        assert api_client.get(url, {"styles_mode": "some"}).status_code == 400
+
+
+class TestPageSnapshots:
+    @pytest.fixture
+    def homepage(self):
+        HomePage.objects.all().delete()
+        page = HomePage.objects.create(
+            banner_title_uz="Salom", banner_title_ru="Привет", banner_showroom_title="Shou",
+        )
+        AboutImage.objects.create(homepage=page, image="photos/homepage/about/1.jpg", order=1)
+        return page
+
+    def test_snapshot_is_served_without_page_queries(self, api_client, homepage):
+        url = reverse("api:homepage-list")
+        response = api_client.get(url, {"lang": "ru"})
+        assert response["Content-Type"] == "application/json"
+        data = response.json()
+        assert data["banner_title"] == "Привет"
+        assert data["about_images"][0]["image"].endswith("/photos/homepage/about/1.jpg")
+        assert api_client.get(url, {"lang": "en"}).json()["banner_title"] == "Salom"
+
+        with CaptureQueriesContext(connection) as ctx:
+            assert api_client.get(url, {"lang": "ru"}).json() == data
+        assert not [q for q in ctx.captured_queries if "catalog_" in q["sql"]]
+
+        cache.clear()
+        with CaptureQueriesContext(connection) as ctx:
+            assert api_client.get(url, {"lang": "ru"}).json() == data
+        assert [q for q in ctx.captured_queries if "catalog_pagesnapshot" in q["sql"]]
+        assert not [q for q in ctx.captured_queries if "catalog_homepage" in q["sql"]]
+
+    def test_inline_change_rebuilds_snapshot_once_on_commit(self, api_client, homepage):
+        url = reverse("api:homepage-list")
+        etag = api_client.get(url)["ETag"]
+        assert api_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+        AboutImage.objects.create(homepage=homepage, image="photos/homepage/about/2.jpg", order=2)
+        AboutImage.objects.create(homepage=homepage, image="photos/homepage/about/3.jpg", order=3)
+        rebuilds = [
+            func for _, func, _ in connection.run_on_commit if getattr(func, "snapshot", None) == "homepage"
+        ]
+        assert len(rebuilds) == 1
+        rebuilds[0]()
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert len(response.json()["about_images"]) == 3
+        assert not [q for q in ctx.captured_queries if "catalog_" in q["sql"]]
+
+    def test_unpublished_page_is_empty(self, api_client, homepage):
+        homepage.is_published = False
+        homepage.save()
+        assert api_client.get(reverse("api:homepage-list")).json() == {}
+
+
+class TestAboutPage:
+    def test_page_is_rendered_in_fixed_number_of_queries(self, api_client):
+        AboutPage.objects.all().delete()
+        page = AboutPage.objects.create(about_banner_title_uz="Biz haqimizda")
+        for order in (3, 1, 2):
+            ProductionStep.objects.create(
+                about_page=page, order=order, title_uz=f"Qadam {order}", title_ru=f"Шаг {order}", description_uz="-",
+            )
+        for year in (2020, 2010):
+            CompanyHistory.objects.create(about_page=page, year=year, year_title_ru=f"{year} год")
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = api_client.get(reverse("api:about-list"), {"lang": "ru"})
+        data = response.json()
+        assert [step["title"] for step in data["production_steps"]] == ["Шаг 1", "Шаг 2", "Шаг 3"]
+        assert [item["year_title"] for item in data["company_history"]] == ["2010 год", "2020 год"]
+        # Страница, этапы и история — по одному запросу на все три языка снапшота
+        for table in ("catalog_aboutpage", "catalog_productionstep", "catalog_companyhistory"):
+            assert len([q for q in ctx.captured_queries if f'FROM "{table}"' in q["sql"]]) == 1
+
+        en = api_client.get(reverse("api:about-list"), {"lang": "en"}).json()
+        assert en["production_steps"][0]["title"] == "Qadam 1"
+
+
+class TestRegions:
+    @pytest.fixture
+    def regions(self):
+        Region.objects.all().delete()
+        regions = [Region.objects.create(name_uz=f"Viloyat {number}", order=number) for number in range(3)]
+        for region in regions:
+            for order in (2, 1):
+                SalesPoint.objects.create(
+                    region=region, order=order, name_uz=f"Do'kon {order}", name_ru=f"Магазин {order}",
+                    address_uz="Manzil", phone="+998",
+                )
+            SalesPoint.objects.create(region=region, name_uz="Yopiq", address_uz="-", phone="-", is_published=False)
+        return regions
+
+    def test_regions_and_points_in_two_queries(self, api_client, regions):
+        url = reverse("api:region-list")
+        with CaptureQueriesContext(connection) as ctx:
+            response = api_client.get(url, {"lang": "ru"})
+        assert len([q for q in ctx.captured_queries if "catalog_" in q["sql"]]) == 2
+        assert [point["name"] for point in response.data[0]["sales_points"]] == ["Магазин 1", "Магазин 2"]
+        assert response.data[0]["sales_points"][0]["address"] == "Manzil"
+
+        with CaptureQueriesContext(connection) as ctx:
+            api_client.get(url, {"lang": "ru"})
+        assert not [q for q in ctx.captured_queries if "catalog_" in q["sql"]]
+
+    def test_sales_point_change_invalidates_cached_response(self, api_client, regions):
+        url = reverse("api:region-list")
+        api_client.get(url)
+        point = regions[0].sales_points.get(order=1)
+        point.phone = "+998 71 000 00 00"
+        point.save()
+        assert api_client.get(url).data[0]["sales_points"][0]["phone"] == "+998 71 000 00 00"
+
+
+class TestNearestSalesPoints:
+    @pytest.mark.parametrize(
+        "url, expected",
+        [
+            ("https://www.google.com/maps/@41.3111,69.2797,15z", (41.3111, 69.2797)),
+            ("https://www.google.com/maps/place/Yec/@41.30,69.20,17z/data=!3m1!4b1!8m2!3d41.3111!4d69.2797",
+             (41.3111, 69.2797)),
+            ("https://maps.google.com/?q=41.3111,69.2797", (41.3111, 69.2797)),
+            ("https://yandex.uz/maps/?ll=69.2797%2C41.3111&z=15", (41.3111, 69.2797)),
+            ("https://yandex.ru/maps/?ll=69.0,41.0&pt=69.2797,41.3111", (41.3111, 69.2797)),
+            ("https://maps.app.goo.gl/abc", None),
+            ("https://maps.google.com/?q=Tashkent", None),
+        ],
+    )
+    def test_map_link_coordinates(self, url, expected):
+        assert parse_map_coordinates(url) == expected
+
+    @pytest.fixture
+    def points(self):
+        Region.objects.all().delete()
+        tashkent = Region.objects.create(name_uz="Toshkent", name_ru="Ташкент")
+        samarkand = Region.objects.create(name_uz="Samarqand", name_ru="Самарканд")
+        hidden = Region.objects.create(name_uz="Yopiq", is_published=False)
+
+        def point(region, name, latitude, longitude, **kwargs):
+            return SalesPoint.objects.create(
+                region=region, name_uz=name, address_uz="-", phone="-",
+                map_link=f"https://www.google.com/maps/@{latitude},{longitude},15z", **kwargs,
+            )
+
+        return {
+            "chilanzar": point(tashkent, "Chilonzor", 41.2756, 69.2034),
+            "center": point(tashkent, "Markaz", 41.3111, 69.2797),
+            "samarkand": point(samarkand, "Registon", 39.6542, 66.9597),
+            "draft": point(tashkent, "Qoralama", 41.3112, 69.2798, is_published=False),
+            "hidden": point(hidden, "Yopiq", 41.3113, 69.2799),
+        }
+
+    def test_coordinates_follow_map_link(self, points):
+        point = SalesPoint.objects.get(pk=points["center"].pk)
+        assert (point.latitude, point.longitude) == (41.3111, 69.2797)
+        point.map_link = "https://yandex.uz/maps/?pt=66.9597,39.6542"
+        point.save()
+        assert (point.latitude, point.longitude) == (39.6542, 66.9597)
+
+    def test_unparsable_map_link_clears_coordinates(self, points):
+        point = SalesPoint.objects.get(pk=points["center"].pk)
+        point.map_link = "https://maps.app.goo.gl/AbCdEf"
+        point.save()
+        point.refresh_from_db()
+        assert (point.latitude, point.longitude) == (None, None)
+
+        # Короткая ссылка с координатами, введенными вручную в том же сохранении
+        point.map_link = "https://maps.app.goo.gl/XyZ"
+        point.latitude, point.longitude = 41.3, 69.2
+        point.save()
+        point.refresh_from_db()
+        assert (point.latitude, point.longitude) == (41.3, 69.2)
+
+        # Сохранение без изменений ссылки сохраняет ручные координаты
+        point.phone = "+998 71"
+        point.save()
+        point.refresh_from_db()
+        assert (point.latitude, point.longitude) == (41.3, 69.2)
+
+    def test_nearest_points_from_memory_index(self, api_client, points):
+        url = reverse("api:region-nearest")
+        response = api_client.get(url, {"lat": 41.31, "lon": 69.28, "limit": 2, "lang": "ru"})
+        assert response.status_code == 200
+        assert [item["id"] for item in response.data] == [points["center"].pk, points["chilanzar"].pk]
+        assert response.data[0]["region"]["name"] == "Ташкент"
+        assert response.data[0]["distance_km"] < 1 < response.data[1]["distance_km"]
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = api_client.get(url, {"lat": 39.6, "lon": 67.0, "limit": 20})
+        assert not [q for q in ctx.captured_queries if "catalog_" in q["sql"]]
+        assert [item["id"] for item in response.data] == [
+            points["samarkand"].pk, points["chilanzar"].pk, points["center"].pk,
+        ]
+
+        points["samarkand"].is_published = False
+        points["samarkand"].save()
+        response = api_client.get(url, {"lat": 39.6, "lon": 67.0, "limit": 1})
+        assert [item["id"] for item in response.data] == [points["chilanzar"].pk]
+
+    def test_nearest_matches_full_scan(self, points):
+        index = sales_point_index()
+        everything = list(index.cells.values())
+        for latitude, longitude in ((41.0, 69.0), (40.0, 68.0), (0.0, 0.0), (55.75, 37.62)):
+            expected = sorted(
+                (haversine_km(latitude, longitude, lat, lon), point.pk)
+                for items in everything for lat, lon, point in items
+            )
+            found = index.nearest(latitude, longitude, 2)
+            assert [point.pk for _, point in found] == [pk for _, pk in expected[:2]]
+
+    def test_invalid_coordinates(self, api_client):
+        url = reverse("api:region-nearest")
+        response = api_client.get(url, {"lat": "abc", "lon": 200})
+        assert response.status_code == 400
+        assert set(response.data) == {"lat", "lon"}
+        assert api_client.get(url, {"lat": 41}).status_code == 400
+
+
+class TestBootstrap:
+    def test_sections_versions_and_revalidation(self, api_client, settings):
+        settings.CATALOG_BOOTSTRAP_WORKERS = 1
+        style = StyleFactory(name_uz="Klassik", name_ru="Классика")
+        api_client.get(reverse("api:style-list"), {"lang": "ru"})
+        url = reverse("api:bootstrap-list")
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = api_client.get(url, {"lang": "ru"})
+        assert not [q for q in ctx.captured_queries if "catalog_style" in q["sql"]]
+        data = response.json()
+        sections = ["global_settings", "contact", "faq", "advantages", "regions", "styles", "rooms", "colors",
+                    "collections"]
+        assert list(data) == ["versions", *sections]
+        assert list(data["versions"]) == sections
+        assert data["styles"] == [{"id": style.pk, "name": "Классика", "slug": style.slug}]
+
+        response = api_client.get(url, {"lang": "ru"}, HTTP_IF_NONE_MATCH=response["ETag"])
+        assert response.status_code == 304
+
+        style.save()
+        versions = api_client.get(url, {"lang": "ru"}).json()["versions"]
+        assert versions["styles"] != data["versions"]["styles"]
+        assert versions["faq"] == data["versions"]["faq"]
+
+    @pytest.mark.django_db(transaction=True)
+    def test_missing_sections_are_built_concurrently(self, api_client):
+        StyleFactory.create_batch(2)
+        data = api_client.get(reverse("api:bootstrap-list")).json()
+        assert len(data["styles"]) == 2
+        assert data["collections"] == []
+
+    def test_section_built_by_another_request_is_awaited(self, api_client, monkeypatch, settings):
+        settings.CATALOG_BOOTSTRAP_WORKERS = 1
+        StyleFactory(name_uz="Klassik")
+        add = cache.add
+
+        def add_except_styles(key, *args, **kwargs):
+            # Флаг секции стилей уже держит другой запрос
+            if key.startswith(f"{RESPONSE_KEY_PREFIX}:style:") and key.endswith(":building"):
+                return False
+            return add(key, *args, **kwargs)
+
+        awaited = {}
+
+        def wait_for_sections(keys):
+            awaited.update(keys)
+            return {name: ["built elsewhere"] for name in keys}
+
+        monkeypatch.setattr(cache, "add", add_except_styles)
+        monkeypatch.setattr(bootstrap, "wait_for_sections", wait_for_sections)
+        data = api_client.get(reverse("api:bootstrap-list")).json()
+        assert list(awaited) == ["styles"]
+        assert data["styles"] == ["built elsewhere"]
+        assert data["rooms"] == []
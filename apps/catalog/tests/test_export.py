@@ -0,0 +1,71 @@
+import gzip
+import json
+
+import pytest
+from django.core.management import call_command
+
+from apps.catalog import export
+from apps.catalog.export import CURRENT_LINK
+from apps.catalog.export import VERSIONS_DIR
+from apps.catalog.tasks import export_api as export_api_task
+from apps.catalog.tests.factories import CarpetFactory
+from apps.catalog.tests.factories import StyleFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def export_root(settings, tmp_path):
+    settings.CATALOG_EXPORT_ROOT = str(tmp_path)
+    settings.CATALOG_EXPORT_PAGES = 5
+    # Экспорт рендерит /api/bootstrap/: потоки со своими подключениями к БД
+    # не видят данные незакоммиченной транзакции теста
+    settings.CATALOG_BOOTSTRAP_WORKERS = 1
+    return tmp_path
+
+
+def test_export_writes_compressed_files_per_language(export_root):
+    StyleFactory(name_uz="Klassik", name_ru="Классика")
+    CarpetFactory.create_batch(13)
+    call_command("export_api")
+
+    current = export_root / CURRENT_LINK
+    styles = json.loads((current / "api/styles/index.ru.json").read_bytes())
+    assert styles[0]["name"] == "Классика"
+    content = (current / "api/homepage/index.en.json").read_bytes()
+    assert gzip.decompress((current / "api/homepage/index.en.json.gz").read_bytes()) == content
+    # 13 ковров по 12 на странице: две страницы, третьей нет
+    assert (current / "api/carpets/page-2.uz.json").exists()
+    assert not (current / "api/carpets/page-3.uz.json").exists()
+    manifest = json.loads((current / "manifest.json").read_text())
+    assert "api/bootstrap/index.ru.json" in manifest["files"]
+
+
+def test_new_version_replaces_current_and_old_versions_are_pruned(export_root, settings):
+    settings.CATALOG_EXPORT_KEEP_VERSIONS = 2
+    for _ in range(3):
+        call_command("export_api")
+    versions = sorted(path.name for path in (export_root / VERSIONS_DIR).iterdir())
+    assert len(versions) == 2
+    assert (export_root / CURRENT_LINK).resolve().name == versions[-1]
+
+
+def test_catalog_change_schedules_export(export_root, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        StyleFactory()
+    assert (export_root / CURRENT_LINK / "api/styles/index.uz.json").exists()
+
+
+def test_failed_export_disables_current_and_retries(export_root, monkeypatch):
+    call_command("export_api")
+    calls = []
+
+    def fail(directory):
+        calls.append(directory)
+        raise RuntimeError("/api/styles/ {'lang': 'uz'}: HTTP 500")
+
+    monkeypatch.setattr(export, "render_endpoints", fail)
+    export_api_task.delay()
+    # Устаревшие файлы не отдаются: nginx проксирует запросы в Django
+    assert not (export_root / CURRENT_LINK).exists()
+    assert len(calls) == export.EXPORT_MAX_RETRIES + 1
@@ -0,0 +1,33 @@
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from apps.catalog.models import Collection
+from apps.catalog.tests.factories import CollectionFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def test_image_info_is_stored_on_save():
+    collection = CollectionFactory(image__width=40, image__height=30, image__color="red")
+    collection.refresh_from_db()
+    info = collection.image_meta["image"]
+    assert (info["source"], info["width"], info["height"]) == (collection.image.name, 40, 30)
+    assert info["color"] in {"#fe0000", "#ff0000"}
+    assert info["lqip"].startswith("data:image/jpeg;base64,")
+
+
+def test_api_returns_image_meta_without_file_access():
+    collection = CollectionFactory(image__width=40, image__height=30)
+    collection.image.storage.delete(collection.image.name)
+    response = APIClient().get(reverse("api:collection-detail", kwargs={"slug": collection.slug}))
+    assert response.data["image_meta"]["width"] == 40  # noqa: PLR2004
+
+
+def test_backfill_restores_missing_info():
+    collection = CollectionFactory(image__width=40, image__height=30)
+    Collection.objects.filter(pk=collection.pk).update(image_meta={})
+    call_command("backfill_image_info", workers=1)
+    collection.refresh_from_db()
+    assert collection.image_meta["image"]["height"] == 30  # noqa: PLR2004
@@ -0,0 +1,94 @@
+from datetime import timedelta
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.catalog import outbox
+from apps.catalog.models import TelegramNotification
+from apps.catalog.outbox import drain_outbox
+from apps.catalog.outbox import queue_notification
+from apps.catalog.telegram_notify import TelegramError
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def sent(settings, monkeypatch):
+    settings.TELEGRAM_BOT_TOKEN = "token"
+    settings.TELEGRAM_CHAT_ID = "-100"
+    messages = []
+    monkeypatch.setattr(outbox, "send_telegram_message", messages.append)
+    return messages
+
+
+def test_form_submission_is_queued_without_sending(monkeypatch):
+    def fail(text):
+        raise AssertionError("Telegram must not be called from the request")
+
+    monkeypatch.setattr(outbox, "send_telegram_message", fail)
+    response = APIClient().post(
+        reverse("api:dealer-request-list"),
+        {"name": "Ali", "company": "Gilam <MChJ>", "email": "ali@example.com", "message": ""},
+        format="json",
+    )
+    assert response.status_code == 201
+    notification = TelegramNotification.objects.get()
+    assert (notification.form_type, notification.status) == ("dealer", "pending")
+    assert notification.payload["company"] == "Gilam <MChJ>"
+
+
+def test_burst_is_sent_as_one_digest(sent):
+    for number in range(3):
+        queue_notification("contact", {"name": f"Client {number}", "phone": "+998", "email": "", "message": "<hi>"})
+
+    assert drain_outbox() == 3
+    assert len(sent) == 1
+    assert sent[0].startswith("📬 <b>Новые заявки: 3</b>")
+    assert "&lt;hi&gt;" in sent[0]
+    assert set(TelegramNotification.objects.values_list("status", flat=True)) == {"sent"}
+    assert drain_outbox() == 0
+
+
+def test_long_digest_is_split_between_messages(sent, settings):
+    settings.TELEGRAM_OUTBOX_MESSAGES_PER_RUN = 2
+    for number in range(3):
+        queue_notification("contact", {"name": "x" * 1800, "phone": str(number)})
+
+    assert drain_outbox() == 3
+    assert len(sent) == 2
+    assert all(len(message) <= 4096 for message in sent)
+
+
+def test_failure_is_retried_with_backoff(sent, settings, monkeypatch):
+    settings.TELEGRAM_OUTBOX_MAX_ATTEMPTS = 2
+
+    def fail(text):
+        raise TelegramError("HTTP 502: Bad Gateway")
+
+    monkeypatch.setattr(outbox, "send_telegram_message", fail)
+    notification = queue_notification("contact", {"name": "Ali"})
+    drain_outbox()
+    notification.refresh_from_db()
+    assert (notification.status, notification.attempts) == ("pending", 1)
+    assert notification.last_error == "HTTP 502: Bad Gateway"
+    assert notification.next_attempt_at > timezone.now() + timedelta(seconds=settings.TELEGRAM_OUTBOX_RETRY_DELAY - 5)
+    assert drain_outbox() == 0
+
+    TelegramNotification.objects.update(next_attempt_at=timezone.now())
+    drain_outbox()
+    notification.refresh_from_db()
+    assert (notification.status, notification.attempts) == ("failed", 2)
+
+
+def test_rate_limit_postpones_queue(sent, monkeypatch):
+    def slow_down(text):
+        raise TelegramError("HTTP 429: Too Many Requests", retry_after=40)
+
+    monkeypatch.setattr(outbox, "send_telegram_message", slow_down)
+    queue_notification("contact", {"name": "Ali"})
+    drain_outbox()
+    notification = TelegramNotification.objects.get()
+    assert notification.attempts == 0
+    assert notification.next_attempt_at > timezone.now() + timedelta(seconds=30)
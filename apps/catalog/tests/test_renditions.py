@@ -0,0 +1,43 @@
+import pytest
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from apps.catalog.models import Collection
+from apps.catalog.renditions import rendition_path
+from apps.catalog.tests.factories import CollectionFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def collection(django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        collection = CollectionFactory(image__width=800, image__height=400)
+    collection.refresh_from_db()
+    return collection
+
+
+def test_renditions_are_generated_on_save(collection):
+    meta = collection.renditions["image"]
+    assert meta["source"] == collection.image.name
+    assert meta["widths"] == [320, 640]
+    for width in meta["widths"]:
+        assert default_storage.exists(rendition_path(meta["hash"], width, "webp"))
+        assert default_storage.exists(rendition_path(meta["hash"], width, "jpeg"))
+
+
+def test_api_returns_srcset(collection):
+    response = APIClient().get(reverse("api:collection-detail", kwargs={"slug": collection.slug}))
+    srcset = response.data["image_srcset"]
+    assert srcset["webp"].endswith("640.webp 640w")
+    assert srcset["jpeg"].count(", ") == 1
+
+
+def test_backfill_skips_up_to_date_images(collection):
+    Collection.objects.filter(pk=collection.pk).update(renditions={})
+    call_command("backfill_image_renditions")
+    call_command("backfill_image_renditions")
+    collection.refresh_from_db()
+    assert collection.renditions["image"]["widths"] == [320, 640]
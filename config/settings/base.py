@@ -74,6 +74,7 @@ DJANGO_APPS = [
     "django.contrib.sites",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     # "django.contrib.humanize", # Handy template tags
     "django.forms",
 ]
@@ -506,9 +507,61 @@ CELERY_ACCEPT_CONTENT = ["json"]
 CELERY_TASK_SERIALIZER = "json"
 CELERY_RESULT_SERIALIZER = "json"
 CELERY_TIMEZONE = TIME_ZONE
+CELERY_BEAT_SCHEDULE = {
+    # Перенос буферизованных просмотров ковров из Redis в БД
+    "flush-carpet-views": {
+        "task": "apps.catalog.tasks.flush_carpet_views",
+        "schedule": env.int("CARPET_VIEWS_FLUSH_INTERVAL", default=60),
+    },
+    # Отправка уведомлений о заявках из очереди TelegramNotification
+    "drain-telegram-outbox": {
+        "task": "apps.catalog.tasks.drain_telegram_outbox",
+        "schedule": env.int("TELEGRAM_OUTBOX_INTERVAL", default=10),
+    },
+}
 
 # Telegram notifications for form submissions
 # ------------------------------------------------------------------------------
 # Bot token from @BotFather, chat_id where to send (e.g. -1001234567890 or 123456789)
 TELEGRAM_BOT_TOKEN = env("TELEGRAM_BOT_TOKEN", default=None)
 TELEGRAM_CHAT_ID = env("TELEGRAM_CHAT_ID", default=None)
+# Очередь уведомлений (apps.catalog.outbox): заявок в одном запуске, сообщений за запуск
+# и пауза между ними (Telegram допускает ~1 сообщение в секунду и ~20 в минуту в группу)
+TELEGRAM_OUTBOX_BATCH_SIZE = 50
+TELEGRAM_OUTBOX_MESSAGES_PER_RUN = 3
+TELEGRAM_OUTBOX_MESSAGE_INTERVAL = 1.1
+# Повторы после ошибок: задержка удваивается от RETRY_DELAY до MAX_RETRY_DELAY (в секундах)
+TELEGRAM_OUTBOX_RETRY_DELAY = 30
+TELEGRAM_OUTBOX_MAX_RETRY_DELAY = 60 * 60
+TELEGRAM_OUTBOX_MAX_ATTEMPTS = 10
+
+# Catalog API cache
+# ------------------------------------------------------------------------------
+# Время жизни закэшированных ответов API каталога (в секундах).
+# Ответы инвалидируются сигналами моделей, таймаут лишь ограничивает размер кэша.
+CATALOG_CACHE_TIMEOUT = env.int("CATALOG_CACHE_TIMEOUT", default=60 * 60)
+# max-age ответов API каталога для браузеров и nginx (в секундах). По истечении
+# клиент перепроверяет копию по ETag/Last-Modified и обычно получает 304
+CATALOG_HTTP_MAX_AGE = env.int("CATALOG_HTTP_MAX_AGE", default=60)
+# Фильтрация, фасеты и количество ковров по битовым картам в памяти процесса
+# (apps.catalog.api.bitmaps) вместо запросов к Postgres
+CATALOG_BITMAP_FILTERS = env.bool("CATALOG_BITMAP_FILTERS", default=False)
+# Адрес API, от которого строятся абсолютные URL файлов в снапшотах страниц
+# (apps.catalog.api.snapshots): снапшоты рендерятся вне запроса клиента
+CATALOG_SNAPSHOT_BASE_URL = env("CATALOG_SNAPSHOT_BASE_URL", default="http://localhost:8000")
+# Число потоков, в которых /api/bootstrap/ параллельно строит отсутствующие в кэше секции
+CATALOG_BOOTSTRAP_WORKERS = env.int("CATALOG_BOOTSTRAP_WORKERS", default=4)
+# Экспорт ответов публичного API в JSON-файлы, которые nginx отдает без Django
+# (apps.catalog.export). Пустое значение выключает экспорт после изменений
+CATALOG_EXPORT_ROOT = env("CATALOG_EXPORT_ROOT", default="")
+# Задержка экспорта после изменения данных (в секундах): серия сохранений дает один экспорт
+CATALOG_EXPORT_DELAY = env.int("CATALOG_EXPORT_DELAY", default=30)
+# Сколько первых страниц списков ковров и новостей экспортируется
+CATALOG_EXPORT_PAGES = env.int("CATALOG_EXPORT_PAGES", default=5)
+# Сколько последних версий экспорта хранится на диске
+CATALOG_EXPORT_KEEP_VERSIONS = 3
+
+# Catalog images
+# ------------------------------------------------------------------------------
+# Ширины (px) уменьшенных копий изображений каталога (WebP и JPEG), см. apps.catalog.renditions
+CATALOG_IMAGE_RENDITION_WIDTHS = [320, 640, 960, 1280, 1920]
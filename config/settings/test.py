@@ -35,10 +35,15 @@ TEMPLATES[0]["OPTIONS"]["debug"] = True  # type: ignore[index]
 # https://docs.djangoproject.com/en/dev/ref/settings/#media-url
 MEDIA_URL = "http://media.testserver/"
 
+# CATALOG
+# ------------------------------------------------------------------------------
+CATALOG_SNAPSHOT_BASE_URL = "http://testserver"
+
 # CELERY
 # ------------------------------------------------------------------------------
 # Run tasks synchronously in tests (no broker required)
 CELERY_TASK_ALWAYS_EAGER = True
+TELEGRAM_OUTBOX_MESSAGE_INTERVAL = 0
 
 # Your stuff...
 # ------------------------------------------------------------------------------